@@ -0,0 +1,91 @@
+import numpy as np
+import torch
+
+from core.bitboard import CELL_MASKS
+from core.board_batch import stack_bitboards
+from core.constants import COLUMNS, ROWS
+
+# Cell value encoded by each input channel: player 1, player 2, empty
+_CHANNEL_VALUES = np.array([1, 2, 0]).reshape(1, 3, 1, 1)
+
+
+class BoardEncoder:
+    """
+    Encodes positions into the network input (B, 3, 6, 7) without allocating
+    per call.
+
+    The channels are written straight into a preallocated float32 tensor,
+    which is grown (doubled) when a batch does not fit. The returned tensor
+    is a view of that buffer and stays valid until the next call, so every
+    thread needs its own encoder. On CUDA hosts the buffer is pinned, which
+    lets the copy to the GPU run asynchronously.
+    """
+
+    def __init__(self, capacity: int = 64, device: str = "cpu"):
+        """
+        Args:
+            capacity: Positions the buffer holds initially.
+            device: Device the model runs on ("cpu" or "cuda").
+        """
+        self.pin_memory = device.startswith("cuda") and torch.cuda.is_available()
+        self._allocate(max(1, capacity))
+
+    @property
+    def capacity(self) -> int:
+        return len(self._array)
+
+    def _allocate(self, capacity: int):
+        self._buffer = torch.empty(
+            (capacity, 3, ROWS, COLUMNS),
+            dtype=torch.float32,
+            pin_memory=self.pin_memory,
+        )
+        # Shares the memory of the tensor
+        self._array = self._buffer.numpy()
+        # Cell masks ANDed with the player masks of a batch of bitboards
+        self._cells = np.empty((capacity, ROWS, COLUMNS), dtype=np.uint64)
+
+    def _reserve(self, n: int):
+        if n > self.capacity:
+            self._allocate(max(n, 2 * self.capacity))
+
+    def encode(self, boards) -> torch.Tensor:
+        """
+        Encode 6x7 boards (0 = empty, 1 = player 1, 2 = player 2).
+
+        Args:
+            boards: Array of shape (B, 6, 7), or a single (6, 7) board.
+
+        Returns:
+            Tensor of shape (B, 3, 6, 7), a view of the encoder's buffer.
+        """
+        boards = np.asarray(boards)
+        if boards.ndim == 2:
+            boards = boards[np.newaxis]
+        n = len(boards)
+        self._reserve(n)
+        np.equal(boards[:, np.newaxis], _CHANNEL_VALUES, out=self._array[:n])
+        return self._buffer[:n]
+
+    def encode_bitboards(self, bitboards) -> torch.Tensor:
+        """
+        Encode BitBoards straight from their player masks, without building
+        the 6x7 arrays first.
+
+        Args:
+            bitboards: Sequence of BitBoard instances.
+
+        Returns:
+            Tensor of shape (B, 3, 6, 7), a view of the encoder's buffer.
+        """
+        p1, p2 = stack_bitboards(bitboards)
+        n = len(p1)
+        self._reserve(n)
+        out, cells = self._array[:n], self._cells[:n]
+        for channel, masks in enumerate((p1, p2)):
+            np.bitwise_and(masks[:, np.newaxis, np.newaxis], CELL_MASKS, out=cells)
+            np.not_equal(cells, 0, out=out[:, channel])
+        # Empty cells: 1 - p1 - p2
+        np.add(out[:, 0], out[:, 1], out=out[:, 2])
+        np.subtract(1, out[:, 2], out=out[:, 2])
+        return self._buffer[:n]
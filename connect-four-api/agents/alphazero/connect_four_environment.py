@@ -1,4 +1,4 @@
-import numpy as np
+from core.bitboard import BitBoard
 
 
 class ConnectFourEnvironment:
@@ -15,8 +15,29 @@ class ConnectFourEnvironment:
     def __init__(self):
         self.reset()
 
+    @property
+    def board(self):
+        """Read-only 6x7 ndarray view of the bitboard; use ``step`` to play."""
+        return self.bitboard.to_array(writeable=False)
+
+    @board.setter
+    def board(self, board):
+        self.bitboard = BitBoard.from_array(board)
+        self.last_move = None
+
+    @property
+    def position_hash(self):
+        """64-bit Zobrist hash of the position, usable as a dict key."""
+        return self.bitboard.hash
+
+    @property
+    def canonical_hash(self):
+        """Position hash that is identical for the left-right mirrored position."""
+        return self.bitboard.canonical_hash
+
     def reset(self):
-        self.board = np.zeros((self.ROWS, self.COLS), dtype=int)
+        self.bitboard = BitBoard()
+        self.last_move = None
         self.current_player = 1
         self.done = False
         self.winner = None
@@ -24,11 +45,12 @@ class ConnectFourEnvironment:
 
     def get_state(self):
         """Returns a copy of the current state of the board."""
-        return self.board.copy()
+        return self.bitboard.to_array()
 
     def step(self, action_col):
         """
         Perform an action in the environment.
+        The landing cell is stored in ``last_move``.
         """
         if self.done:
             return self.get_state(), 0, True
@@ -36,10 +58,10 @@ class ConnectFourEnvironment:
         if not self.is_valid_action(action_col):
             return self.get_state(), -10, True
 
-        row = self.get_next_open_row(action_col)
-        self.board[row][action_col] = self.current_player
+        row = self.bitboard.drop(action_col, self.current_player)
+        self.last_move = (row, action_col)
 
-        if self.check_winner(self.current_player):
+        if self.check_win_at(row, action_col):
             self.done = True
             self.winner = self.current_player
             reward = 1
@@ -55,65 +77,20 @@ class ConnectFourEnvironment:
         return self.get_state(), reward, self.done
 
     def is_valid_action(self, col):
-        return self.board[0][col] == 0
+        return self.bitboard.can_play(col)
 
     def get_valid_actions(self):
-        valid_actions = []
-        for c in range(self.COLS):
-            if self.is_valid_action(c):
-                valid_actions.append(c)
-        return valid_actions
+        return self.bitboard.valid_columns()
 
     def get_next_open_row(self, col):
-        for r in range(self.ROWS - 1, -1, -1):
-            if self.board[r][col] == 0:
-                return r
-        return None
+        return self.bitboard.next_open_row(col)
 
     def check_winner(self, player):
-        board = self.board
-        # Horizontal
-        for r in range(self.ROWS):
-            for c in range(self.COLS - 3):
-                if (
-                    board[r][c] == player
-                    and board[r][c + 1] == player
-                    and board[r][c + 2] == player
-                    and board[r][c + 3] == player
-                ):
-                    return True
-        # Vertikal
-        for c in range(self.COLS):
-            for r in range(self.ROWS - 3):
-                if (
-                    board[r][c] == player
-                    and board[r + 1][c] == player
-                    and board[r + 2][c] == player
-                    and board[r + 3][c] == player
-                ):
-                    return True
-        # Diagonal (positiv)
-        for r in range(self.ROWS - 3):
-            for c in range(self.COLS - 3):
-                if (
-                    board[r][c] == player
-                    and board[r + 1][c + 1] == player
-                    and board[r + 2][c + 2] == player
-                    and board[r + 3][c + 3] == player
-                ):
-                    return True
-        # Diagonal (negativ)
-        for r in range(3, self.ROWS):
-            for c in range(self.COLS - 3):
-                if (
-                    board[r][c] == player
-                    and board[r - 1][c + 1] == player
-                    and board[r - 2][c + 2] == player
-                    and board[r - 3][c + 3] == player
-                ):
-                    return True
-
-        return False
+        return self.bitboard.has_won(player)
+
+    def check_win_at(self, row, col):
+        """Returns the player with a completed line through (row, col), otherwise 0."""
+        return self.bitboard.check_win_at(row, col)
 
     def check_draw(self):
-        return np.all(self.board != 0)
+        return self.bitboard.is_full()
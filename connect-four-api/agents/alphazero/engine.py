@@ -0,0 +1,72 @@
+import torch
+
+from agents.alphazero.connect_four_environment import ConnectFourEnvironment
+from agents.alphazero.evaluation_cache import EvaluationCache
+from agents.alphazero.inference_broker import InferenceBroker
+from agents.alphazero.inference_model import load_inference_model
+from agents.alphazero.mcts import MCTS
+from agents.alphazero.quantization import load_quantized_model
+from agents.alphazero.search_stats import JsonStatsSink
+from core.constants import (
+    ALPHAZERO_BATCH_SIZE,
+    ALPHAZERO_BROKER_MAX_BATCH,
+    ALPHAZERO_BROKER_MAX_WAIT,
+    ALPHAZERO_N_SIMULATIONS,
+    ALPHAZERO_N_THREADS,
+    ALPHAZERO_TIME_BUDGET,
+    ALPHAZERO_TRANSPOSITIONS,
+    INFERENCE_MODEL_PATH,
+    MODEL_PATH,
+    QUANTIZED_MODEL_PATH,
+    SEARCH_STATS_PATH,
+)
+
+
+class AlphaZeroEngine:
+    """
+    The loaded AlphaZero model with the inference broker and evaluation
+    cache shared by all games. Importing this module imports torch, so the
+    move calculator only loads it when AI_Mode is used.
+    """
+
+    def __init__(self, quantized: bool = False):
+        """
+        Args:
+            quantized: Use the int8 model (only on CPU).
+        """
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.quantized = quantized and self.device == "cpu"
+        self.model = self._load_model()
+        # Batches the leaf evaluations of all concurrent games
+        self.inference_broker = InferenceBroker(
+            self.model,
+            self.device,
+            max_batch_size=ALPHAZERO_BROKER_MAX_BATCH,
+            max_wait=ALPHAZERO_BROKER_MAX_WAIT,
+        )
+        # Shared by all AlphaZero searches (and sessions)
+        self.evaluation_cache = EvaluationCache()
+        self.search_stats_sink = (
+            JsonStatsSink(SEARCH_STATS_PATH) if SEARCH_STATS_PATH else None
+        )
+
+    def _load_model(self) -> torch.nn.Module:
+        if self.quantized:
+            return load_quantized_model(QUANTIZED_MODEL_PATH, MODEL_PATH)
+        return load_inference_model(INFERENCE_MODEL_PATH, MODEL_PATH, self.device)
+
+    def new_search(self) -> MCTS:
+        """Create an AlphaZero search that can be kept for one game."""
+        return MCTS(
+            ConnectFourEnvironment(),
+            self.model,
+            n_simulations=ALPHAZERO_N_SIMULATIONS,
+            device=self.device,
+            batch_size=ALPHAZERO_BATCH_SIZE,
+            cache=self.evaluation_cache,
+            time_budget=ALPHAZERO_TIME_BUDGET,
+            n_threads=ALPHAZERO_N_THREADS,
+            transpositions=ALPHAZERO_TRANSPOSITIONS,
+            on_search=self.search_stats_sink,
+            broker=self.inference_broker,
+        )
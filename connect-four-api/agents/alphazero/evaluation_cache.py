@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from core.constants import ALPHAZERO_CACHE_SIZE, COLUMNS
+
+# Approximate bytes per entry: policy array, value, key and OrderedDict link
+_ENTRY_OVERHEAD = 200
+
+
+class EvaluationCache:
+    """
+    Bounded LRU cache of network evaluations (policy, value), shared by
+    several searches.
+
+    Entries are keyed by the canonical position hash, so a position and its
+    mirror image share one entry. Policies are stored in the canonical
+    orientation and flipped on the way in and out for mirrored positions.
+    The player to move follows from the coin counts, so the position alone
+    identifies the network input.
+
+    The cache belongs to one set of model weights; clear it (or use a new
+    one) when the model changes. All methods are thread-safe.
+    """
+
+    def __init__(self, capacity=ALPHAZERO_CACHE_SIZE):
+        """
+        Args:
+            capacity (int): Maximum number of positions kept.
+        """
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, board):
+        """
+        Look up the evaluation of a position.
+
+        Args:
+            board (BitBoard): The position.
+
+        Returns:
+            tuple: (policy (7,), value) for the player to move, or None.
+        """
+        key = board.canonical_hash
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        policy, value = entry
+        if board.is_mirrored:
+            policy = policy[::-1]
+        return policy, value
+
+    def put(self, board, policy, value):
+        """
+        Store the evaluation of a position, evicting the least recently used
+        entry if the cache is full.
+
+        Args:
+            board (BitBoard): The position.
+            policy (np.array): Policy probabilities for all 7 columns.
+            value (float): Value for the player to move.
+        """
+        policy = np.array(policy, dtype=np.float32)
+        if board.is_mirrored:
+            policy = policy[::-1].copy()
+        key = board.canonical_hash
+        with self._lock:
+            self._entries[key] = (policy, float(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """Share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the entries in bytes."""
+        return len(self._entries) * (COLUMNS * 4 + _ENTRY_OVERHEAD)
+
+    def stats(self):
+        """Counters for logging."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "memory_bytes": self.nbytes,
+        }
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+import torch
+
+
+class InferenceBroker:
+    """
+    Batches network evaluations from many searches into shared forward passes.
+
+    Searches (in any thread) submit encoded positions and get a Future. A
+    single worker thread takes the queued requests, waits until
+    ``max_batch_size`` positions are queued or ``max_wait`` seconds have
+    passed since the oldest request, runs one forward pass and hands every
+    request its slice of the result. While the model runs, new requests
+    queue up and form the next batch.
+    """
+
+    def __init__(self, model, device="cpu", max_batch_size=64, max_wait=0.001):
+        """
+        Args:
+            model: Network returning (policy_logits, value) for (B, 3, 6, 7).
+            device (str): "cpu" or "cuda".
+            max_batch_size (int): Positions per forward pass (a single larger
+                request is still run in one pass).
+            max_wait (float): Seconds a request may wait for others to join.
+        """
+        self.model = model
+        self.model.eval()
+        self.device = device
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        # Batches are assembled in here instead of a new array per forward pass
+        self._inputs = torch.empty((max_batch_size, 3, 6, 7), dtype=torch.float32)
+
+        self._requests = deque()  # (channels, future, submitted_at)
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self.batches = 0
+        self.positions = 0
+
+        self._worker = threading.Thread(
+            target=self._run, name="inference-broker", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, channels):
+        """
+        Queue positions for evaluation. Thread-safe.
+
+        Args:
+            channels (np.array): Encoded positions, shape (n, 3, 6, 7).
+
+        Returns:
+            Future: Resolves to policy probabilities (n, 7) and values (n,).
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("InferenceBroker is closed")
+            self._requests.append((channels, future, time.perf_counter()))
+            self._condition.notify()
+        return future
+
+    def evaluate(self, channels):
+        """Submit positions and wait for the result (blocking)."""
+        return self.submit(channels).result()
+
+    async def evaluate_async(self, channels):
+        """Submit positions and await the result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(channels))
+
+    def close(self):
+        """Stop the worker after the queued requests are done."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+
+    @property
+    def mean_batch_size(self):
+        return self.positions / self.batches if self.batches else 0.0
+
+    def _take_batch(self):
+        """Wait for requests and take up to ``max_batch_size`` positions."""
+        with self._condition:
+            while not self._requests and not self._closed:
+                self._condition.wait()
+            if not self._requests:
+                return None
+
+            deadline = self._requests[0][2] + self.max_wait
+            while not self._closed:
+                queued = sum(len(request[0]) for request in self._requests)
+                remaining = deadline - time.perf_counter()
+                if queued >= self.max_batch_size or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = []
+            size = 0
+            while self._requests and (
+                not batch or size + len(self._requests[0][0]) <= self.max_batch_size
+            ):
+                request = self._requests.popleft()
+                # Drops requests whose caller has given up (e.g. a cancelled
+                # evaluate_async); the others can no longer be cancelled
+                if request[1].set_running_or_notify_cancel():
+                    batch.append(request)
+                    size += len(request[0])
+            return batch
+
+    def _assemble(self, arrays):
+        """Copy the requests' positions into the input buffer."""
+        n = sum(len(array) for array in arrays)
+        if n > len(self._inputs):
+            # A single request larger than max_batch_size
+            self._inputs = torch.empty((n, 3, 6, 7), dtype=torch.float32)
+        np.concatenate(arrays, out=self._inputs[:n].numpy())
+        return self._inputs[:n]
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            if batch:
+                self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        """
+        Evaluate one batch and resolve its futures. Errors are passed to the
+        requests of this batch only, so the worker keeps serving the others.
+        """
+        try:
+            channels = self._assemble([request[0] for request in batch])
+            state_input = channels.to(self.device)
+            with torch.no_grad():
+                policy_logits, value_pred = self.model(state_input)
+                policy_probs = torch.softmax(policy_logits, dim=1).cpu().numpy()
+                values = value_pred.view(-1).cpu().numpy()
+
+            self.batches += 1
+            self.positions += len(channels)
+            start = 0
+            for request, future, _ in batch:
+                end = start + len(request)
+                future.set_result((policy_probs[start:end], values[start:end]))
+                start = end
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
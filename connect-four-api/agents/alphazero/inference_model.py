@@ -0,0 +1,118 @@
+import os
+
+import torch
+import torch.nn.functional as F
+from torch import nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval, fuse_linear_bn_eval
+
+from agents.alphazero.alphazero_model import AlphaZeroModel
+from core.logger import logger
+
+
+class FusedAlphaZeroModel(nn.Module):
+    """
+    Inference-only version of AlphaZeroModel with the same outputs.
+
+    The batch norms are folded into the preceding conv / linear layers
+    (using their running statistics), and the policy and value heads are
+    merged into one linear layer. Only valid in eval mode; not trainable.
+    """
+
+    def __init__(self, model: AlphaZeroModel):
+        super().__init__()
+        model = model.eval()
+        self.conv1 = fuse_conv_bn_eval(model.conv1, model.bn1)
+        self.conv2 = fuse_conv_bn_eval(model.conv2, model.bn2)
+        self.conv3 = fuse_conv_bn_eval(model.conv3, model.bn3)
+        self.conv4 = fuse_conv_bn_eval(model.conv4, model.bn4)
+        self.fc1 = fuse_linear_bn_eval(model.fc1, model.bn_fc1)
+
+        # Rows 0-6: policy logits, row 7: value
+        self.heads = nn.Linear(256, 8, device=model.fc1.weight.device)
+        with torch.no_grad():
+            self.heads.weight.copy_(
+                torch.cat([model.policy_head.weight, model.value_head.weight])
+            )
+            self.heads.bias.copy_(
+                torch.cat([model.policy_head.bias, model.value_head.bias])
+            )
+        self.eval()
+
+    def forward(self, x):
+        x = F.relu(self.conv1(x))
+        x = F.relu(self.conv2(x))
+        x = F.relu(self.conv3(x))
+        x = F.relu(self.conv4(x))
+        x = F.relu(self.fc1(x.flatten(1)))
+        out = self.heads(x)
+        return out[:, :7], torch.tanh(out[:, 7:])
+
+
+def freeze_for_inference(model: AlphaZeroModel) -> nn.Module:
+    """
+    Fuse the model and freeze it as TorchScript. Falls back to the fused
+    eager module if scripting is not available.
+
+    Args:
+        model: Trained AlphaZeroModel (its weights are copied, not shared).
+
+    Returns:
+        Module with the same (policy, value) outputs for inference.
+    """
+    fused = FusedAlphaZeroModel(model)
+    try:
+        return torch.jit.freeze(torch.jit.script(fused))
+    except Exception as e:
+        logger.warning(f"TorchScript freezing failed, using the fused eager model: {e}")
+        return fused
+
+
+def export_inference_model(model: AlphaZeroModel, path: str):
+    """
+    Save the fused and frozen model as a TorchScript file.
+
+    Unlike freeze_for_inference there is no eager fallback: if the model
+    cannot be scripted, the TorchScript error is raised and nothing is saved.
+
+    Args:
+        model: Trained AlphaZeroModel.
+        path: Output file, e.g. INFERENCE_MODEL_PATH.
+    """
+    frozen = torch.jit.freeze(torch.jit.script(FusedAlphaZeroModel(model)))
+    torch.jit.save(frozen, path)
+
+
+def load_inference_model(
+    path: str, state_dict_path: str, device: str = "cpu"
+) -> nn.Module:
+    """
+    Load the exported TorchScript model. Without a usable export, the eager
+    state dict is loaded instead and frozen in-process; if even that fails,
+    the plain eager model is used.
+
+    Args:
+        path: TorchScript file written by export_inference_model.
+        state_dict_path: AlphaZeroModel state dict used as fallback.
+        device: "cpu" or "cuda".
+
+    Returns:
+        Module returning (policy_logits, value) in eval mode.
+    """
+    if os.path.exists(path):
+        try:
+            model = torch.jit.load(path, map_location=device)
+            model.eval()
+            return model
+        except Exception as e:
+            logger.warning(
+                f"Could not load {path}, falling back to {state_dict_path}: {e}"
+            )
+
+    model = AlphaZeroModel().to(device)
+    model.load_state_dict(torch.load(state_dict_path, map_location=device))
+    model.eval()
+    try:
+        return freeze_for_inference(model)
+    except Exception as e:
+        logger.warning(f"Could not fuse the model, using it unchanged: {e}")
+        return model
@@ -1,64 +1,14 @@
-import math
+import threading
+import time
+
 import numpy as np
 import torch
 
-from agents.alphazero.helpers import board_to_channels
-
-
-class MCTSNode:
-    def __init__(self, state, current_player, policy=None):
-        """
-        Initialize a Monte Carlo Tree Search (MCTS) node.
-
-        Args:
-            state (np.array): 6x7 board.
-            current_player (int): 1 or 2.
-            policy (dict, optional): {action: prior_probability}.
-        """
-        self.state = state
-        self.current_player = current_player
-        self.policy = policy if policy is not None else {}
-
-        self.N = {}  # Visit counts per action
-        self.W = {}  # Cumulative values per action
-        self.children = {}  # Action -> MCTSNode
-        self.is_expanded = False
-        self.terminal = False
-        self.winner = None
-        self.value = 0.0  # Default
-
-    def get_Q(self, action):
-        """
-        Calculate Q(s,a) = W(s,a)/N(s,a).
-
-        Args:
-            action: The action to evaluate.
-
-        Returns:
-            float: The Q value for the action.
-        """
-        if self.N.get(action, 0) == 0:
-            return 0
-        return self.W[action] / self.N[action]
-
-    def get_U(self, action, c_puct=1.0):
-        """
-        Calculate U(s,a) = c_puct * P(s,a) * sqrt(sum(N(s,b))) / (1 + N(s,a)).
-
-        Args:
-            action: The action to evaluate.
-            c_puct (float): The exploration constant.
-
-        Returns:
-            float: The U value for the action.
-        """
-        sumN = sum(self.N.get(a, 0) for a in self.N)
-        return (
-            c_puct
-            * self.policy.get(action, 0)
-            * math.sqrt(sumN + 1e-8)
-            / (1 + self.N.get(action, 0))
-        )
+from agents.alphazero.board_encoder import BoardEncoder
+from agents.alphazero.node_pool import NO_NODE, NodePool
+from agents.alphazero.search_stats import SearchStats
+from core.bitboard import BitBoard
+from core.constants import COLUMNS, ROWS
 
 
 class MCTS:
@@ -72,6 +22,16 @@ class MCTS:
         dirichlet_alpha=0.03,
         dirichlet_epsilon=0.25,
         add_root_noise=True,
+        batch_size=1,
+        virtual_loss=1,
+        reuse_depth=2,
+        cache=None,
+        time_budget=None,
+        n_threads=1,
+        transpositions=False,
+        solver=True,
+        on_search=None,
+        broker=None,
     ):
         """
         Initialize the Monte Carlo Tree Search (MCTS).
@@ -80,11 +40,34 @@ class MCTS:
             env: The environment.
             model: The neural network model.
             c_puct (float): The exploration constant.
-            n_simulations (int): Number of simulations.
+            n_simulations (int): Number of simulations (an upper limit if a
+                time budget is given; None for no limit).
             device (str): "cpu" or "cuda".
             dirichlet_alpha (float): Alpha parameter for Dirichlet noise.
             dirichlet_epsilon (float): Epsilon parameter for Dirichlet noise.
             add_root_noise (bool): Whether to add noise to the root node.
+            batch_size (int): Number of leaves collected (using virtual loss)
+                and evaluated in one forward pass.
+            virtual_loss (int): Loss temporarily added to every edge on a
+                pending path so the next descent in the batch avoids it.
+            reuse_depth (int): How many plies below the previous root a new
+                search position may be to keep its subtree.
+            cache (EvaluationCache, optional): Network evaluations shared with
+                other searches using the same model.
+            time_budget (float, optional): Wall-clock seconds per search.
+            n_threads (int): Worker threads sharing the tree. Each worker
+                selects a batch under the tree lock and runs the model outside
+                it, so descents overlap with inference.
+            transpositions (bool): Search a DAG instead of a tree: a position
+                reached by another move order links to the existing node, so
+                it is evaluated once and its subtree statistics are shared.
+            solver (bool): Resolve immediate wins and forced blocks without
+                the model and propagate proven wins and losses; the search
+                stops as soon as the root is solved.
+            on_search (callable, optional): Called with the SearchStats after
+                every search, e.g. a TensorBoardStatsSink or JsonStatsSink.
+            broker (InferenceBroker, optional): Send positions to a broker
+                shared with other searches instead of calling the model.
         """
         self.env = env
         self.model = model
@@ -92,168 +75,677 @@ class MCTS:
         self.c_puct = c_puct
         self.n_simulations = n_simulations
         self.device = device
+        self.batch_size = max(1, int(batch_size))
+        self.virtual_loss = virtual_loss
+        self.reuse_depth = reuse_depth
+        self.cache = cache
+        self.time_budget = time_budget
+        self.n_threads = max(1, int(n_threads))
+        self.transpositions = transpositions
+        self.solver = solver
+        self.on_search = on_search
+        self.broker = broker
 
         # Dirichlet noise parameters
         self.dirichlet_alpha = dirichlet_alpha
         self.dirichlet_epsilon = dirichlet_epsilon
         self.add_root_noise = add_root_noise
 
+        # All nodes live in one array-backed pool; nodes are pool indices
+        self.pool = NodePool()
         self.root = None
+        self.root_hash = None
+        self.root_board = None
+        # Position hash -> node, only used with transpositions
+        self.nodes_by_hash = {}
+
+        # Guards the pool and the statistics while workers search in parallel
+        self._lock = threading.Lock()
+        # One input buffer per worker index, kept across searches (see _encoder)
+        self._encoders = []
 
-    def search(self, state, current_player):
+        # Statistics of the last search
+        self.stats = SearchStats(self.batch_size, self.n_threads)
+
+    def search(self, state, current_player, time_budget=None, stop=None):
         """
         Start point of MCTS: Builds the tree starting from the root node.
         Returns the visit counts for each action.
 
+        With a time budget the search is anytime: it stops before the next
+        batch would exceed the deadline (estimated from the slowest batch so
+        far) and returns the visits collected until then. At least the root
+        is always evaluated.
+
         Args:
             state (np.array): The current state of the board.
             current_player (int): The current player (1 or 2).
+            time_budget (float, optional): Wall-clock seconds for this search;
+                defaults to the budget given at construction.
+            stop (threading.Event, optional): Ends the search early when set,
+                e.g. because the move is no longer needed.
 
         Returns:
             dict: Visit counts for each action.
         """
-        if self.root is None or not np.array_equal(self.root.state, state):
-            self.root = MCTSNode(state, current_player)
+        start = time.perf_counter()
+        if time_budget is None:
+            time_budget = self.time_budget
+        deadline = None if time_budget is None else start + time_budget
+        limit = self.n_simulations
+        if limit is None:
+            if deadline is None:
+                raise ValueError("Either n_simulations or time_budget is required")
+            limit = float("inf")
+        return self._search(state, current_player, limit, deadline, stop)
+
+    def ponder(self, state, current_player, stop, max_simulations=None):
+        """
+        Keep searching the opponent's position while they think, until
+        ``stop`` is set (e.g. from another thread). The visits spread over the
+        likely replies, and the next search continues from the subtree of the
+        reply actually played.
 
-        for _ in range(self.n_simulations):
-            self.simulate(self.root)
+        Args:
+            state (np.array): The board after our move.
+            current_player (int): The opponent, who is to move.
+            stop (threading.Event): Set to end pondering.
+            max_simulations (int, optional): Upper limit to bound memory.
 
-        act_visits = {a: self.root.N.get(a, 0) for a in self.root.policy}
-        return act_visits
+        Returns:
+            dict: Visit counts for each of the opponent's actions.
+        """
+        limit = float("inf") if max_simulations is None else max_simulations
+        return self._search(state, current_player, limit, None, stop)
 
-    def simulate(self, node):
+    def _search(self, state, current_player, limit, deadline, stop=None):
+        """
+        Run simulations from ``state`` until ``limit`` is reached, the next
+        batch would miss ``deadline``, ``stop`` is set or the root is solved.
+        """
+        start = time.perf_counter()
+        self.stats = SearchStats(self.batch_size, self.n_threads)
+        self._set_root(BitBoard.from_array(state), current_player)
+
+        simulations = 0
+        if not self.pool.expanded[self.root]:
+            self._run_batch(1)
+            simulations += 1
+        progress = {"simulations": simulations, "slowest_batch": 0.0, "error": None}
+        if self.n_threads == 1:
+            self._worker(progress, limit, deadline, stop)
+        else:
+            workers = [
+                threading.Thread(
+                    target=self._thread_worker,
+                    args=(progress, limit, deadline, stop, index),
+                )
+                for index in range(self.n_threads)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            if progress["error"] is not None:
+                # Same as with a single thread: the move must not be taken
+                # from a partial tree
+                raise progress["error"]
+        self.stats.simulations = progress["simulations"]
+        self.stats.elapsed = time.perf_counter() - start
+        self.stats.nodes = self.pool.size
+        self.stats.memory_bytes = self.pool.nbytes
+        self.stats.solved = int(self.pool.proven[self.root])
+        if self.on_search is not None:
+            self.on_search(self.stats)
+        return self._root_visits()
+
+    def _root_visits(self):
         """
-        Simulate a single playthrough from the given node.
+        Visit counts of the root's legal actions. For a root proven won all
+        visits go to the winning moves. A root proven lost without visited
+        children (e.g. a double threat) delays the loss: its visit goes to a
+        move that blocks an immediate win, or else to the move with the
+        highest prior. If nothing was visited otherwise, every legal action
+        gets one visit.
+        """
+        pool = self.pool
+        root = self.root
+        visits = {
+            a: int(pool.N[root, a]) for a in range(COLUMNS) if pool.legal[root, a]
+        }
+        total = sum(visits.values())
+        if pool.proven[root] == 1:
+            winning = set(self.root_board.winning_columns(int(pool.player[root])))
+            for a, child in enumerate(pool.children[root]):
+                if child != NO_NODE and pool.proven[child] == -1:
+                    winning.add(a)
+            return {a: max(total, 1) if a in winning else 0 for a in visits}
+        if pool.proven[root] == -1 and total == 0 and visits:
+            blocks = self.root_board.winning_columns(3 - int(pool.player[root]))
+            blocks = [a for a in blocks if a in visits]
+            best = blocks[0] if blocks else max(visits, key=lambda a: pool.P[root, a])
+            return {a: int(a == best) for a in visits}
+        if total == 0:
+            return {a: 1 for a in visits}
+        return visits
+
+    def _set_root(self, board, player):
+        """
+        Make ``board`` the root. If it is the current root or a position
+        reached within ``reuse_depth`` plies (e.g. after our move and the
+        opponent's reply), its subtree and visit statistics are kept and all
+        other nodes are freed. Otherwise the tree starts from scratch.
 
         Args:
-            node (MCTSNode): The node to start the simulation from.
+            board (BitBoard): The new root position.
+            player (int): The player to move.
+        """
+        node = None
+        if self.root is not None:
+            node = self._find_descendant(board.hash, player)
+
+        if node is None:
+            self.pool.clear()
+            self.nodes_by_hash.clear()
+            self.root = self._new_node(board, player)
+            if self.transpositions:
+                self.nodes_by_hash[board.hash] = self.root
+        elif node != self.root:
+            mapping = self.pool.compact(node)
+            self.nodes_by_hash = {
+                position_hash: int(mapping[old])
+                for position_hash, old in self.nodes_by_hash.items()
+                if mapping[old] != NO_NODE
+            }
+            self.root = 0
+            if self.add_root_noise and self.pool.expanded[self.root]:
+                self._add_root_noise(self.root)
+
+        self.root_hash = board.hash
+        self.root_board = board
+        self.stats.reused_visits = int(self.pool.N_total[self.root])
+
+    def _find_descendant(self, position_hash, player):
+        """
+        Breadth-first search of the existing tree, up to ``reuse_depth`` plies
+        below the root, for a node with the given position and player to move.
+        In DAG mode every node is looked up by its position hash instead.
 
         Returns:
-            float: The value of the node.
+            int: The node, or None if the position is not in the tree.
         """
-        if not node.is_expanded:
-            self.expand(node)
-            return -node.value
-
-        best_action, next_node = self.select_child(node)
+        pool = self.pool
+        if self.transpositions:
+            node = self.nodes_by_hash.get(position_hash)
+            if node is not None and pool.player[node] == player:
+                return node
+            return None
+        frontier = [(self.root, self.root_board)]
+        for depth in range(self.reuse_depth + 1):
+            next_frontier = []
+            for node, board in frontier:
+                if board.hash == position_hash and pool.player[node] == player:
+                    return node
+                if depth == self.reuse_depth:
+                    continue
+                for action, child in enumerate(pool.children[node]):
+                    if child != NO_NODE:
+                        child_board = board.copy()
+                        child_board.drop(action, int(pool.player[node]))
+                        next_frontier.append((int(child), child_board))
+            frontier = next_frontier
+        return None
+
+    def _new_node(self, board, player, parent=NO_NODE, last_move=None):
+        """
+        Allocate a node and record whether its position is terminal.
 
-        if next_node is None:
-            return -node.value
+        Args:
+            board (BitBoard): Position of the node.
+            player (int): Player to move.
+            parent (int): Parent node (NO_NODE for the root).
+            last_move (tuple, optional): (row, col) of the move leading here;
+                without it the whole board is scanned.
 
-        value = self.simulate(next_node)
+        Returns:
+            int: Index of the new node.
+        """
+        pool = self.pool
+        if last_move is not None:
+            node = pool.allocate(player, parent, last_move[1])
+            winner = board.check_win_at(*last_move)
+        else:
+            node = pool.allocate(player)
+            winner = board.winner()
+        if winner != 0:
+            pool.terminal[node] = True
+            pool.winner[node] = winner
+            pool.value[node] = 1 if winner == player else -1
+            pool.proven[node] = pool.value[node]
+        elif board.is_full():
+            pool.terminal[node] = True
+            pool.winner[node] = 0
+            pool.value[node] = 0
+        return node
+
+    def node_board(self, node):
+        """
+        Reconstruct the position of a node by replaying its actions from the root.
 
-        node.N[best_action] = node.N.get(best_action, 0) + 1
-        node.W[best_action] = node.W.get(best_action, 0) + value
+        Args:
+            node (int): The node.
 
-        return -value
+        Returns:
+            BitBoard: The position of the node.
+        """
+        board = self.root_board.copy()
+        player = int(self.pool.player[self.root])
+        for action in self.pool.actions_to(node):
+            board.drop(action, player)
+            player = 3 - player
+        return board
+
+    def _thread_worker(self, progress, limit, deadline, stop=None, index=0):
+        """
+        ``_worker`` for a search thread: the first exception (e.g. of the
+        model or the broker) is stored in ``progress["error"]`` for the
+        calling thread to raise, and the other workers stop.
+        """
+        try:
+            self._worker(progress, limit, deadline, stop, index)
+        except BaseException as e:
+            with self._lock:
+                if progress["error"] is None:
+                    progress["error"] = e
+
+    def _worker(self, progress, limit, deadline, stop=None, index=0):
+        """
+        Run batches until the simulation limit is claimed, the next batch
+        would miss the deadline (estimated from the slowest batch so far),
+        ``stop`` is set or the root is solved.
+        Selection and backup hold the tree lock; the model runs outside it.
 
-    def expand(self, node):
+        Args:
+            progress (dict): Simulations claimed, the slowest batch time and
+                the error of a failed worker, shared by all workers.
+            limit (float): Total number of simulations.
+            deadline (float): time.perf_counter() value to stop at, or None.
+            stop (threading.Event, optional): Ends the search when set.
+            index (int): Worker number, selects the worker's input buffer.
         """
-        Expand the given node by adding all valid children.
+        while True:
+            with self._lock:
+                batch_start = time.perf_counter()
+                remaining = limit - progress["simulations"]
+                if remaining <= 0 or self.pool.proven[self.root]:
+                    return
+                if progress["error"] is not None:
+                    return
+                if stop is not None and stop.is_set():
+                    return
+                if (
+                    deadline is not None
+                    and batch_start + progress["slowest_batch"] > deadline
+                ):
+                    return
+                count = int(min(self.batch_size, remaining))
+                progress["simulations"] += count
+                pending, finished = self._collect(count)
+
+            try:
+                evaluation = self._evaluate(
+                    [board for board, _ in pending.values()], index
+                )
+            except BaseException:
+                with self._lock:
+                    self._discard(pending, finished)
+                raise
+
+            with self._lock:
+                self._apply(pending, finished, *evaluation)
+                progress["slowest_batch"] = max(
+                    progress["slowest_batch"], time.perf_counter() - batch_start
+                )
+
+    def _run_batch(self, count):
+        """
+        Run ``count`` simulations: descend ``count`` paths with virtual loss,
+        evaluate all new leaves in one forward pass and back every path up.
 
         Args:
-            node (MCTSNode): The node to expand.
-        """
-        if not hasattr(self, "_temp_env"):
-            self._temp_env = ConnectFourEnvCopy(np.zeros((6, 7), dtype=int), 1)
-
-        self._temp_env.set_state(node.state, node.current_player)
-        temp_env = self._temp_env
-
-        # Terminal checks
-        if temp_env.is_done():
-            node.terminal = True
-            node.winner = temp_env.winner
-            if node.winner == 0:
-                node.value = 0
-            elif node.winner == node.current_player:
-                node.value = 1
+            count (int): Number of simulations in this batch.
+        """
+        pending, finished = self._collect(count)
+        try:
+            evaluation = self._evaluate([board for board, _ in pending.values()])
+        except BaseException:
+            self._discard(pending, finished)
+            raise
+        self._apply(pending, finished, *evaluation)
+
+    def _collect(self, count):
+        """
+        Descend ``count`` paths with virtual loss.
+
+        Returns:
+            tuple: ``pending`` (leaf -> (board, [paths])) for leaves that need
+                the model, and ``finished`` ((path, leaf) pairs) for terminal
+                or already expanded leaves.
+        """
+        pool = self.pool
+        pending = {}  # leaf -> (board, [paths])
+        finished = []  # (path, leaf)
+
+        start = time.perf_counter()
+        stepping = 0.0
+        for _ in range(count):
+            path, leaf, board, step_time = self._select_leaf(self.root)
+            stepping += step_time
+            self.stats.record_depth(len(path))
+            if pool.terminal[leaf]:
+                pool.expanded[leaf] = True
+                finished.append((path, leaf))
+            elif not pool.expanded[leaf]:
+                pending.setdefault(leaf, (board, []))[1].append(path)
             else:
-                node.value = -1
-            node.is_expanded = True
-            return
-
-        valid_actions = temp_env.get_valid_actions()
-        if not valid_actions:
-            node.terminal = True
-            node.value = 0
-            node.is_expanded = True
-            return
-
-        # Forward pass for policy + value
-        channels = board_to_channels(node.state)
-        state_input = torch.FloatTensor(channels).unsqueeze(0).to(self.device)
-
-        with torch.no_grad():
-            self.model.eval()
-            policy_logits, value_pred = self.model(state_input)
-            policy_probs = torch.softmax(policy_logits, dim=1).cpu().numpy()[0]
-            value_pred = value_pred.item()
-
-        policy_dict = {}
-        for a in valid_actions:
-            policy_dict[a] = policy_probs[a]
+                finished.append((path, leaf))
+        self.stats.add_time("stepping", stepping)
+        self.stats.add_time("selection", time.perf_counter() - start - stepping)
+        return pending, finished
 
-        # --- DIRICHLET NOISE if root ---
-        if node == self.root and self.add_root_noise:
-            alpha_array = [self.dirichlet_alpha] * len(valid_actions)
-            noise = np.random.dirichlet(alpha_array)  # shape = (#valid_actions,)
+    def _apply(self, pending, finished, policies, values, evaluated):
+        """
+        Expand the evaluated leaves and back every path of the batch up.
 
-            for i, a in enumerate(valid_actions):
-                # p'(a) = (1 - eps) * p(a) + eps * noise[i]
-                policy_dict[a] = (1.0 - self.dirichlet_epsilon) * policy_dict[
-                    a
-                ] + self.dirichlet_epsilon * noise[i]
+        Args:
+            pending (dict): Leaves evaluated by the model (see ``_collect``).
+            finished (list): Paths ending in terminal or expanded leaves.
+            policies (np.array): Policy probabilities for the pending leaves.
+            values (np.array): Values for the pending leaves.
+            evaluated (int): Positions the model ran on (the rest were cached).
+        """
+        pool = self.pool
+        for (leaf, (board, _)), policy, value in zip(
+            pending.items(), policies, values, strict=True
+        ):
+            # Another worker may have expanded the same leaf in the meantime
+            if not pool.expanded[leaf]:
+                self._expand_with(leaf, board, policy, value)
+
+        self.stats.record_batch(evaluated, len(pending) - evaluated)
+
+        start = time.perf_counter()
+        for leaf, (_, paths) in pending.items():
+            for path in paths:
+                self._backup(path, pool.value[leaf])
+        for path, leaf in finished:
+            self._backup(path, pool.value[leaf])
+        self.stats.add_time("backup", time.perf_counter() - start)
+
+    def _discard(self, pending, finished):
+        """
+        Remove the virtual loss of a batch that is not backed up because its
+        evaluation failed, so the tree stays usable for later searches.
 
-        # Normalize after possible noise
-        sum_p = sum(policy_dict.values())
-        if sum_p > 0:
-            for a in policy_dict:
-                policy_dict[a] /= sum_p
-        else:
-            for a in policy_dict:
-                policy_dict[a] = 1.0 / len(policy_dict)
+        Args:
+            pending (dict): Leaves of the batch that needed the model.
+            finished (list): Paths ending in terminal or expanded leaves.
+        """
+        pool = self.pool
+        vl = self.virtual_loss
+        paths = [path for _, paths in pending.values() for path in paths]
+        paths += [path for path, _ in finished]
+        for path in paths:
+            for node, action in path:
+                pool.N[node, action] -= vl
+                pool.W[node, action] += vl
+                pool.N_total[node] -= vl
+
+    def _select_leaf(self, node):
+        """
+        Descend from ``node`` to a leaf, adding virtual loss to every edge taken.
+        The position is replayed on a copy of the root board on the way down,
+        and a child node is only created the first time its action is selected
+        (in DAG mode, it is linked to an existing node of the same position).
+        With the solver, a forced move is followed without stopping at its node.
+
+        Returns:
+            tuple: The path as a list of (node, action), the leaf node, the
+                leaf's position (BitBoard) and the seconds spent playing moves
+                and creating nodes.
+        """
+        pool = self.pool
+        vl = self.virtual_loss
+        board = self.root_board.copy()
+        path = []
+        stepping = 0.0
+        while not pool.terminal[node] and not pool.proven[node]:
+            if not pool.expanded[node] and not (
+                self.solver and self._expand_forced(node, board)
+            ):
+                break
+            action = pool.select_action(node, self.c_puct)
+            if action < 0:
+                break
+            pool.N[node, action] += vl
+            pool.W[node, action] -= vl
+            pool.N_total[node] += vl
+            path.append((node, action))
+
+            step_start = time.perf_counter()
+            player = int(pool.player[node])
+            row = board.drop(action, player)
+            child = pool.children[node, action]
+            if child == NO_NODE and self.transpositions:
+                child = self.nodes_by_hash.get(board.hash, NO_NODE)
+                if child != NO_NODE:
+                    pool.children[node, action] = child
+            if child == NO_NODE:
+                child = self._new_node(board, 3 - player, node, (row, action))
+                if self.transpositions:
+                    self.nodes_by_hash[board.hash] = child
+            stepping += time.perf_counter() - step_start
+            node = child
+        return path, node, board, stepping
+
+    def _backup(self, path, leaf_value):
+        """
+        Propagate the value of a leaf up the path and remove the virtual loss.
+
+        Args:
+            path (list): (node, action) pairs from the root to the leaf's parent.
+            leaf_value (float): Value of the leaf from its player's perspective.
+        """
+        pool = self.pool
+        vl = self.virtual_loss
+        value = -leaf_value
+        for node, action in reversed(path):
+            pool.N[node, action] += 1 - vl
+            pool.W[node, action] += value + vl
+            pool.N_total[node] += 1 - vl
+            value = -value
+        if self.solver:
+            self._propagate_proof(path)
+
+    def _expand_forced(self, node, board):
+        """
+        Solver shortcuts, checked before a leaf is sent to the model. With an
+        immediate win the node is proven won, and if the opponent threatens to
+        win in two columns it is proven lost. If the opponent threatens one
+        column, blocking it is the only move: the node is expanded with just
+        that move and the descent passes through it.
+
+        Args:
+            node (int): An unexpanded, non-terminal node.
+            board (BitBoard): Position of the node.
 
-        # Save results
-        node.policy = policy_dict
-        node.value = value_pred
-        node.is_expanded = True
+        Returns:
+            bool: True if the node was expanded with a single forced move.
+        """
+        pool = self.pool
+        player = int(pool.player[node])
+        wins = board.winning_columns(player)
+        if wins:
+            pool.legal[node, wins] = True
+            pool.P[node, wins] = 1.0 / len(wins)
+            pool.expanded[node] = True
+            self._set_proven(node, 1)
+            return False
+
+        threats = board.winning_columns(3 - player)
+        if len(threats) > 1:
+            valid_actions = board.valid_columns()
+            pool.legal[node, valid_actions] = True
+            pool.P[node, valid_actions] = 1.0 / len(valid_actions)
+            pool.expanded[node] = True
+            self._set_proven(node, -1)
+            return False
+        if threats:
+            pool.legal[node, threats[0]] = True
+            pool.P[node, threats[0]] = 1.0
+            pool.expanded[node] = True
+            return True
+        return False
 
-        # Create children
-        for a in valid_actions:
-            next_state, next_player, done, winner = temp_env.step(a)
-            child_node = MCTSNode(next_state, next_player)
-            node.children[a] = child_node
+    def _set_proven(self, node, result):
+        self.pool.proven[node] = result
+        self.pool.value[node] = result
 
-    def select_child(self, node):
+    def _propagate_proof(self, path):
         """
-        Select the best child node based on the UCT value.
+        Carry proven results up the path: a node is won if one child is lost
+        for the opponent, and lost if every legal child is won for the opponent.
 
         Args:
-            node (MCTSNode): The node to select the child from.
+            path (list): (node, action) pairs from the root to the leaf's parent.
+        """
+        pool = self.pool
+        for node, action in reversed(path):
+            child = pool.children[node, action]
+            if pool.proven[child] == -1:
+                result = 1
+            elif pool.proven[child] == 1:
+                children = pool.children[node][pool.legal[node]]
+                if (children == NO_NODE).any() or (pool.proven[children] != 1).any():
+                    return
+                result = -1
+            else:
+                return
+            if pool.proven[node] == result:
+                return
+            self._set_proven(node, result)
+
+    def _evaluate(self, boards, index=0):
+        """
+        Run the model on a batch of positions. Positions found in the
+        evaluation cache are not sent to the model. Safe to call without
+        holding the tree lock.
+
+        Args:
+            boards (list): BitBoards to evaluate.
+            index (int): Worker number, selects the input buffer.
 
         Returns:
-            tuple: The best action and the corresponding child node.
+            tuple: Policy probabilities (B, 7) and values (B,) as np.arrays,
+                and the number of positions the model ran on.
+        """
+        policy_probs = np.empty((len(boards), COLUMNS), dtype=np.float32)
+        values = np.empty(len(boards), dtype=np.float32)
+
+        missing = []
+        for i, board in enumerate(boards):
+            cached = self.cache.get(board) if self.cache is not None else None
+            if cached is None:
+                missing.append(i)
+            else:
+                policy_probs[i], values[i] = cached
+        if not missing:
+            return policy_probs, values, 0
+
+        start = time.perf_counter()
+        channels = self._encoder(index).encode_bitboards([boards[i] for i in missing])
+        encoded = time.perf_counter()
+
+        if self.broker is not None:
+            policy_probs[missing], values[missing] = self.broker.evaluate(
+                channels.numpy()
+            )
+        else:
+            state_input = channels.to(self.device, non_blocking=True)
+            with torch.no_grad():
+                policy_logits, value_pred = self.model(state_input)
+                policy_probs[missing] = (
+                    torch.softmax(policy_logits, dim=1).cpu().numpy()
+                )
+                values[missing] = value_pred.view(-1).cpu().numpy()
+        self.stats.add_time("encoding", encoded - start)
+        self.stats.add_time("inference", time.perf_counter() - encoded)
+
+        if self.cache is not None:
+            for i in missing:
+                self.cache.put(boards[i], policy_probs[i], values[i])
+        return policy_probs, values, len(missing)
+
+    def _encoder(self, index):
         """
-        best_value = -float("inf")
-        best_action = None
-        best_child = None
+        BoardEncoder of worker ``index``. The search threads are new for
+        every search, but their buffers are kept on the instance and reused
+        for every batch of every search.
+        """
+        with self._lock:
+            while len(self._encoders) <= index:
+                self._encoders.append(BoardEncoder(self.batch_size, self.device))
+            return self._encoders[index]
+
+    def _expand_with(self, node, board, policy_probs, value_pred):
+        """
+        Expand a non-terminal node with the model's policy and value.
+        Children are not created here but on their first selection.
+
+        Args:
+            node (int): The node to expand.
+            board (BitBoard): Position of the node.
+            policy_probs (np.array): Prior probabilities for all 7 columns.
+            value_pred (float): Value of the position for the player to move.
+        """
+        pool = self.pool
+        valid_actions = board.valid_columns()
+
+        priors = np.zeros(COLUMNS, dtype=np.float32)
+        priors[valid_actions] = policy_probs[valid_actions]
+
+        # Normalize over the valid actions
+        sum_p = priors.sum()
+        if sum_p > 0:
+            priors /= sum_p
+        else:
+            priors[valid_actions] = 1.0 / len(valid_actions)
 
-        for action, child in node.children.items():
-            q_value = node.get_Q(action)
-            u_value = node.get_U(action, self.c_puct)
-            score = q_value + u_value
-            if score > best_value:
-                best_value = score
-                best_action = action
-                best_child = child
+        pool.P[node] = priors
+        pool.legal[node, valid_actions] = True
+        pool.value[node] = value_pred
+        pool.expanded[node] = True
 
-        # If there are no children or best_child was never set:
-        if best_child is None:
-            # We have no child nodes -> Terminal state or error case
-            return None, None
+        # --- DIRICHLET NOISE if root ---
+        if node == self.root and self.add_root_noise:
+            self._add_root_noise(node)
 
-        return best_action, best_child
+    def _add_root_noise(self, node):
+        """
+        Mix Dirichlet noise into the priors of the (expanded) root node.
+
+        Args:
+            node (int): The root node.
+        """
+        pool = self.pool
+        valid_actions = np.flatnonzero(pool.legal[node])
+        noise = np.random.dirichlet([self.dirichlet_alpha] * len(valid_actions))
+        # p'(a) = (1 - eps) * p(a) + eps * noise[i]
+        priors = pool.P[node, valid_actions]
+        priors = (
+            1.0 - self.dirichlet_epsilon
+        ) * priors + self.dirichlet_epsilon * noise
+        pool.P[node, valid_actions] = priors / priors.sum()
 
 
 class ConnectFourEnvCopy:
@@ -270,14 +762,26 @@ class ConnectFourEnvCopy:
             state (np.array): The initial state of the board.
             current_player (int): The current player (1 or 2).
         """
-        self.state = state.copy()
-        self.current_player = current_player
-        self.rows, self.cols = self.state.shape
-        self.done = False
-        self.winner = None
-        if self.check_winner(self.current_player):
-            self.done = True
-            self.winner = self.current_player
+        self.set_state(state, current_player)
+
+    @property
+    def state(self):
+        """Read-only 6x7 ndarray view of the bitboard; use ``step`` to play."""
+        return self.bitboard.to_array(writeable=False)
+
+    @state.setter
+    def state(self, state):
+        self.bitboard = BitBoard.from_array(state)
+
+    @property
+    def position_hash(self):
+        """64-bit Zobrist hash of the position, usable as a dict key."""
+        return self.bitboard.hash
+
+    @property
+    def canonical_hash(self):
+        """Position hash that is identical for the left-right mirrored position."""
+        return self.bitboard.canonical_hash
 
     def set_state(self, state, current_player):
         """
@@ -287,14 +791,17 @@ class ConnectFourEnvCopy:
             state (np.array): The state to set.
             current_player (int): The current player (1 or 2).
         """
-        self.state = state.copy()
+        self.state = state
         self.current_player = current_player
-        self.rows, self.cols = self.state.shape
+        self.rows, self.cols = ROWS, COLUMNS
+        self.last_move = None
         self.done = False
         self.winner = None
-        if self.check_winner(self.current_player):
+        # The last move is unknown here, so fall back to the full scan
+        winner = self.bitboard.winner()
+        if winner != 0:
             self.done = True
-            self.winner = self.current_player
+            self.winner = winner
 
     def is_done(self):
         """
@@ -318,15 +825,12 @@ class ConnectFourEnvCopy:
         Returns:
             list: List of valid actions.
         """
-        valid_actions = []
-        for c in range(self.cols):
-            if self.state[0][c] == 0:  # If the top row in column c is empty
-                valid_actions.append(c)
-        return valid_actions
+        return self.bitboard.valid_columns()
 
     def step(self, action):
         """
         Execute a step in the environment.
+        The landing cell is stored in ``last_move``.
 
         Args:
             action (int): The action to execute.
@@ -338,19 +842,15 @@ class ConnectFourEnvCopy:
             return self.state, self.current_player, True, self.winner
 
         # Invalid -> Terminal
-        if self.state[0][action] != 0:
+        if not self.bitboard.can_play(action):
             self.done = True
             self.winner = 3
             return self.state, self.current_player, True, 3
 
-        row = -1
-        for r in range(self.rows - 1, -1, -1):
-            if self.state[r][action] == 0:
-                row = r
-                break
-        self.state[row][action] = self.current_player
+        row = self.bitboard.drop(action, self.current_player)
+        self.last_move = (row, action)
 
-        if self.check_winner(self.current_player):
+        if self.check_win_at(row, action):
             self.done = True
             self.winner = self.current_player
         elif self.check_draw():
@@ -358,7 +858,7 @@ class ConnectFourEnvCopy:
             self.winner = 0
 
         next_player = 2 if self.current_player == 1 else 1
-        return self.state.copy(), next_player, self.done, self.winner
+        return self.state, next_player, self.done, self.winner
 
     def check_winner(self, player):
         """
@@ -370,48 +870,20 @@ class ConnectFourEnvCopy:
         Returns:
             bool: True if the player has won, False otherwise.
         """
-        board = self.state
-        # Horizontal
-        for r in range(self.rows):
-            for c in range(self.cols - 3):
-                if (
-                    board[r][c] == player
-                    and board[r][c + 1] == player
-                    and board[r][c + 2] == player
-                    and board[r][c + 3] == player
-                ):
-                    return True
-        # Vertical
-        for c in range(self.cols):
-            for r in range(self.rows - 3):
-                if (
-                    board[r][c] == player
-                    and board[r + 1][c] == player
-                    and board[r + 2][c] == player
-                    and board[r + 3][c] == player
-                ):
-                    return True
-        # Diagonal
-        for r in range(self.rows - 3):
-            for c in range(self.cols - 3):
-                if (
-                    board[r][c] == player
-                    and board[r + 1][c + 1] == player
-                    and board[r + 2][c + 2] == player
-                    and board[r + 3][c + 3] == player
-                ):
-                    return True
-        for r in range(3, self.rows):
-            for c in range(self.cols - 3):
-                if (
-                    board[r][c] == player
-                    and board[r - 1][c + 1] == player
-                    and board[r - 2][c + 2] == player
-                    and board[r - 3][c + 3] == player
-                ):
-                    return True
+        return self.bitboard.has_won(player)
 
-        return False
+    def check_win_at(self, row, col):
+        """
+        Check only the lines through the given cell, e.g. the last move.
+
+        Args:
+            row (int): Row index (0 = top row).
+            col (int): Column index.
+
+        Returns:
+            int: The player owning a completed line through the cell, otherwise 0.
+        """
+        return self.bitboard.check_win_at(row, col)
 
     def check_draw(self):
         """
@@ -420,4 +892,4 @@ class ConnectFourEnvCopy:
         Returns:
             bool: True if the game is a draw, False otherwise.
         """
-        return np.all(self.state != 0)
+        return self.bitboard.is_full()
@@ -0,0 +1,171 @@
+import math
+
+import numpy as np
+
+N_ACTIONS = 7
+
+# Marker for "no node" in the child index table
+NO_NODE = -1
+
+# name -> (shape per node, dtype, fill value)
+_NODE_ARRAYS = {
+    "N": ((N_ACTIONS,), np.float32, 0),
+    "W": ((N_ACTIONS,), np.float32, 0),
+    "P": ((N_ACTIONS,), np.float32, 0),
+    "children": ((N_ACTIONS,), np.int32, NO_NODE),
+    "parent": ((), np.int32, NO_NODE),
+    "action": ((), np.int8, -1),
+    "legal": ((N_ACTIONS,), bool, False),
+    "N_total": ((), np.float32, 0),
+    "value": ((), np.float32, 0),
+    "player": ((), np.int8, 0),
+    "expanded": ((), bool, False),
+    "terminal": ((), bool, False),
+    "winner": ((), np.int8, -1),
+    "proven": ((), np.int8, 0),
+}
+
+
+class NodePool:
+    """
+    Struct-of-arrays storage for MCTS nodes.
+
+    Every node is an index into preallocated NumPy arrays with one slot per
+    column (7 actions), instead of a Python object holding dicts. Arrays grow
+    by doubling when the pool is full.
+
+    Per node and action:
+      N        visit counts (including pending virtual loss)
+      W        cumulative values from the perspective of the node's player
+      P        prior probabilities
+      children index of the child node, or NO_NODE while it was never selected
+      legal    whether the column can be played
+    Per node:
+      parent, action  the node it was created from and the column played
+      N_total  running sum of N over all actions
+      value    network (or terminal) value for the player to move
+      player   player to move (1 or 2)
+      expanded, terminal, winner (0 = draw, -1 = none)
+      proven   solved result for the player to move (1 = win, -1 = loss, 0 = unknown)
+    """
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.capacity = capacity
+        for name, (shape, dtype, fill) in _NODE_ARRAYS.items():
+            setattr(self, name, np.full((capacity, *shape), fill, dtype=dtype))
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name, (shape, dtype, fill) in _NODE_ARRAYS.items():
+            array = np.full((capacity, *shape), fill, dtype=dtype)
+            array[: self.size] = getattr(self, name)[: self.size]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def clear(self):
+        """Forget all nodes but keep the allocated memory."""
+        for name, (_, _, fill) in _NODE_ARRAYS.items():
+            getattr(self, name)[: self.size] = fill
+        self.size = 0
+
+    def allocate(self, player, parent=NO_NODE, action=-1):
+        """
+        Add a new node. Positions are not stored; they are derived from the
+        root position by replaying the actions on the way down.
+
+        Args:
+            player (int): Player to move in the node.
+            parent (int): Node this one was reached from (NO_NODE for a root).
+            action (int): Column played in the parent to reach this node.
+
+        Returns:
+            int: Index of the new node.
+        """
+        if self.size == self.capacity:
+            self._grow()
+        index = self.size
+        self.size += 1
+        self.player[index] = player
+        self.parent[index] = parent
+        self.action[index] = action
+        if parent != NO_NODE:
+            self.children[parent, action] = index
+        return index
+
+    def compact(self, root):
+        """
+        Keep only the nodes reachable from ``root`` and make it the new root
+        at index 0. All other nodes are freed; indices are renumbered.
+        A node reachable along several paths (a transposition) is kept once,
+        with the first path found as its parent link.
+
+        Args:
+            root (int): The node that becomes the root.
+
+        Returns:
+            np.array: New index of every old node, NO_NODE for freed nodes.
+        """
+        mapping = np.full(self.size, NO_NODE, dtype=np.int32)
+        mapping[root] = 0
+        keep = [root]
+        parents = [NO_NODE]
+        actions = [-1]
+        for node in keep:  # breadth-first; the list grows while iterating
+            for action, child in enumerate(self.children[node]):
+                if child != NO_NODE and mapping[child] == NO_NODE:
+                    mapping[child] = len(keep)
+                    keep.append(int(child))
+                    parents.append(mapping[node])
+                    actions.append(action)
+        kept = len(keep)
+        keep = np.array(keep, dtype=np.int64)
+
+        for name, (_, _, fill) in _NODE_ARRAYS.items():
+            array = getattr(self, name)
+            array[:kept] = array[keep]
+            array[kept : self.size] = fill
+
+        children = self.children[:kept]
+        self.children[:kept] = np.where(children != NO_NODE, mapping[children], NO_NODE)
+        self.parent[:kept] = parents
+        self.action[:kept] = actions
+        self.size = kept
+        return mapping
+
+    def actions_to(self, node):
+        """Columns played from the root to reach ``node``, in order."""
+        actions = []
+        while self.parent[node] != NO_NODE:
+            actions.append(int(self.action[node]))
+            node = self.parent[node]
+        return actions[::-1]
+
+    def select_action(self, node, c_puct):
+        """
+        PUCT selection as one vectorized argmax over the node's actions:
+        Q(s,a) + c_puct * P(s,a) * sqrt(sum(N(s,b))) / (1 + N(s,a)).
+        Actions into positions proven won for the opponent are skipped while
+        any other action is left.
+
+        Returns:
+            int: The best legal action, or -1 if the node has no legal action.
+        """
+        n = self.N[node]
+        q = np.divide(self.W[node], n, out=np.zeros(N_ACTIONS, np.float32), where=n > 0)
+        u = c_puct * self.P[node] * math.sqrt(self.N_total[node] + 1e-8) / (1 + n)
+        children = self.children[node]
+        lost = (children != NO_NODE) & (self.proven[children] == 1)
+        allowed = self.legal[node] & ~lost
+        if not allowed.any():
+            allowed = self.legal[node]
+        score = np.where(allowed, q + u, -np.inf)
+        action = int(np.argmax(score))
+        if not self.legal[node, action]:
+            return -1
+        return action
+
+    @property
+    def nbytes(self):
+        """Memory held by the node arrays in bytes."""
+        return sum(getattr(self, name).nbytes for name in _NODE_ARRAYS)
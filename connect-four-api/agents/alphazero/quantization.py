@@ -0,0 +1,167 @@
+import io
+import os
+import time
+
+import numpy as np
+import torch
+from torch import nn
+
+from agents.alphazero.alphazero_model import AlphaZeroModel
+from agents.alphazero.board_encoder import BoardEncoder
+from agents.alphazero.inference_model import FusedAlphaZeroModel
+from core.logger import logger
+
+
+def quantize_dynamic_model(model: AlphaZeroModel) -> nn.Module:
+    """
+    Int8 dynamic quantization: the linear layers (most of the weights) are
+    stored as int8, activations are quantized on the fly. Needs no
+    calibration data.
+    """
+    return torch.ao.quantization.quantize_dynamic(
+        FusedAlphaZeroModel(model), {nn.Linear}, dtype=torch.qint8
+    )
+
+
+def quantize_static_model(
+    model: AlphaZeroModel, calibration: torch.Tensor, backend: str | None = None
+) -> nn.Module:
+    """
+    Int8 static post-training quantization of the conv layers and fc1.
+    Activation ranges are observed on the calibration positions.
+
+    Args:
+        model: Trained AlphaZeroModel.
+        calibration: Encoded positions, shape (N, 3, 6, 7), e.g. from
+            collect_calibration_positions.
+        backend: Quantized engine ("x86", "fbgemm" or "qnnpack" for ARM);
+            defaults to the current torch engine.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    backend = backend or torch.backends.quantized.engine
+    torch.backends.quantized.engine = backend
+    # The small output heads stay in fp32; quantizing them costs most accuracy
+    qconfig_mapping = get_default_qconfig_mapping(backend).set_module_name(
+        "heads", None
+    )
+    prepared = prepare_fx(
+        FusedAlphaZeroModel(model), qconfig_mapping, (calibration[:1],)
+    )
+    with torch.no_grad():
+        for batch in torch.split(calibration, 64):
+            prepared(batch)
+    return convert_fx(prepared)
+
+
+def collect_calibration_positions(
+    model: AlphaZeroModel, n_games: int = 20, n_simulations: int = 25
+) -> torch.Tensor:
+    """
+    Play self-play games with the fp32 model and encode every position seen.
+
+    Returns:
+        Tensor of shape (N, 3, 6, 7).
+    """
+    from agents.alphazero.training.selfplay import generate_selfplay_data
+
+    data = generate_selfplay_data(model, n_games=n_games, n_simulations=n_simulations)
+    boards = np.stack([board for board, _, _ in data])
+    return BoardEncoder(len(boards)).encode(boards)
+
+
+def _size_bytes(model: nn.Module) -> int:
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return len(buffer.getbuffer())
+
+
+def _latency_ms(model: nn.Module, positions: torch.Tensor, repeats: int = 200) -> float:
+    """Mean time of a single-position call in milliseconds."""
+    x = positions[:1]
+    with torch.no_grad():
+        for _ in range(10):
+            model(x)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model(x)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def compare_models(
+    reference: nn.Module, quantized: nn.Module, positions: torch.Tensor
+) -> dict:
+    """
+    Compare a quantized model against the fp32 model on encoded positions.
+
+    Returns:
+        dict with the share of positions where both pick the same top move
+        (``policy_agreement``), mean and max absolute value error, and model
+        size and single-call latency of both models.
+    """
+    with torch.no_grad():
+        policy, value = reference(positions)
+        q_policy, q_value = quantized(positions)
+    same_move = policy.argmax(1) == q_policy.argmax(1)
+    value_error = (value - q_value).abs()
+    return {
+        "positions": len(positions),
+        "policy_agreement": same_move.float().mean().item(),
+        "value_mae": value_error.mean().item(),
+        "value_max_error": value_error.max().item(),
+        "size_bytes": _size_bytes(reference),
+        "quantized_size_bytes": _size_bytes(quantized),
+        "latency_ms": _latency_ms(reference, positions),
+        "quantized_latency_ms": _latency_ms(quantized, positions),
+    }
+
+
+def format_report(report: dict) -> str:
+    return "\n".join(
+        [
+            f"Positions compared : {report['positions']}",
+            f"Policy agreement   : {report['policy_agreement']:.1%}",
+            (
+                f"Value error        : {report['value_mae']:.4f} mean, "
+                f"{report['value_max_error']:.4f} max"
+            ),
+            (
+                f"Size               : {report['size_bytes'] / 1e6:.2f} MB -> "
+                f"{report['quantized_size_bytes'] / 1e6:.2f} MB"
+            ),
+            (
+                f"Latency (1 board)  : {report['latency_ms']:.3f} ms -> "
+                f"{report['quantized_latency_ms']:.3f} ms"
+            ),
+        ]
+    )
+
+
+def save_quantized_model(model: nn.Module, path: str):
+    """Save a quantized model as frozen TorchScript (load with torch.jit.load)."""
+    torch.jit.save(torch.jit.freeze(torch.jit.script(model.eval())), path)
+
+
+def load_quantized_model(path: str, state_dict_path: str) -> nn.Module:
+    """
+    Load a saved quantized model (CPU only). Without a usable file the fp32
+    state dict is loaded and quantized dynamically, which needs no
+    calibration data.
+
+    Args:
+        path: File written by save_quantized_model.
+        state_dict_path: AlphaZeroModel state dict used as fallback.
+    """
+    if os.path.exists(path):
+        try:
+            model = torch.jit.load(path, map_location="cpu")
+            model.eval()
+            return model
+        except Exception as e:
+            logger.warning(f"Could not load {path}, quantizing {state_dict_path}: {e}")
+
+    model = AlphaZeroModel()
+    model.load_state_dict(torch.load(state_dict_path, map_location="cpu"))
+    model.eval()
+    return quantize_dynamic_model(model)
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+
+# Phases of a simulation that are timed separately
+PHASES = ("selection", "stepping", "encoding", "inference", "backup")
+
+
+class SearchStats:
+    """
+    Counters and timings of one MCTS search (or pondering session).
+
+    Phase times are summed over all worker threads, so with several workers
+    they can add up to more than the elapsed wall-clock time. "stepping" is
+    the time spent playing moves on the board and creating nodes, and it is
+    part of the descent but not included in "selection".
+    """
+
+    def __init__(self, batch_size=1, n_threads=1):
+        self.batch_size = batch_size
+        self.n_threads = n_threads
+        self.simulations = 0
+        self.elapsed = 0.0
+        self.nn_calls = 0
+        self.batch_sizes = []
+        self.cache_hits = 0
+        self.reused_visits = 0
+        self.nodes = 0
+        self.memory_bytes = 0
+        self.solved = 0
+        self.max_depth = 0
+        self.depth_sum = 0
+        self.depth_count = 0
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self._lock = threading.Lock()
+
+    def add_time(self, phase, seconds):
+        with self._lock:
+            self.times[phase] += seconds
+
+    def record_depth(self, depth):
+        with self._lock:
+            self.depth_sum += depth
+            self.depth_count += 1
+            self.max_depth = max(self.max_depth, depth)
+
+    def record_batch(self, evaluated, cache_hits):
+        """
+        Record one batch of leaf evaluations.
+
+        Args:
+            evaluated (int): Positions the model ran on.
+            cache_hits (int): Positions answered by the evaluation cache.
+        """
+        with self._lock:
+            self.cache_hits += cache_hits
+            if evaluated:
+                self.nn_calls += 1
+                self.batch_sizes.append(evaluated)
+
+    @property
+    def simulations_per_sec(self):
+        return self.simulations / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mean_depth(self):
+        return self.depth_sum / self.depth_count if self.depth_count else 0.0
+
+    @property
+    def mean_batch_size(self):
+        if not self.batch_sizes:
+            return 0.0
+        return sum(self.batch_sizes) / len(self.batch_sizes)
+
+    def scalars(self):
+        """Numeric values by name, e.g. for TensorBoard."""
+        values = {
+            "simulations": self.simulations,
+            "simulations_per_sec": self.simulations_per_sec,
+            "elapsed": self.elapsed,
+            "nn_calls": self.nn_calls,
+            "mean_batch_size": self.mean_batch_size,
+            "cache_hits": self.cache_hits,
+            "reused_visits": self.reused_visits,
+            "nodes": self.nodes,
+            "memory_bytes": self.memory_bytes,
+            "solved": self.solved,
+            "max_depth": self.max_depth,
+            "mean_depth": self.mean_depth,
+        }
+        for phase, seconds in self.times.items():
+            values[f"time_{phase}"] = seconds
+        return values
+
+    def to_dict(self):
+        values = self.scalars()
+        values["batch_size"] = self.batch_size
+        values["n_threads"] = self.n_threads
+        values["batch_sizes"] = list(self.batch_sizes)
+        return values
+
+    def summary(self):
+        """One line for the log."""
+        split = ", ".join(f"{p} {s * 1000:.0f}ms" for p, s in self.times.items())
+        return (
+            f"{self.simulations} simulations in {self.elapsed:.2f}s "
+            f"({self.simulations_per_sec:.0f}/s), {self.nn_calls} NN calls, "
+            f"{self.cache_hits} cache hits, {self.reused_visits} visits reused, "
+            f"depth {self.mean_depth:.1f}/{self.max_depth} (mean/max); {split}"
+        )
+
+
+class TensorBoardStatsSink:
+    """
+    Search hook that writes every search's scalars to a SummaryWriter,
+    e.g. the one of the training loop.
+    """
+
+    def __init__(self, writer, prefix="MCTS"):
+        self.writer = writer
+        self.prefix = prefix
+        self.step = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, stats):
+        with self._lock:
+            step = self.step
+            self.step += 1
+        for name, value in stats.scalars().items():
+            self.writer.add_scalar(f"{self.prefix}/{name}", value, step)
+
+
+class JsonStatsSink:
+    """Search hook that appends every search's stats as one JSON line to a file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, stats):
+        record = {"time": time.time(), **stats.to_dict()}
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
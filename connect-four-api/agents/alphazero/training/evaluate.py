@@ -3,6 +3,8 @@ import numpy as np
 
 from agents.alphazero.connect_four_environment import ConnectFourEnvironment
 from agents.alphazero.alphazero_model import AlphaZeroModel
+from agents.alphazero.evaluation_cache import EvaluationCache
+from agents.alphazero.inference_model import freeze_for_inference
 from agents.alphazero.mcts import MCTS
 
 
@@ -20,18 +22,23 @@ def evaluate_model(num_games=50, model_path="alphazero_connect_four.pt", device=
     :param model_path: Path to the model file.
     :param device: Device to use for evaluation.
     """
-    model = load_alphazero_model(model_path, device)
+    model = freeze_for_inference(load_alphazero_model(model_path, device))
     wins = 0
     draws = 0
     losses = 0
+    # The openings repeat across games, so their evaluations are shared
+    cache = EvaluationCache()
 
     for _ in range(num_games):
         env = ConnectFourEnvironment()
+        # One search per game so the subtree is reused between moves
+        mcts = MCTS(
+            env, model, c_puct=1.0, n_simulations=25, device=device, cache=cache
+        )
         done = False
         current_player = 1
         while not done:
             if current_player == 1:
-                mcts = MCTS(env, model, c_puct=1.0, n_simulations=25, device=device)
                 state = env.get_state()
                 action_visits = mcts.search(state, current_player)
                 best_action = max(action_visits, key=action_visits.get)
@@ -55,3 +62,4 @@ def evaluate_model(num_games=50, model_path="alphazero_connect_four.pt", device=
     print(f" - Wins  (AI)  : {wins}")
     print(f" - Draws: {draws}")
     print(f" - Losses   : {losses}")
+    print(f"Evaluation cache hit rate: {cache.hit_rate:.1%}")
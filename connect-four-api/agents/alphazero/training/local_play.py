@@ -37,14 +37,15 @@ def draw_board(screen, env):
     Draws the current game board (env.board) on the Pygame surface.
     Top left = (0,0) in pixels.
     """
+    board = env.board
     for c in range(COLUMNS):
         for r in range(ROWS):
             x_pos = c * CELL_SIZE + CELL_SIZE // 2
             y_pos = r * CELL_SIZE + CELL_SIZE // 2 + CELL_SIZE
 
-            if env.board[r][c] == 0:
+            if board[r][c] == 0:
                 color = COLOR_EMPTY
-            elif env.board[r][c] == 1:
+            elif board[r][c] == 1:
                 color = COLOR_P1
             else:
                 color = COLOR_P2
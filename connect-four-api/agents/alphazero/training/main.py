@@ -3,7 +3,16 @@ import sys
 import torch
 
 from train import alphazero_training_loop
-from evaluate import evaluate_model
+from evaluate import evaluate_model, load_alphazero_model
+from agents.alphazero.inference_model import export_inference_model
+from agents.alphazero.quantization import (
+    collect_calibration_positions,
+    compare_models,
+    format_report,
+    quantize_dynamic_model,
+    quantize_static_model,
+    save_quantized_model,
+)
 
 
 def main():
@@ -13,6 +22,10 @@ def main():
             "  python main.py train [num_iterations] [selfplay_games] [n_simulations] [epochs] [device]"
         )
         print("  python main.py evaluate [num_games] [device]")
+        print("  python main.py export [model_path] [output_path]")
+        print(
+            "  python main.py quantize [model_path] [output_path] [dynamic|static] [calibration_games]"
+        )
         return
 
     mode = sys.argv[1]
@@ -48,6 +61,29 @@ def main():
         evaluate_model(
             num_games=num_games, model_path="alphazero_connect_four.pt", device=device
         )
+    elif mode == "export":
+        model_path = sys.argv[2] if len(sys.argv) > 2 else "alphazero_connect_four.pt"
+        output_path = sys.argv[3] if len(sys.argv) > 3 else "alphazero_connect_four.ts"
+
+        export_inference_model(load_alphazero_model(model_path), output_path)
+        print(f"Fused TorchScript model saved as {output_path}")
+    elif mode == "quantize":
+        model_path = sys.argv[2] if len(sys.argv) > 2 else "alphazero_connect_four.pt"
+        output_path = (
+            sys.argv[3] if len(sys.argv) > 3 else "alphazero_connect_four.int8.ts"
+        )
+        method = sys.argv[4] if len(sys.argv) > 4 else "dynamic"
+        calibration_games = int(sys.argv[5]) if len(sys.argv) > 5 else 20
+
+        model = load_alphazero_model(model_path)
+        positions = collect_calibration_positions(model, n_games=calibration_games)
+        if method == "static":
+            quantized = quantize_static_model(model, positions)
+        else:
+            quantized = quantize_dynamic_model(model)
+        print(format_report(compare_models(model, quantized, positions)))
+        save_quantized_model(quantized, output_path)
+        print(f"Int8 model saved as {output_path}")
     else:
         print(f"Unknown Mode: {mode}")
 
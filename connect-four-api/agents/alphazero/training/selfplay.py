@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 # import torch
 
 from agents.alphazero.connect_four_environment import ConnectFourEnvironment
+from agents.alphazero.evaluation_cache import EvaluationCache
+from agents.alphazero.inference_broker import InferenceBroker
 from agents.alphazero.mcts import MCTS
 
 
@@ -69,7 +73,16 @@ def play_one_game(env, mcts, model, temperature=1.0):
     return results
 
 
-def generate_selfplay_data(model, n_games=10, n_simulations=50, device="cpu"):
+def generate_selfplay_data(
+    model,
+    n_games=10,
+    n_simulations=50,
+    device="cpu",
+    batch_size=1,
+    cache=None,
+    on_search=None,
+    n_workers=1,
+):
     """
     Generates training data using self-play (MCTS).
     Returns a list of (state, policy, value).
@@ -79,12 +92,24 @@ def generate_selfplay_data(model, n_games=10, n_simulations=50, device="cpu"):
         n_games (int): Number of self-play games to generate.
         n_simulations (int): Number of MCTS simulations per move.
         device (str): "cpu" or "cuda".
+        batch_size (int): Leaves evaluated per forward pass in MCTS.
+        cache (EvaluationCache, optional): Evaluations shared by all games;
+            a new cache is used if omitted. The model must not change while
+            the cache is in use.
+        on_search (callable, optional): Receives the SearchStats of every
+            move's search, e.g. a TensorBoardStatsSink.
+        n_workers (int): Games played in parallel threads; their positions
+            are batched through one InferenceBroker.
 
     Returns:
         list: A list of (state, policy, value).
     """
-    data = []
-    for _ in range(n_games):
+    if cache is None:
+        cache = EvaluationCache()
+    # Parallel games share one broker, so their leaves are evaluated together
+    broker = InferenceBroker(model, device) if n_workers > 1 else None
+
+    def play_game(_):
         env = ConnectFourEnvironment()
         mcts = MCTS(
             env,
@@ -95,8 +120,25 @@ def generate_selfplay_data(model, n_games=10, n_simulations=50, device="cpu"):
             dirichlet_alpha=0.03,
             dirichlet_epsilon=0.25,
             add_root_noise=True,
+            batch_size=batch_size,
+            cache=cache,
+            on_search=on_search,
+            broker=broker,
         )
-        game_data = play_one_game(env, mcts, model)
+        return play_one_game(env, mcts, model)
+
+    try:
+        if broker is not None:
+            with ThreadPoolExecutor(n_workers) as executor:
+                games = list(executor.map(play_game, range(n_games)))
+        else:
+            games = [play_game(i) for i in range(n_games)]
+    finally:
+        if broker is not None:
+            broker.close()
+
+    data = []
+    for game_data in games:
         for g in game_data:
             board, policy, val = g[0], g[1], g[2]
             data.append((board, policy, val))
@@ -8,7 +8,10 @@ import numpy as np
 
 
 from agents.alphazero.alphazero_model import AlphaZeroModel
-from agents.alphazero.helpers import board_to_channels
+from agents.alphazero.evaluation_cache import EvaluationCache
+from agents.alphazero.board_encoder import BoardEncoder
+from agents.alphazero.inference_model import freeze_for_inference
+from agents.alphazero.search_stats import TensorBoardStatsSink
 
 from torch.utils.tensorboard import SummaryWriter
 
@@ -51,6 +54,13 @@ def train_on_data(
     # Shuffle data
     np.random.shuffle(data)
 
+    # Encode all samples in one vectorized pass and move them to the device
+    # once; the batches below are slices (views) of these tensors
+    boards, policies, values = zip(*data, strict=True)
+    all_states = BoardEncoder(len(data)).encode(np.stack(boards)).to(device)
+    all_policies = torch.from_numpy(np.array(policies, dtype=np.float32)).to(device)
+    all_values = torch.from_numpy(np.array(values, dtype=np.float32)).to(device)
+
     global_step = global_step_start
 
     for epoch in range(epochs):
@@ -62,28 +72,9 @@ def train_on_data(
 
         # Process full batches
         for i in range(num_full_batches):
-            batch = data[i * batch_size : (i + 1) * batch_size]
-
-            # Lists for States, Policies, Values
-            states_list = []
-            policies_list = []
-            values_list = []
-
-            for state, policy, value in batch:
-                c3 = board_to_channels(state)
-                states_list.append(c3)
-                policies_list.append(policy)
-                values_list.append(value)
-
-            # Convert to NumPy arrays
-            states_np = np.array(states_list, dtype=np.float32)
-            policies_np = np.array(policies_list, dtype=np.float32)
-            values_np = np.array(values_list, dtype=np.float32)
-
-            # Convert to Torch tensors
-            states_t = torch.from_numpy(states_np).to(device)
-            policies_t = torch.from_numpy(policies_np).to(device)
-            values_t = torch.from_numpy(values_np).to(device)
+            states_t = all_states[i * batch_size : (i + 1) * batch_size]
+            policies_t = all_policies[i * batch_size : (i + 1) * batch_size]
+            values_t = all_values[i * batch_size : (i + 1) * batch_size]
 
             # Forward pass
             policy_pred, value_pred = model(states_t)
@@ -122,7 +113,12 @@ def train_on_data(
 
 
 def alphazero_training_loop(
-    num_iterations=10, selfplay_games=10, n_simulations=50, epochs=5, device="cpu"
+    num_iterations=10,
+    selfplay_games=10,
+    n_simulations=50,
+    epochs=5,
+    device="cpu",
+    selfplay_workers=1,
 ):
     """
     Minimal training loop for AlphaZero-like cycle.
@@ -133,6 +129,7 @@ def alphazero_training_loop(
         n_simulations: Number of simulations.
         epochs: Number of epochs.
         device: "cpu" or "cuda".
+        selfplay_workers: Self-play games played in parallel.
     """
     from selfplay import generate_selfplay_data  # Adjust to your code if necessary
 
@@ -140,6 +137,8 @@ def alphazero_training_loop(
     writer = SummaryWriter(log_dir=f"./runs/alphazero_connect4_{timestamp}")
 
     model = AlphaZeroModel().to(device)
+    # Per-search MCTS statistics of the self-play games
+    search_stats_sink = TensorBoardStatsSink(writer, prefix="SelfPlay/MCTS")
 
     # Step counter for TensorBoard
     global_step = 0
@@ -149,10 +148,21 @@ def alphazero_training_loop(
         print(f"=== ITERATION {i + 1}/{num_iterations} ===")
 
         # 1) Generate self-play data
+        # The model changes every iteration, so its cached evaluations do too
+        cache = EvaluationCache()
+        # Self-play only runs inference, so it uses a fused, frozen copy
         data = generate_selfplay_data(
-            model, n_games=selfplay_games, n_simulations=n_simulations, device=device
+            freeze_for_inference(model),
+            n_games=selfplay_games,
+            n_simulations=n_simulations,
+            device=device,
+            cache=cache,
+            on_search=search_stats_sink,
+            n_workers=selfplay_workers,
         )
         print(f"  -> Generated {len(data)} training examples via self-play")
+        print(f"  -> Evaluation cache hit rate: {cache.hit_rate:.1%}")
+        writer.add_scalar("Cache/HitRate", cache.hit_rate, i + 1)
 
         # 2) Training
         model.train()
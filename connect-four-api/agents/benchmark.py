@@ -0,0 +1,273 @@
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from agents.move_calculator import MoveCalculator
+from core.bitboard import BitBoard
+from core.logger import logger
+from util import get_algorithm_params
+
+# Fixed benchmark corpus: move sequences (column indices) from the empty
+# board. Every position has the computer (player 2) to move and no
+# immediate win for it. Do not change them, or results are no longer
+# comparable with the history.
+BENCHMARK_POSITIONS = {
+    "opening": ["1", "401", "22656", "6006011", "621134546"],
+    "midgame": [
+        "1053612642252",
+        "333361610214116",
+        "02243040001604112",
+        "1206300523444155322",
+        "100533145610663603411",
+    ],
+    "endgame": [
+        "613636604550641212611345441",
+        "66660312415110250251266000521",
+        "1440020215216652344122515004451",
+        "434063453610253665300451545421200",
+        "40101644050443614553313356521615620",
+    ],
+}
+
+# (mode, difficulty) pairs; AI_Mode has no difficulty levels
+DEFAULT_ENGINES = [
+    ("MiniMax", 1),
+    ("MiniMax", 2),
+    ("MiniMax", 3),
+    ("MCTS", 1),
+    ("MCTS", 2),
+    ("MCTS", 3),
+    ("AI_Mode", 2),
+]
+
+DEFAULT_HISTORY_PATH = "benchmarks/history.jsonl"
+
+
+def position_board(moves: str) -> list[list[int]]:
+    """Board state (row 0 = top row) after playing ``moves`` from the empty board."""
+    board = BitBoard()
+    player = 1
+    for col in moves:
+        board.drop(int(col), player)
+        player = 3 - player
+    return board.to_array().tolist()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes on Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    """Percentiles and mean of latencies given in seconds, in milliseconds."""
+    ms = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "mean_ms": float(ms.mean()),
+        "max_ms": float(ms.max()),
+    }
+
+
+def benchmark_engine(
+    mode: str,
+    difficulty: int,
+    repeats: int = 3,
+    concurrency: int = 1,
+    positions: dict[str, list[str]] | None = None,
+    calculator: MoveCalculator | None = None,
+) -> dict:
+    """
+    Time one engine at one difficulty on every corpus position.
+
+    The engine is loaded and called once before timing. Caches are cleared
+    before every call, so each move is computed from scratch.
+
+    Args:
+        mode: "MiniMax", "MCTS" or "AI_Mode".
+        difficulty: 1-3, mapped to engine parameters by get_algorithm_params.
+        repeats: Calls per position.
+        concurrency: Calls running at the same time (threads); with more
+            than one, positions_per_sec is the throughput of all of them.
+        positions: Corpus to use instead of BENCHMARK_POSITIONS.
+        calculator: Calculator to use (a new one by default).
+
+    Returns:
+        dict: Parameters, latency percentiles overall and per phase,
+            positions_per_sec and peak_rss_mb.
+    """
+    positions = BENCHMARK_POSITIONS if positions is None else positions
+    calculator = calculator or MoveCalculator()
+    params = get_algorithm_params(mode, difficulty)
+    minimax_depth = params.get("minimax_depth", 0)
+    mcts_sim = params.get("mcts_sim", 0)
+    expl_rate = params.get("expl_rate", 1.4)
+
+    def best_move(board_state):
+        calculator.move_cache.clear()
+        if mode == "AI_Mode":
+            calculator.alphazero.evaluation_cache.clear()
+        start = time.perf_counter()
+        calculator.get_best_move(board_state, mode, minimax_depth, mcts_sim, expl_rate)
+        return time.perf_counter() - start
+
+    load_start = time.perf_counter()
+    calculator.engines.get(mode)
+    best_move(position_board(positions["opening"][0]))
+    warm_up = time.perf_counter() - load_start
+
+    jobs = [
+        (phase, position_board(moves))
+        for phase, sequences in positions.items()
+        for moves in sequences
+        for _ in range(repeats)
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        latencies = list(executor.map(lambda job: best_move(job[1]), jobs))
+    elapsed = time.perf_counter() - start
+
+    phases = {}
+    for phase in positions:
+        phase_latencies = [
+            t for (p, _), t in zip(jobs, latencies, strict=True) if p == phase
+        ]
+        phases[phase] = latency_summary(phase_latencies)["p50_ms"]
+
+    return {
+        "engine": mode,
+        "difficulty": difficulty,
+        "params": params,
+        "calls": len(jobs),
+        "concurrency": concurrency,
+        **latency_summary(latencies),
+        "phase_p50_ms": phases,
+        "positions_per_sec": len(jobs) / elapsed,
+        "warm_up_s": warm_up,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmarks(
+    engines=DEFAULT_ENGINES, repeats: int = 3, concurrency: int = 1, isolate=True
+) -> dict:
+    """
+    Benchmark several engines and difficulties.
+
+    Args:
+        engines: (mode, difficulty) pairs.
+        repeats: Calls per position.
+        concurrency: Calls running at the same time per engine.
+        isolate: Run every engine in a fresh process, so peak RSS and load
+            time belong to that engine alone (e.g. MiniMax without torch).
+
+    Returns:
+        dict: One history record: run metadata and a result per engine. An
+            engine that cannot be loaded gets an "error" instead of timings.
+    """
+    results = []
+    for mode, difficulty in engines:
+        logger.info(f"Benchmarking {mode} at difficulty {difficulty}")
+        try:
+            if isolate:
+                context = get_context("spawn")
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    result = executor.submit(
+                        benchmark_engine, mode, difficulty, repeats, concurrency
+                    ).result()
+            else:
+                result = benchmark_engine(mode, difficulty, repeats, concurrency)
+        except Exception as e:
+            logger.error(f"Benchmark of {mode} failed: {e}")
+            result = {"engine": mode, "difficulty": difficulty, "error": str(e)}
+        results.append(result)
+    return {
+        "time": time.time(),
+        "version": _version(),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def _version() -> str:
+    """Current git commit, or "unknown" outside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_history(path: str = DEFAULT_HISTORY_PATH) -> list[dict]:
+    """All records of earlier runs, oldest first."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(record: dict, path: str = DEFAULT_HISTORY_PATH):
+    """Append one run as a JSON line."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def format_report(record: dict, previous: dict | None = None) -> str:
+    """
+    Table of one run. With a previous run, the change of p50 per engine and
+    difficulty is shown as well.
+    """
+    before = {}
+    if previous is not None:
+        before = {
+            (r["engine"], r["difficulty"]): r
+            for r in previous["results"]
+            if "error" not in r
+        }
+
+    lines = [
+        f"Version {record['version']}, {record['host']['cpu_count']} CPUs",
+        (
+            f"{'engine':<8} {'diff':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'pos/s':>8} {'RSS MB':>7}  change"
+        ),
+    ]
+    for r in record["results"]:
+        if "error" in r:
+            lines.append(f"{r['engine']:<8} {r['difficulty']:>4} error: {r['error']}")
+            continue
+        old = before.get((r["engine"], r["difficulty"]))
+        change = (
+            f"{(r['p50_ms'] / old['p50_ms'] - 1):+.0%} vs {previous['version']}"
+            if old and old["p50_ms"] > 0
+            else ""
+        )
+        lines.append(
+            f"{r['engine']:<8} {r['difficulty']:>4} {r['p50_ms']:>9.1f} "
+            f"{r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['positions_per_sec']:>8.1f} "
+            f"{r['peak_rss_mb']:>7.0f}  {change}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from core.constants import ENGINE_WORKERS
+
+
+class EnginePool:
+    """
+    Persistent worker threads that run blocking engine calls, so a long
+    search does not stall the event loop (and with it every other session).
+
+    The threads are started once and reused. At most ``max_workers`` calls
+    run at the same time; further calls wait in the queue. The PyO3 engines
+    release the GIL and torch does the same, so the searches run in
+    parallel with the event loop.
+    """
+
+    def __init__(self, max_workers: int = ENGINE_WORKERS, name: str = "engine"):
+        """
+        Args:
+            max_workers: Engine calls running concurrently.
+            name: Prefix of the thread names.
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        # Calls submitted and not finished yet (running or queued)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def saturated(self) -> bool:
+        """True, if every worker is busy and a new call would have to wait."""
+        return self._pending >= self.max_workers
+
+    @property
+    def queued(self) -> int:
+        """Calls waiting for a free worker."""
+        return max(0, self._pending - self.max_workers)
+
+    async def run(
+        self, func: Callable, *args, stop: threading.Event | None = None
+    ) -> Any:
+        """
+        Run ``func(*args)`` in a worker thread and await its result.
+
+        If the awaiting task is cancelled (e.g. the client disconnected), a
+        queued call is dropped and a running one is asked to end by setting
+        ``stop``. Calls that cannot be interrupted finish in the background
+        and their result is discarded.
+
+        Args:
+            func: Blocking callable.
+            stop: Event the callable checks to end early, if it supports it.
+        """
+        future = self._executor.submit(func, *args)
+        with self._lock:
+            self._pending += 1
+        # Runs right away if the call has already finished
+        future.add_done_callback(self._finished)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if stop is not None:
+                stop.set()
+            raise
+
+    def _finished(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self):
+        """Drop queued calls; running calls are finished first."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
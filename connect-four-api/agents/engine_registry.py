@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from core.logger import logger
+
+# Engine states as reported to clients
+IDLE = "idle"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class EngineRegistry:
+    """
+    Imports and initializes engines on first use instead of at startup.
+
+    Every engine has a loader (e.g. importing a PyO3 module or loading the
+    AlphaZero model) that runs at most once. Engines can be loaded on demand
+    with ``get`` or ahead of time with ``warm_up``; ``status`` tells which ones
+    are ready. A failed load is retried on the next request.
+    """
+
+    def __init__(self, loaders: dict[str, Callable[[], Any]]):
+        """
+        Args:
+            loaders: Engine name (as in SELECTABLE_ALGORITHMS) -> callable
+                returning the loaded engine.
+        """
+        self._loaders = dict(loaders)
+        self._engines: dict[str, Any] = {}
+        self._states = dict.fromkeys(self._loaders, IDLE)
+        self._locks = {name: threading.Lock() for name in self._loaders}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._loaders
+
+    def get(self, name: str) -> Any:
+        """
+        Return the engine, loading it first if needed. Blocks while another
+        thread loads the same engine.
+
+        Raises:
+            KeyError: If no engine with this name is registered.
+        """
+        if name in self._engines:
+            return self._engines[name]
+        with self._locks[name]:
+            if name in self._engines:
+                return self._engines[name]
+            self._states[name] = LOADING
+            start = time.perf_counter()
+            try:
+                engine = self._loaders[name]()
+            except Exception:
+                self._states[name] = FAILED
+                raise
+            self._engines[name] = engine
+            self._states[name] = READY
+            logger.info(f"Engine {name} loaded in {time.perf_counter() - start:.2f}s")
+            return engine
+
+    async def load(self, name: str) -> Any:
+        """Like ``get``, but loads in a worker thread so the event loop keeps running."""
+        if name in self._engines:
+            return self._engines[name]
+        return await asyncio.to_thread(self.get, name)
+
+    def is_ready(self, name: str) -> bool:
+        return name in self._engines
+
+    def status(self) -> dict[str, str]:
+        """State of every engine: "idle", "loading", "ready" or "failed"."""
+        return dict(self._states)
+
+    async def warm_up(self, names: Iterable[str] | None = None):
+        """
+        Background task: load the given engines (all by default) one after
+        the other. Failures are logged; the engine is retried on first use.
+        """
+        for name in self._loaders if names is None else names:
+            if name not in self._loaders:
+                logger.warning(f"Cannot warm up unknown engine {name}")
+                continue
+            try:
+                await self.load(name)
+            except Exception as e:
+                logger.error(f"Warm-up of engine {name} failed: {e}")
@@ -1,22 +1,150 @@
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use pyo3::wrap_pyfunction;
 
 const ROWS: usize = 6;
 const COLS: usize = 7;
 
+/// Bits per column in a packed bitboard: ROWS cells from bottom to top and
+/// one sentinel bit, the same layout as the Python BitBoard masks.
+const COLUMN_HEIGHT: usize = ROWS + 1;
+
+/// Build the board (row 0 = top row) from the two player masks.
+///
+/// The search still works on `Vec<Vec<i32>>` boards and clones one per
+/// node, so this one board per call remains; the bitboard entry points only
+/// save the conversion to and from Python lists.
+fn board_from_masks(p1: u64, p2: u64) -> Vec<Vec<i32>> {
+    let mut board = vec![vec![0; COLS]; ROWS];
+    for col in 0..COLS {
+        for height in 0..ROWS {
+            let bit = 1u64 << (col * COLUMN_HEIGHT + height);
+            let row = ROWS - 1 - height;
+            if p1 & bit != 0 {
+                board[row][col] = 1;
+            } else if p2 & bit != 0 {
+                board[row][col] = 2;
+            }
+        }
+    }
+    board
+}
+
+/// Read a C-contiguous buffer of 6 * 7 int64 cells (e.g. a NumPy board)
+/// without converting it to Python lists first.
+fn board_from_buffer(py: Python<'_>, buffer: &PyBuffer<i64>) -> PyResult<Vec<Vec<i32>>> {
+    if buffer.item_count() != ROWS * COLS {
+        return Err(PyValueError::new_err("board must have 6 * 7 cells"));
+    }
+    let cells = buffer
+        .as_slice(py)
+        .ok_or_else(|| PyValueError::new_err("board must be a C-contiguous buffer"))?;
+    Ok((0..ROWS)
+        .map(|row| {
+            (0..COLS)
+                .map(|col| cells[row * COLS + col].get() as i32)
+                .collect()
+        })
+        .collect())
+}
+
+/// Run `best_col` for every pair of masks, spread over the available cores.
+fn map_masks<F>(p1: &[u64], p2: &[u64], best_col: F) -> Vec<usize>
+where
+    F: Fn(u64, u64) -> usize + Sync,
+{
+    if p1.is_empty() {
+        return Vec::new();
+    }
+    let threads = std::thread::available_parallelism().map_or(1, |n| n.get());
+    let chunk_size = (p1.len() + threads - 1) / threads;
+    let best_col = &best_col;
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = p1
+            .chunks(chunk_size)
+            .zip(p2.chunks(chunk_size))
+            .map(|(p1, p2)| {
+                scope.spawn(move || {
+                    p1.iter()
+                        .zip(p2)
+                        .map(|(&a, &b)| best_col(a, b))
+                        .collect::<Vec<_>>()
+                })
+            })
+            .collect();
+        handles
+            .into_iter()
+            .flat_map(|handle| handle.join().expect("search thread panicked"))
+            .collect()
+    })
+}
+
+/// Copy a batch of masks (e.g. a uint64 NumPy array) out of its buffer.
+fn masks_from_buffers(
+    py: Python<'_>,
+    p1: &PyBuffer<u64>,
+    p2: &PyBuffer<u64>,
+) -> PyResult<(Vec<u64>, Vec<u64>)> {
+    if p1.item_count() != p2.item_count() {
+        return Err(PyValueError::new_err("p1 and p2 must have the same length"));
+    }
+    Ok((p1.to_vec(py)?, p2.to_vec(py)?))
+}
+
+fn column_letter(col: usize) -> String {
+    ((b'A' + col as u8) as char).to_string()
+}
+
 #[pyfunction]
-fn get_best_move(board: Vec<Vec<i32>>, depth: usize) -> PyResult<String> {
+fn get_best_move(py: Python<'_>, board: Vec<Vec<i32>>, depth: usize) -> PyResult<String> {
     // Validate the board dimensions.
     assert_eq!(board.len(), ROWS);
     for row in &board {
         assert_eq!(row.len(), COLS);
     }
 
-    let best_col = minimax_decision(&board, depth);
+    // Release the GIL while searching, so other Python threads keep running.
+    let best_col = py.allow_threads(|| minimax_decision(&board, depth));
     let best_col_char = (b'A' + best_col as u8) as char;
     Ok(best_col_char.to_string())
 }
 
+/// Like get_best_move, but reads the board from a NumPy int64 array (or any
+/// C-contiguous buffer) instead of nested lists.
+#[pyfunction]
+fn get_best_move_buffer(py: Python<'_>, board: PyBuffer<i64>, depth: usize) -> PyResult<String> {
+    let board = board_from_buffer(py, &board)?;
+    let best_col = py.allow_threads(|| minimax_decision(&board, depth));
+    Ok(column_letter(best_col))
+}
+
+/// Like get_best_move, for a position given as the two player masks of a
+/// BitBoard.
+#[pyfunction]
+fn get_best_move_bitboard(py: Python<'_>, p1: u64, p2: u64, depth: usize) -> PyResult<String> {
+    let best_col = py.allow_threads(|| minimax_decision(&board_from_masks(p1, p2), depth));
+    Ok(column_letter(best_col))
+}
+
+/// Best moves for many positions, given as uint64 mask arrays (see
+/// core.board_batch.stack_bitboards). The positions are searched in parallel.
+#[pyfunction]
+fn get_best_moves_bitboards(
+    py: Python<'_>,
+    p1: PyBuffer<u64>,
+    p2: PyBuffer<u64>,
+    depth: usize,
+) -> PyResult<Vec<String>> {
+    let (p1, p2) = masks_from_buffers(py, &p1, &p2)?;
+    let best_cols = py.allow_threads(|| {
+        map_masks(&p1, &p2, |a, b| {
+            minimax_decision(&board_from_masks(a, b), depth)
+        })
+    });
+    Ok(best_cols.into_iter().map(column_letter).collect())
+}
+
 fn minimax_decision(board: &Vec<Vec<i32>>, depth: usize) -> usize {
     let possible_moves = get_valid_moves(board);
     let mut best_score = i32::MIN;
@@ -261,5 +389,8 @@ fn evaluate_window(window: &[i32], player: i32) -> i32 {
 #[pymodule]
 fn minimax_algorithm(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(get_best_move, m)?)?;
+    m.add_function(wrap_pyfunction!(get_best_move_buffer, m)?)?;
+    m.add_function(wrap_pyfunction!(get_best_move_bitboard, m)?)?;
+    m.add_function(wrap_pyfunction!(get_best_moves_bitboards, m)?)?;
     Ok(())
 }
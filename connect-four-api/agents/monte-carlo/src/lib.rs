@@ -1,3 +1,5 @@
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use pyo3::wrap_pyfunction;
 use rand::seq::SliceRandom;
@@ -6,6 +8,96 @@ use rand::thread_rng;
 const ROWS: usize = 6;
 const COLS: usize = 7;
 
+/// Bits per column in a packed bitboard: ROWS cells from bottom to top and
+/// one sentinel bit, the same layout as the Python BitBoard masks.
+const COLUMN_HEIGHT: usize = ROWS + 1;
+
+/// Build the board (row 0 = top row) from the two player masks.
+///
+/// The search still works on `Vec<Vec<i32>>` boards and clones one per
+/// node, so this one board per call remains; the bitboard entry points only
+/// save the conversion to and from Python lists.
+fn board_from_masks(p1: u64, p2: u64) -> Vec<Vec<i32>> {
+    let mut board = vec![vec![0; COLS]; ROWS];
+    for col in 0..COLS {
+        for height in 0..ROWS {
+            let bit = 1u64 << (col * COLUMN_HEIGHT + height);
+            let row = ROWS - 1 - height;
+            if p1 & bit != 0 {
+                board[row][col] = 1;
+            } else if p2 & bit != 0 {
+                board[row][col] = 2;
+            }
+        }
+    }
+    board
+}
+
+/// Read a C-contiguous buffer of 6 * 7 int64 cells (e.g. a NumPy board)
+/// without converting it to Python lists first.
+fn board_from_buffer(py: Python<'_>, buffer: &PyBuffer<i64>) -> PyResult<Vec<Vec<i32>>> {
+    if buffer.item_count() != ROWS * COLS {
+        return Err(PyValueError::new_err("board must have 6 * 7 cells"));
+    }
+    let cells = buffer
+        .as_slice(py)
+        .ok_or_else(|| PyValueError::new_err("board must be a C-contiguous buffer"))?;
+    Ok((0..ROWS)
+        .map(|row| {
+            (0..COLS)
+                .map(|col| cells[row * COLS + col].get() as i32)
+                .collect()
+        })
+        .collect())
+}
+
+/// Run `best_col` for every pair of masks, spread over the available cores.
+fn map_masks<F>(p1: &[u64], p2: &[u64], best_col: F) -> Vec<usize>
+where
+    F: Fn(u64, u64) -> usize + Sync,
+{
+    if p1.is_empty() {
+        return Vec::new();
+    }
+    let threads = std::thread::available_parallelism().map_or(1, |n| n.get());
+    let chunk_size = (p1.len() + threads - 1) / threads;
+    let best_col = &best_col;
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = p1
+            .chunks(chunk_size)
+            .zip(p2.chunks(chunk_size))
+            .map(|(p1, p2)| {
+                scope.spawn(move || {
+                    p1.iter()
+                        .zip(p2)
+                        .map(|(&a, &b)| best_col(a, b))
+                        .collect::<Vec<_>>()
+                })
+            })
+            .collect();
+        handles
+            .into_iter()
+            .flat_map(|handle| handle.join().expect("search thread panicked"))
+            .collect()
+    })
+}
+
+/// Copy a batch of masks (e.g. a uint64 NumPy array) out of its buffer.
+fn masks_from_buffers(
+    py: Python<'_>,
+    p1: &PyBuffer<u64>,
+    p2: &PyBuffer<u64>,
+) -> PyResult<(Vec<u64>, Vec<u64>)> {
+    if p1.item_count() != p2.item_count() {
+        return Err(PyValueError::new_err("p1 and p2 must have the same length"));
+    }
+    Ok((p1.to_vec(py)?, p2.to_vec(py)?))
+}
+
+fn column_letter(col: usize) -> String {
+    ((b'A' + col as u8) as char).to_string()
+}
+
 #[derive(Clone)]
 struct BoardState {
     board: Vec<Vec<i32>>,
@@ -277,6 +369,7 @@ fn backpropagate(node: &mut MCTSNode, result: f64) {
 
 #[pyfunction]
 fn get_best_move_mcts(
+    py: Python<'_>,
     board: Vec<Vec<i32>>,
     simulation_count: usize,
     exploration_constant: f64,
@@ -286,13 +379,82 @@ fn get_best_move_mcts(
         current_player: 1,
     };
 
-    let best_col = mcts(&root_state, simulation_count, exploration_constant);
+    // Release the GIL while searching, so other Python threads keep running.
+    let best_col = py.allow_threads(|| mcts(&root_state, simulation_count, exploration_constant));
     let best_col_char = (b'A' + best_col as u8) as char;
     Ok(best_col_char.to_string())
 }
 
+fn search_board(board: Vec<Vec<i32>>, simulation_count: usize, exploration_constant: f64) -> usize {
+    let root_state = BoardState {
+        board,
+        current_player: 1,
+    };
+    mcts(&root_state, simulation_count, exploration_constant)
+}
+
+/// Like get_best_move_mcts, but reads the board from a NumPy int64 array (or
+/// any C-contiguous buffer) instead of nested lists.
+#[pyfunction]
+fn get_best_move_mcts_buffer(
+    py: Python<'_>,
+    board: PyBuffer<i64>,
+    simulation_count: usize,
+    exploration_constant: f64,
+) -> PyResult<String> {
+    let board = board_from_buffer(py, &board)?;
+    let best_col = py.allow_threads(|| search_board(board, simulation_count, exploration_constant));
+    Ok(column_letter(best_col))
+}
+
+/// Like get_best_move_mcts, for a position given as the two player masks of
+/// a BitBoard.
+#[pyfunction]
+fn get_best_move_mcts_bitboard(
+    py: Python<'_>,
+    p1: u64,
+    p2: u64,
+    simulation_count: usize,
+    exploration_constant: f64,
+) -> PyResult<String> {
+    let best_col = py.allow_threads(|| {
+        search_board(
+            board_from_masks(p1, p2),
+            simulation_count,
+            exploration_constant,
+        )
+    });
+    Ok(column_letter(best_col))
+}
+
+/// Best moves for many positions, given as uint64 mask arrays (see
+/// core.board_batch.stack_bitboards). The positions are searched in parallel.
+#[pyfunction]
+fn get_best_moves_mcts_bitboards(
+    py: Python<'_>,
+    p1: PyBuffer<u64>,
+    p2: PyBuffer<u64>,
+    simulation_count: usize,
+    exploration_constant: f64,
+) -> PyResult<Vec<String>> {
+    let (p1, p2) = masks_from_buffers(py, &p1, &p2)?;
+    let best_cols = py.allow_threads(|| {
+        map_masks(&p1, &p2, |a, b| {
+            search_board(
+                board_from_masks(a, b),
+                simulation_count,
+                exploration_constant,
+            )
+        })
+    });
+    Ok(best_cols.into_iter().map(column_letter).collect())
+}
+
 #[pymodule]
 fn monte_carlo_tree_search(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(get_best_move_mcts, m)?)?;
+    m.add_function(wrap_pyfunction!(get_best_move_mcts_buffer, m)?)?;
+    m.add_function(wrap_pyfunction!(get_best_move_mcts_bitboard, m)?)?;
+    m.add_function(wrap_pyfunction!(get_best_moves_mcts_bitboards, m)?)?;
     Ok(())
 }
@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+
+from core.bitboard import BitBoard
+from core.constants import COLUMNS, MOVE_CACHE_SIZE
+
+
+def _mirror_column(column: str) -> str:
+    return chr(ord("A") + COLUMNS - 1 - (ord(column) - ord("A")))
+
+
+class MoveCache:
+    """
+    Bounded LRU cache of computed moves, shared by all sessions.
+
+    Entries are keyed by the canonical position hash and the engine
+    parameters the move depends on (e.g. ("MiniMax", depth)). A position and
+    its mirror image share one entry: the column is stored for the canonical
+    orientation and mirrored on the way in and out.
+
+    Every entry remembers how long its move took to compute, so the time
+    saved by hits can be reported. All methods are thread-safe.
+    """
+
+    def __init__(self, capacity: int = MOVE_CACHE_SIZE):
+        """
+        Args:
+            capacity: Maximum number of moves kept.
+        """
+        self.capacity = capacity
+        self._entries: OrderedDict[tuple, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, board: BitBoard, params: tuple) -> str | None:
+        """
+        Look up the move for a position.
+
+        Args:
+            board: The position.
+            params: Mode and engine parameters, e.g. ("MCTS", 2000, 1.2).
+
+        Returns:
+            Column letter (A-G), or None if the move is not cached.
+        """
+        key = (board.canonical_hash, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[1]
+        column = entry[0]
+        return _mirror_column(column) if board.is_mirrored else column
+
+    def put(self, board: BitBoard, params: tuple, column: str, seconds: float):
+        """
+        Store a computed move, evicting the least recently used entry if the
+        cache is full.
+
+        Args:
+            board: The position.
+            params: Mode and engine parameters, as passed to ``get``.
+            column: Column letter (A-G) the engine chose.
+            seconds: Time the engine took.
+        """
+        if board.is_mirrored:
+            column = _mirror_column(column)
+        key = (board.canonical_hash, params)
+        with self._lock:
+            self._entries[key] = (column, seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.saved_seconds = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """Counters for logging."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "saved_seconds": self.saved_seconds,
+        }
+
+    def summary(self) -> str:
+        """One line for the log."""
+        return (
+            f"hit rate {self.hit_rate:.0%} ({self.hits}/{self.hits + self.misses}), "
+            f"{self.saved_seconds:.2f}s saved, {len(self._entries)} moves cached"
+        )
@@ -1,80 +1,290 @@
-from typing import Optional, List
-import torch
+import importlib
+import threading
+import time
+from typing import TYPE_CHECKING
 
-from core.constants import ALPHAZERO_N_SIMULATIONS
-from agents.alphazero.connect_four_environment import ConnectFourEnvironment
-from agents.alphazero.mcts import MCTS
-from agents.alphazero.alphazero_model import AlphaZeroModel
+from agents.engine_pool import EnginePool
+from agents.engine_registry import EngineRegistry
+from agents.move_cache import MoveCache
+from core.bitboard import BitBoard
+from core.constants import (
+    ALPHAZERO_PONDER_SESSIONS,
+    ALPHAZERO_PONDER_SIMULATIONS,
+    ALPHAZERO_QUANTIZED,
+    MOVE_CACHE_STOCHASTIC,
+)
+from core.logger import logger
 from util import board_state_to_env_board
 
-from core.constants import MODEL_PATH
+if TYPE_CHECKING:
+    from agents.alphazero.engine import AlphaZeroEngine
+    from agents.alphazero.mcts import MCTS
 
-# PyO3 imports
-import minimax_algorithm
-import monte_carlo_tree_search
+
+def _load_alphazero_engine(quantized: bool) -> "AlphaZeroEngine":
+    # Imports torch, so it only happens when AI_Mode is used or warmed up
+    from agents.alphazero.engine import AlphaZeroEngine
+
+    return AlphaZeroEngine(quantized)
 
 
 class MoveCalculator:
-    def __init__(self):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.alphazero_model = self._load_alphazero_model()
-        self.env = ConnectFourEnvironment()
+    def __init__(
+        self,
+        quantized: bool = ALPHAZERO_QUANTIZED,
+        cache_stochastic: bool = MOVE_CACHE_STOCHASTIC,
+    ):
+        """
+        Creating the calculator is cheap: the PyO3 engines and the AlphaZero
+        model are loaded on first use (or by ``engines.warm_up``).
 
-    def _load_alphazero_model(self) -> AlphaZeroModel:
-        model = AlphaZeroModel().to(self.device)
-        model.load_state_dict(torch.load(MODEL_PATH, map_location=self.device))
-        model.eval()
-        return model
+        Args:
+            quantized: Use the int8 AlphaZero model (only on CPU).
+            cache_stochastic: Also cache the moves of the randomized engines
+                (MCTS and AI_Mode); MiniMax moves are always cached.
+        """
+        self.quantized = quantized
+        self.cache_stochastic = cache_stochastic
+        self.engines = EngineRegistry(
+            {
+                "MiniMax": lambda: importlib.import_module("minimax_algorithm"),
+                "MCTS": lambda: importlib.import_module("monte_carlo_tree_search"),
+                "AI_Mode": lambda: _load_alphazero_engine(self.quantized),
+            }
+        )
+        # Worker threads that compute the moves of all sessions
+        self.engine_pool = EnginePool()
+        # Pondering runs apart from the moves and only for a few games
+        self.ponder_pool = EnginePool(ALPHAZERO_PONDER_SESSIONS, name="ponder")
+        # Stop events of the running ponder searches
+        self._ponder_stops = set()
+        # Moves of all sessions, e.g. of the openings every visitor plays
+        self.move_cache = MoveCache()
+
+    @property
+    def alphazero(self) -> "AlphaZeroEngine":
+        """The AlphaZero engine, loaded on first access."""
+        return self.engines.get("AI_Mode")
 
     def get_best_move(
         self,
-        board_state: List[List[int]],
+        board_state: list[list[int]],
         mode: str,
         minimax_depth: int,
         mcts_sim: int,
         expl_rate: float = 1.4,
-    ) -> Optional[str]:
+        mcts: "MCTS | None" = None,
+        stop: threading.Event | None = None,
+    ) -> str | None:
         """
-        Calculate the best move based on the selected algorithm.
+        Calculate the best move based on the selected algorithm. Blocks for
+        the whole search; from a coroutine use get_best_move_async.
 
         Args:
             board_state: Current state of the board
             mode: Algorithm to use ("MiniMax", "MCTS", or "AI_Mode")
+            mcts: AlphaZero search kept for the whole game (see
+                new_alphazero_search), so its subtree is reused between moves
+            stop: Ends an AlphaZero search early when set (the Rust engines
+                always run to completion)
 
         Returns:
             Column letter (A-G) for the best move, or None if no valid move
         """
+        board = BitBoard.from_array(board_state)
+        params = self._cache_params(mode, minimax_depth, mcts_sim, expl_rate)
+        move = self._cached_move(board, params)
+        if move is not None:
+            return move
+        return self._calculate_move(
+            board,
+            params,
+            board_state,
+            mode,
+            minimax_depth,
+            mcts_sim,
+            expl_rate,
+            mcts,
+            stop,
+        )
+
+    async def get_best_move_async(
+        self,
+        board_state: list[list[int]],
+        mode: str,
+        minimax_depth: int,
+        mcts_sim: int,
+        expl_rate: float = 1.4,
+        mcts: "MCTS | None" = None,
+    ) -> str | None:
+        """
+        Like get_best_move, but the search runs on the engine pool so the
+        event loop stays responsive. Cached moves are answered right away.
+        Cancelling the awaiting task ends an AlphaZero search early and
+        discards the result of the others.
+        """
+        board = BitBoard.from_array(board_state)
+        params = self._cache_params(mode, minimax_depth, mcts_sim, expl_rate)
+        move = self._cached_move(board, params)
+        if move is not None:
+            return move
+
+        if self.engine_pool.saturated:
+            # This move has to wait; free the CPU for the moves being computed
+            self.yield_pondering()
+        stop = threading.Event()
+        return await self.engine_pool.run(
+            self._calculate_move,
+            board,
+            params,
+            board_state,
+            mode,
+            minimax_depth,
+            mcts_sim,
+            expl_rate,
+            mcts,
+            stop,
+            stop=stop,
+        )
+
+    def _cache_params(
+        self, mode: str, minimax_depth: int, mcts_sim: int, expl_rate: float
+    ) -> tuple | None:
+        """Cache key part for the mode's parameters, or None to skip the cache."""
+        match mode:
+            case "MiniMax":
+                return (mode, minimax_depth)
+            case "MCTS" if self.cache_stochastic:
+                return (mode, mcts_sim, expl_rate)
+            case "AI_Mode" if self.cache_stochastic:
+                # The AlphaZero settings are fixed per calculator
+                return (mode,)
+        return None
+
+    def _cached_move(self, board: BitBoard, params: tuple | None) -> str | None:
+        if params is None:
+            return None
+        start = time.perf_counter()
+        move = self.move_cache.get(board, params)
+        if move is not None:
+            elapsed = (time.perf_counter() - start) * 1e6
+            logger.info(
+                f"{params[0]} move from cache in {elapsed:.0f}us: "
+                f"{self.move_cache.summary()}"
+            )
+        return move
+
+    def _calculate_move(
+        self,
+        board: BitBoard,
+        params: tuple | None,
+        board_state: list[list[int]],
+        mode: str,
+        minimax_depth: int,
+        mcts_sim: int,
+        expl_rate: float,
+        mcts: "MCTS | None",
+        stop: threading.Event | None,
+    ) -> str | None:
+        """Run the engine and cache its move."""
+        start = time.perf_counter()
         match mode:
+            # The Rust engines take the bitboard masks, so the board is not
+            # converted to nested lists on every call. Wheels built before
+            # the bitboard entry points only have the list interface.
             case "MiniMax":
-                return minimax_algorithm.get_best_move(board_state, minimax_depth)
+                engine = self.engines.get("MiniMax")
+                if hasattr(engine, "get_best_move_bitboard"):
+                    move = engine.get_best_move_bitboard(
+                        board.masks[1], board.masks[2], minimax_depth
+                    )
+                else:
+                    move = engine.get_best_move(
+                        board.to_array().tolist(), minimax_depth
+                    )
 
             case "MCTS":
-                return monte_carlo_tree_search.get_best_move_mcts(
-                    board_state, mcts_sim, expl_rate
-                )
+                engine = self.engines.get("MCTS")
+                if hasattr(engine, "get_best_move_mcts_bitboard"):
+                    move = engine.get_best_move_mcts_bitboard(
+                        board.masks[1], board.masks[2], mcts_sim, expl_rate
+                    )
+                else:
+                    move = engine.get_best_move_mcts(
+                        board.to_array().tolist(), mcts_sim, expl_rate
+                    )
 
             case "AI_Mode":
-                return self._get_alphazero_move(board_state)
+                move = self._get_alphazero_move(board_state, mcts, stop)
 
             case _:
                 raise ValueError(
                     "Invalid mode. Please choose from: MiniMax, MCTS, AI_Mode"
                 )
 
-    def _get_alphazero_move(self, board_state: List[List[int]]) -> Optional[str]:
-        """Calculate best move using AlphaZero model."""
-        self.env.board = board_state_to_env_board(board_state)
-        self.env.current_player = 2  # AI is always player 2
-
-        mcts = MCTS(
-            self.env,
-            self.alphazero_model,
-            n_simulations=ALPHAZERO_N_SIMULATIONS,
-            device=self.device,
+        # A search ended early by ``stop`` is not worth keeping
+        if params is not None and move is not None and not (stop and stop.is_set()):
+            self.move_cache.put(board, params, move, time.perf_counter() - start)
+        return move
+
+    def new_alphazero_search(self) -> "MCTS":
+        """Create an AlphaZero search that can be kept for one game."""
+        return self.alphazero.new_search()
+
+    def ponder(
+        self, mcts: "MCTS", board_state: list[list[int]], stop: threading.Event
+    ) -> None:
+        """
+        Search the human's position (player 1 to move) with the game's
+        AlphaZero search until ``stop`` is set. Blocks, so run it in a thread.
+        """
+        mcts.ponder(
+            board_state_to_env_board(board_state),
+            1,
+            stop,
+            max_simulations=ALPHAZERO_PONDER_SIMULATIONS,
         )
+        logger.info(f"AlphaZero pondered: {mcts.stats.summary()}")
+
+    async def ponder_async(
+        self, mcts: "MCTS", board_state: list[list[int]], stop: threading.Event
+    ) -> bool:
+        """
+        Ponder on the ponder pool until ``stop`` is set. Pondering is skipped
+        if ALPHAZERO_PONDER_SESSIONS games already ponder or moves wait for
+        an engine worker, and it ends early when moves start waiting.
+
+        Returns:
+            bool: False, if pondering was skipped.
+        """
+        if self.ponder_pool.saturated or self.engine_pool.queued:
+            return False
+        self._ponder_stops.add(stop)
+        try:
+            await self.ponder_pool.run(self.ponder, mcts, board_state, stop, stop=stop)
+        finally:
+            self._ponder_stops.discard(stop)
+        return True
+
+    def yield_pondering(self):
+        """Stop all ponder searches, e.g. because moves are waiting."""
+        for stop in list(self._ponder_stops):
+            stop.set()
+
+    def _get_alphazero_move(
+        self,
+        board_state: list[list[int]],
+        mcts: "MCTS | None" = None,
+        stop: threading.Event | None = None,
+    ) -> str | None:
+        """Calculate best move using AlphaZero model."""
+        if mcts is None:
+            mcts = self.new_alphazero_search()
 
-        state = self.env.get_state()
-        action_visits = mcts.search(state, self.env.current_player)
+        # AI is always player 2
+        state = board_state_to_env_board(board_state)
+        action_visits = mcts.search(state, 2, stop=stop)
+        logger.info(f"AlphaZero search: {mcts.stats.summary()}")
 
         if not action_visits:
             return None
@@ -1,37 +1,82 @@
+import asyncio
 import json
+from typing import Any
+
 import websockets
-from typing import Dict, Any
 
+from agents.engine_registry import EngineRegistry
 from core.constants import SELECTABLE_ALGORITHMS
-from core.game_state import GameState
-from core.game_loop import GameLoop
 from core.logger import logger
+from core.session_registry import Session, SessionLimitError, SessionRegistry
 from util import get_algorithm_params
 
 
 class WebSocketHandler:
-    def __init__(self, game_state: GameState):
-        self.game_state = game_state
-        self.game_loop = GameLoop(game_state)
+    def __init__(
+        self, registry: SessionRegistry, engines: EngineRegistry | None = None
+    ):
+        """
+        Args:
+            registry: Sessions of the connected clients.
+            engines: Engines of the shared move calculator, whose readiness
+                is reported to clients.
+        """
+        self.registry = registry
+        self.engines = engines
+
+    def engine_status(self) -> dict[str, str]:
+        return self.engines.status() if self.engines is not None else {}
 
-    # inform client about successful connection and available algorithms
+    # inform client about successful connection, available algorithms and
+    # which of their engines are loaded ("idle", "loading", "ready", "failed")
     async def send_initial_message(self, websocket):
         await websocket.send(
             json.dumps(
                 {
                     "status": "connection_established",
                     "algorithms": SELECTABLE_ALGORITHMS,
+                    "engines": self.engine_status(),
                 }
             )
         )
 
+    async def load_engine(self, websocket, algorithm: str):
+        """
+        Make sure the algorithm's engine is loaded before a game starts. The
+        client is told to wait if it is still loading.
+
+        Raises:
+            ValueError: If the engine cannot be loaded.
+        """
+        if self.engines is None or algorithm not in self.engines:
+            return
+        if not self.engines.is_ready(algorithm):
+            await websocket.send(
+                json.dumps({"status": "engine_loading", "algorithm": algorithm})
+            )
+        try:
+            await self.engines.load(algorithm)
+        except Exception as e:
+            logger.error(f"Could not load engine {algorithm}: {e}")
+            raise ValueError(f"{algorithm} is not available right now.") from e
+
     async def handle_connection(self, websocket):
         logger.info("Client connected!")
+        try:
+            session = self.registry.create(websocket)
+        except SessionLimitError as e:
+            await websocket.send(json.dumps({"error": str(e)}))
+            await websocket.close()
+            return
+
         await self.send_initial_message(websocket)
         try:
             async for message in websocket:
+                session.touch()
                 try:
-                    response = await self.process_message(websocket, message)
+                    response = await self.until_closed(
+                        websocket, self.process_message(session, websocket, message)
+                    )
                     if response:
                         await websocket.send(json.dumps(response))
                 except json.JSONDecodeError:
@@ -39,7 +84,7 @@ class WebSocketHandler:
         except websockets.ConnectionClosed:
             logger.warning("Client disconnected!")
         finally:
-            self.game_state.end_game()
+            self.registry.remove(session.session_id)
 
             # Log that the websocket connection is closing due to navigation away or disconnection.
             logger.info(
@@ -49,17 +94,65 @@ class WebSocketHandler:
             # Close the connection
             await websocket.close()
 
-    async def process_message(self, websocket, message) -> Dict[str, Any]:
+    async def until_closed(self, websocket, coroutine):
+        """
+        Await ``coroutine``, but cancel it if the client disconnects first,
+        so a search nobody waits for anymore is stopped.
+
+        Returns:
+            The coroutine's result, or None if it was cancelled.
+        """
+        task = asyncio.create_task(coroutine)
+        closed = asyncio.create_task(websocket.wait_closed())
+        try:
+            await asyncio.wait({task, closed}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            closed.cancel()
+        if task.done():
+            return task.result()
+
+        logger.warning("Client disconnected, cancelling its request")
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return None
+
+    async def process_message(
+        self, session: Session, websocket, message
+    ) -> dict[str, Any]:
         data = json.loads(message)
         logger.info(f"Received message: {data}")
 
+        if "move" in data:
+            if session.game_loop is None or not session.game_state.is_game_running():
+                return {"error": "No game running. Please choose an algorithm first."}
+            if not session.digital_only:
+                return {"error": "Moves are detected by the camera in machine mode."}
+            await session.game_loop.play_human_move(websocket, str(data["move"]))
+            return None
+
+        if "engines" in data:
+            return {"status": "engines", "engines": self.engine_status()}
+
         if "algorithm" in data and data["algorithm"] in SELECTABLE_ALGORITHMS:
             difficulty = data.get("difficulty", 2)
 
             try:
                 algorithm_params = get_algorithm_params(data["algorithm"], difficulty)
-                self.game_state.start_game(data["algorithm"], algorithm_params)
-                await self.game_loop.run(websocket)
+                await self.load_engine(websocket, data["algorithm"])
+                self.registry.prepare_game(session, bool(data.get("digital", False)))
+                session.game_state.start_game(data["algorithm"], algorithm_params)
+                if session.digital_only:
+                    # Human moves arrive as {"move": "<column>"} messages
+                    return {
+                        "status": "game_started",
+                        "algorithm": data["algorithm"],
+                        "difficulty": difficulty,
+                        "digital": True,
+                    }
+                await session.game_loop.run(websocket)
 
                 return {
                     "status": "game_started",
@@ -67,7 +160,7 @@ class WebSocketHandler:
                     "difficulty": difficulty,
                 }
 
-            except ValueError as e:
+            except (ValueError, SessionLimitError) as e:
                 return {"error": str(e)}
 
         else:
@@ -0,0 +1,53 @@
+import argparse
+
+from agents.benchmark import (
+    DEFAULT_ENGINES,
+    DEFAULT_HISTORY_PATH,
+    append_history,
+    format_report,
+    load_history,
+    run_benchmarks,
+)
+
+
+def parse_engines(value: str):
+    """ "MiniMax:3,MCTS:1,AI_Mode" -> [("MiniMax", 3), ("MCTS", 1), ("AI_Mode", 2)]"""
+    engines = []
+    for item in value.split(","):
+        mode, _, difficulty = item.partition(":")
+        engines.append((mode, int(difficulty) if difficulty else 2))
+    return engines
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure move latency of the engines on a fixed set of positions."
+    )
+    parser.add_argument(
+        "--engines",
+        type=parse_engines,
+        default=DEFAULT_ENGINES,
+        help="Comma-separated mode:difficulty pairs (default: all)",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Calls per position")
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Calls running at the same time"
+    )
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH)
+    parser.add_argument(
+        "--no-isolate",
+        action="store_true",
+        help="Run all engines in this process (peak RSS is then shared)",
+    )
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    record = run_benchmarks(
+        args.engines, args.repeats, args.concurrency, isolate=not args.no_isolate
+    )
+    append_history(record, args.history)
+    print(format_report(record, history[-1] if history else None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import random
+
+import numpy as np
+
+from core.constants import COLUMNS, ROWS
+
+# Every column occupies ROWS + 1 bits: ROWS playable cells (bottom to top)
+# followed by one sentinel bit that keeps lines from wrapping into the next
+# column when the masks are shifted.
+COLUMN_HEIGHT = ROWS + 1
+
+# Shift distances for the four line directions: vertical, horizontal and
+# the two diagonals.
+LINE_SHIFTS = (1, COLUMN_HEIGHT, COLUMN_HEIGHT - 1, COLUMN_HEIGHT + 1)
+
+
+def cell_bit(row: int, col: int) -> int:
+    """
+    Bit index of a board cell.
+
+    :param row: Row index as used by the ndarray view (0 = top row).
+    :param col: Column index (0 = column 'A').
+    :return: Position of the cell inside a player mask.
+    """
+    return col * COLUMN_HEIGHT + (ROWS - 1 - row)
+
+
+# Single-bit mask of every cell laid out like the ndarray view.
+CELL_MASKS = np.array(
+    [[1 << cell_bit(r, c) for c in range(COLUMNS)] for r in range(ROWS)],
+    dtype=np.uint64,
+)
+
+# Lowest bit of every column, i.e. the first free cell of an empty column.
+BOTTOM_BITS = tuple(c * COLUMN_HEIGHT for c in range(COLUMNS))
+
+# Bit that would sit above the top cell of every column.
+TOP_BITS = tuple(b + ROWS for b in BOTTOM_BITS)
+
+FULL_BOARD_MOVES = ROWS * COLUMNS
+
+
+def _line_windows() -> dict:
+    """
+    Precompute, for every cell bit and line direction, the mask of the up to
+    seven cells on that line within distance three of the cell. Any four in a
+    row inside such a window passes through the cell itself.
+    """
+    directions = {
+        1: (0, 1),
+        COLUMN_HEIGHT: (1, 0),
+        COLUMN_HEIGHT - 1: (1, -1),
+        COLUMN_HEIGHT + 1: (1, 1),
+    }
+    windows = {}
+    for col in range(COLUMNS):
+        for height in range(ROWS):
+            bit = col * COLUMN_HEIGHT + height
+            windows[bit] = []
+            for shift, (dc, dh) in directions.items():
+                window = 0
+                for k in range(-3, 4):
+                    c, h = col + k * dc, height + k * dh
+                    if 0 <= c < COLUMNS and 0 <= h < ROWS:
+                        window |= 1 << (c * COLUMN_HEIGHT + h)
+                windows[bit].append((shift, window))
+    return windows
+
+
+LINE_WINDOWS = _line_windows()
+
+# Zobrist keys: one random 64-bit value per player and cell bit. The seed is
+# fixed so hashes are stable across processes and can be persisted, e.g. in
+# opening books.
+_zobrist_rng = random.Random(0xC0FFEE)
+ZOBRIST_KEYS = [
+    [_zobrist_rng.getrandbits(64) for _ in range(COLUMNS * COLUMN_HEIGHT)]
+    for _ in range(3)
+]
+
+# Bit index of the horizontally mirrored cell (column c <-> COLUMNS - 1 - c).
+MIRROR_BITS = [
+    (COLUMNS - 1 - bit // COLUMN_HEIGHT) * COLUMN_HEIGHT + bit % COLUMN_HEIGHT
+    for bit in range(COLUMNS * COLUMN_HEIGHT)
+]
+
+
+def has_four(mask: int) -> bool:
+    """
+    Check whether a player mask contains four aligned coins.
+
+    :param mask: Bitmask of one player's coins.
+    :return: True, if any vertical, horizontal or diagonal line is complete.
+    """
+    for shift in LINE_SHIFTS:
+        pairs = mask & (mask >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def has_four_through(mask: int, bit: int) -> bool:
+    """
+    Check whether a player mask contains four aligned coins through one cell.
+
+    :param mask: Bitmask of one player's coins.
+    :param bit: Bit index of the cell, e.g. of the coin placed last.
+    :return: True, if one of the (at most four) lines through the cell is complete.
+    """
+    for shift, window in LINE_WINDOWS[bit]:
+        line = mask & window
+        pairs = line & (line >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+class BitBoard:
+    """
+    Bitboard representation of a 6x7 Connect Four board.
+
+    Each player owns one integer mask with a bit per cell, and ``heights``
+    holds the bit index of the next free cell of every column, so dropping a
+    coin is a couple of integer operations and a win test is four
+    shift-and-mask steps.
+
+    ``hash`` is a 64-bit Zobrist hash updated on every drop and
+    ``mirror_hash`` is the hash of the left-right mirrored position;
+    ``canonical_hash`` is the same for a position and its mirror image.
+    Player 1 = 1
+    Player 2 = 2
+    """
+
+    __slots__ = ("hash", "heights", "masks", "mirror_hash", "moves")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # Index 0 is unused so masks can be looked up by player number.
+        self.masks = [0, 0, 0]
+        self.heights = list(BOTTOM_BITS)
+        self.moves = 0
+        self.hash = 0
+        self.mirror_hash = 0
+
+    def copy(self) -> "BitBoard":
+        clone = BitBoard.__new__(BitBoard)
+        clone.masks = self.masks[:]
+        clone.heights = self.heights[:]
+        clone.moves = self.moves
+        clone.hash = self.hash
+        clone.mirror_hash = self.mirror_hash
+        return clone
+
+    @classmethod
+    def from_array(cls, board) -> "BitBoard":
+        """
+        Build a bitboard from a 6x7 board (0 = empty, 1 = player 1, 2 = player 2).
+
+        :param board: Board as ndarray or nested lists, row 0 being the top row.
+        :return: Equivalent BitBoard instance.
+        :raises ValueError: If a coin does not rest on the bottom row or on
+            another coin; column heights could not be derived from it.
+        """
+        board = np.asarray(board)
+        occupied = board != 0
+        if np.any(occupied[:-1] & ~occupied[1:]):
+            raise ValueError("Invalid board: coins must stack from the bottom row.")
+        bitboard = cls()
+        for player in (1, 2):
+            bitboard.masks[player] = int(
+                np.bitwise_or.reduce(CELL_MASKS[board == player], initial=0)
+            )
+        counts = np.count_nonzero(board, axis=0)
+        bitboard.heights = [BOTTOM_BITS[c] + int(counts[c]) for c in range(COLUMNS)]
+        bitboard.moves = int(counts.sum())
+        for player in (1, 2):
+            mask = bitboard.masks[player]
+            while mask:
+                bit = (mask & -mask).bit_length() - 1
+                bitboard.hash ^= ZOBRIST_KEYS[player][bit]
+                bitboard.mirror_hash ^= ZOBRIST_KEYS[player][MIRROR_BITS[bit]]
+                mask &= mask - 1
+        return bitboard
+
+    def to_array(self, writeable: bool = True) -> np.ndarray:
+        """
+        Return the ndarray view of the board (6x7, row 0 being the top row).
+
+        The array is a fresh copy; writing to it does not change the bitboard.
+
+        :param writeable: False returns a read-only array, so code that still
+            assigns cells to expect a change of the board fails loudly.
+        """
+        p1 = (CELL_MASKS & np.uint64(self.masks[1])) != 0
+        p2 = (CELL_MASKS & np.uint64(self.masks[2])) != 0
+        array = p1.astype(int) + 2 * p2.astype(int)
+        array.flags.writeable = writeable
+        return array
+
+    @property
+    def canonical_hash(self) -> int:
+        """Hash shared by the position and its mirror image."""
+        return min(self.hash, self.mirror_hash)
+
+    @property
+    def is_mirrored(self) -> bool:
+        """True, if ``canonical_hash`` was taken from the mirrored position."""
+        return self.mirror_hash < self.hash
+
+    def can_play(self, col: int) -> bool:
+        return self.heights[col] < TOP_BITS[col]
+
+    def valid_columns(self) -> list:
+        return [c for c in range(COLUMNS) if self.heights[c] < TOP_BITS[c]]
+
+    def next_open_row(self, col: int):
+        """
+        Row index (0 = top row) where a coin dropped into ``col`` would land.
+
+        :return: Row index, or None if the column is full.
+        """
+        if not self.can_play(col):
+            return None
+        return ROWS - 1 - (self.heights[col] - BOTTOM_BITS[col])
+
+    def drop(self, col: int, player: int) -> int:
+        """
+        Drop a coin for ``player`` into ``col``. The column must not be full.
+
+        :return: Row index (0 = top row) where the coin landed.
+        """
+        bit = self.heights[col]
+        self.masks[player] |= 1 << bit
+        self.heights[col] = bit + 1
+        self.moves += 1
+        self.hash ^= ZOBRIST_KEYS[player][bit]
+        self.mirror_hash ^= ZOBRIST_KEYS[player][MIRROR_BITS[bit]]
+        return ROWS - 1 - (bit - BOTTOM_BITS[col])
+
+    def winning_columns(self, player: int) -> list:
+        """
+        Columns where a coin of ``player`` would complete a line right away.
+        """
+        mask = self.masks[player]
+        return [
+            c
+            for c in range(COLUMNS)
+            if self.heights[c] < TOP_BITS[c]
+            and has_four_through(mask | (1 << self.heights[c]), self.heights[c])
+        ]
+
+    def has_won(self, player: int) -> bool:
+        return has_four(self.masks[player])
+
+    def winner(self) -> int:
+        """
+        :return: 0 if no winner, 1 if player 1 wins, 2 if player 2 wins.
+        """
+        if has_four(self.masks[1]):
+            return 1
+        if has_four(self.masks[2]):
+            return 2
+        return 0
+
+    def check_win_at(self, row: int, col: int) -> int:
+        """
+        Check only the lines through one cell, typically the one just played.
+
+        :param row: Row index (0 = top row).
+        :param col: Column index.
+        :return: Player owning the cell if one of its lines is complete, otherwise 0.
+        """
+        bit = cell_bit(row, col)
+        for player in (1, 2):
+            if (self.masks[player] >> bit) & 1:
+                return player if has_four_through(self.masks[player], bit) else 0
+        return 0
+
+    def is_full(self) -> bool:
+        return self.moves >= FULL_BOARD_MOVES
@@ -1,19 +1,47 @@
 import numpy as np
+from typing import Optional, Tuple
 
-from core.constants import ROWS, COLUMNS
+from core.bitboard import BitBoard
 from core.logger import logger
 
 
 class Board:
     def __init__(self):
-        self.board = np.zeros((ROWS, COLUMNS), dtype=int)
+        self.bitboard = BitBoard()
+        # (row, column) of the coin placed last, None on an empty board
+        self.last_move: Optional[Tuple[int, int]] = None
+
+    @property
+    def board(self) -> np.ndarray:
+        """
+        Read-only 6x7 ndarray of the board (0 = empty, 1 = player 1, 2 = player 2).
+        Use ``add_pos_to_board`` to place coins.
+        """
+        return self.bitboard.to_array(writeable=False)
+
+    @board.setter
+    def board(self, board):
+        self.bitboard = BitBoard.from_array(board)
+        self.last_move = None
+
+    @property
+    def position_hash(self) -> int:
+        """64-bit Zobrist hash of the position, usable as a dict key."""
+        return self.bitboard.hash
+
+    @property
+    def canonical_hash(self) -> int:
+        """Position hash that is identical for the left-right mirrored position."""
+        return self.bitboard.canonical_hash
 
     def reset(self):
-        self.board = np.zeros((ROWS, COLUMNS), dtype=int)
+        self.bitboard.reset()
+        self.last_move = None
 
     def add_pos_to_board(self, column: str, player: int = 1) -> bool:
         """
         Add coin for the given player to the global board state.
+        The landing cell is stored in ``last_move`` for ``check_win_at``.
 
         :param column: Character between 'A' and 'G' that defines the column.
         :param player: Player that places the coin (Default human).
@@ -27,64 +55,28 @@ class Board:
 
         col_index = ord(column) - ord("A")
 
-        for row in reversed(range(ROWS)):
-            if self.board[row][col_index] == 0:
-                self.board[row][col_index] = player
-                return True
+        if not self.bitboard.can_play(col_index):
+            logger.error(f"Column {column} is full.")
+            return False
 
-        logger.error(f"Column {column} is full.")
-        return False
+        row = self.bitboard.drop(col_index, player)
+        self.last_move = (row, col_index)
+        return True
 
     def winner_check(self) -> int:
         """
         Check if there is a winner in the current board state.
 
-        :param board_state: Current board state.
         :return: 0 if no winner, 1 if player 1 wins, 2 if player 2 wins.
         """
-        for r in range(ROWS):
-            for c in range(COLUMNS):
-                if self.board[r][c] == 0:
-                    continue
-
-                # Check horizontal
-                if c + 3 < COLUMNS:
-                    if (
-                        self.board[r][c]
-                        == self.board[r][c + 1]
-                        == self.board[r][c + 2]
-                        == self.board[r][c + 3]
-                    ):
-                        return self.board[r][c]
-
-                # Check vertical
-                if r + 3 < ROWS:
-                    if (
-                        self.board[r][c]
-                        == self.board[r + 1][c]
-                        == self.board[r + 2][c]
-                        == self.board[r + 3][c]
-                    ):
-                        return self.board[r][c]
-
-                # Check diagonal (top-left to bottom-right)
-                if r + 3 < ROWS and c + 3 < COLUMNS:
-                    if (
-                        self.board[r][c]
-                        == self.board[r + 1][c + 1]
-                        == self.board[r + 2][c + 2]
-                        == self.board[r + 3][c + 3]
-                    ):
-                        return self.board[r][c]
-
-                # Check diagonal (bottom-left to top-right)
-                if r - 3 >= 0 and c + 3 < COLUMNS:
-                    if (
-                        self.board[r][c]
-                        == self.board[r - 1][c + 1]
-                        == self.board[r - 2][c + 2]
-                        == self.board[r - 3][c + 3]
-                    ):
-                        return self.board[r][c]
-
-        return 0
+        return self.bitboard.winner()
+
+    def check_win_at(self, row: int, col: int) -> int:
+        """
+        Check for a winner using only the lines through the given cell.
+
+        :param row: Row index (0 = top row), e.g. ``last_move[0]``.
+        :param col: Column index (0 = 'A'), e.g. ``last_move[1]``.
+        :return: 0 if no winner, otherwise the player owning the completed line.
+        """
+        return self.bitboard.check_win_at(row, col)
@@ -0,0 +1,93 @@
+from collections.abc import Iterable
+
+import numpy as np
+
+from core.bitboard import CELL_MASKS, COLUMN_HEIGHT, BitBoard
+from core.constants import COLUMNS, ROWS
+
+
+def _win_line_masks() -> np.ndarray:
+    """
+    Bitmasks of all 69 possible four-in-a-row lines on a 6x7 board.
+    """
+    lines = []
+    for col in range(COLUMNS):
+        for height in range(ROWS):
+            for dc, dh in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_col, end_height = col + 3 * dc, height + 3 * dh
+                if not (0 <= end_col < COLUMNS and 0 <= end_height < ROWS):
+                    continue
+                mask = 0
+                for k in range(4):
+                    mask |= 1 << ((col + k * dc) * COLUMN_HEIGHT + height + k * dh)
+                lines.append(mask)
+    return np.array(lines, dtype=np.uint64)
+
+
+WIN_LINE_MASKS = _win_line_masks()
+
+# Bit of the top cell of every column; a column is playable while it is empty.
+TOP_CELL_MASKS = CELL_MASKS[0]
+
+_FLAT_CELL_MASKS = CELL_MASKS.reshape(-1)
+
+
+def boards_to_bitboards(boards: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a batch of 6x7 boards into per-player bitmasks.
+
+    :param boards: Array of shape (N, 6, 7) with 0 = empty, 1/2 = players.
+    :return: Two uint64 arrays of shape (N,) with the masks of player 1 and 2.
+    """
+    flat = np.asarray(boards).reshape(-1, ROWS * COLUMNS)
+    p1 = np.bitwise_or.reduce(
+        np.where(flat == 1, _FLAT_CELL_MASKS, np.uint64(0)), axis=1
+    )
+    p2 = np.bitwise_or.reduce(
+        np.where(flat == 2, _FLAT_CELL_MASKS, np.uint64(0)), axis=1
+    )
+    return p1, p2
+
+
+def stack_bitboards(bitboards: Iterable[BitBoard]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Collect the masks of several BitBoard instances into two uint64 arrays.
+    """
+    bitboards = list(bitboards)
+    p1 = np.fromiter((b.masks[1] for b in bitboards), np.uint64, len(bitboards))
+    p2 = np.fromiter((b.masks[2] for b in bitboards), np.uint64, len(bitboards))
+    return p1, p2
+
+
+def batch_terminal_status(
+    p1_masks: np.ndarray, p2_masks: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate winner, draw and legal moves for a batch of bitboards at once.
+
+    :param p1_masks: uint64 array of shape (N,) with player 1's coins.
+    :param p2_masks: uint64 array of shape (N,) with player 2's coins.
+    :return: Tuple of
+        - winner (N,) int array: 0 = no winner, 1 or 2 = winning player,
+        - draw (N,) bool array: board full without a winner,
+        - legal (N, 7) bool array: columns that can still be played.
+    """
+    p1 = np.asarray(p1_masks, dtype=np.uint64)[:, None]
+    p2 = np.asarray(p2_masks, dtype=np.uint64)[:, None]
+
+    p1_wins = ((p1 & WIN_LINE_MASKS) == WIN_LINE_MASKS).any(axis=1)
+    p2_wins = ((p2 & WIN_LINE_MASKS) == WIN_LINE_MASKS).any(axis=1)
+    winner = np.where(p1_wins, 1, np.where(p2_wins, 2, 0))
+
+    legal = ((p1 | p2) & TOP_CELL_MASKS) == 0
+    draw = ~legal.any(axis=1) & (winner == 0)
+    return winner, draw, legal
+
+
+def batch_terminal_status_from_arrays(
+    boards: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Same as ``batch_terminal_status`` for a batch of boards of shape (N, 6, 7).
+    """
+    return batch_terminal_status(*boards_to_bitboards(boards))
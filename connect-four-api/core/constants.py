@@ -1,22 +1,58 @@
-from typing import List
-
+import os
 from asyncio import Event
 
 # Path to the model file
 MODEL_PATH = "agents/alphazero/alphazero_connect_four.pt"
+# Fused, frozen TorchScript export of the model (MODEL_PATH is used if missing)
+INFERENCE_MODEL_PATH = "agents/alphazero/alphazero_connect_four.ts"
+# Int8 model for CPU-only hosts (the fp32 model is quantized at load if missing)
+QUANTIZED_MODEL_PATH = "agents/alphazero/alphazero_connect_four.int8.ts"
 
 # Connect Four Constants
 ROWS = 6
 COLUMNS = 7
 
 # Global Board State (0 = empty, 1 = Player 1 (Human), 2 = Player 2 [Computer])
-board_state: List[List[int]] = [[0 for _ in range(COLUMNS)] for _ in range(ROWS)]
+board_state: list[list[int]] = [[0 for _ in range(COLUMNS)] for _ in range(ROWS)]
 
 # Selectable Algorithms
 SELECTABLE_ALGORITHMS = ["MiniMax", "MCTS", "AI_Mode"]
 
 # AlphaZero Constants
 ALPHAZERO_N_SIMULATIONS = 200
+ALPHAZERO_BATCH_SIZE = 8  # Leaves evaluated per forward pass
+ALPHAZERO_CACHE_SIZE = 100_000  # Positions kept in the evaluation cache
+ALPHAZERO_TIME_BUDGET = 1.5  # Seconds per move; the search stops early if needed
+ALPHAZERO_N_THREADS = min(4, os.cpu_count() or 1)  # Search workers sharing one tree
+ALPHAZERO_TRANSPOSITIONS = True  # Share nodes between move orders (DAG search)
+# Limit for searching on the human's turn. A pondering game keeps
+# ALPHAZERO_N_THREADS threads busy until the human moves or the limit is
+# reached (tens of seconds of CPU per turn), on top of the ENGINE_WORKERS
+# computing moves, so only ALPHAZERO_PONDER_SESSIONS games ponder at a time
+# and none start while moves wait for an engine worker.
+ALPHAZERO_PONDER_SIMULATIONS = 50_000
+ALPHAZERO_PONDER_SESSIONS = int(os.getenv("ALPHAZERO_PONDER_SESSIONS", "1"))
+ALPHAZERO_BROKER_MAX_BATCH = 64  # Positions per forward pass across all games
+ALPHAZERO_BROKER_MAX_WAIT = 0.001  # Seconds a request waits for others to join
+# File to append per-search statistics to as JSON lines (disabled if unset)
+SEARCH_STATS_PATH = os.getenv("SEARCH_STATS_PATH")
+# Use the int8 model on CPU
+ALPHAZERO_QUANTIZED = os.getenv("ALPHAZERO_QUANTIZED", "0") == "1"
+
+# Engines loaded in the background after the server starts, in this order
+# (the others are loaded when a game first needs them). AI_Mode imports torch
+# and loads the model, so deployments that play it add it to the list.
+WARMUP_ENGINES = [
+    name for name in os.getenv("WARMUP_ENGINES", "MiniMax,MCTS").split(",") if name
+]
+
+# Engine calls (moves of all sessions) computed at the same time; more wait
+ENGINE_WORKERS = int(os.getenv("ENGINE_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Computed moves kept for repeated positions (shared by all sessions)
+MOVE_CACHE_SIZE = 10_000
+# Also cache moves of the randomized engines (MCTS and AI_Mode)
+MOVE_CACHE_STOCHASTIC = os.getenv("MOVE_CACHE_STOCHASTIC", "1") == "1"
 
 # Add game control event
 game_control = Event()
@@ -25,6 +61,11 @@ game_control = Event()
 WEBSOCKET_HOST = "localhost"
 WEBSOCKET_PORT = 8000
 
+# Session Constants
+MAX_SESSIONS = 32
+SESSION_IDLE_TIMEOUT = 600  # seconds without a message before a session is evicted
+SESSION_EVICTION_INTERVAL = 30  # seconds between idle-session sweeps
+
 # PLC Configuration
 PLC_IP = "192.168.0.1"  # Replace with your actual PLC IP
 PLC_RACK = 0
@@ -1,19 +1,51 @@
+import asyncio
 import json
+import threading
+from typing import TYPE_CHECKING
 
+from agents.move_calculator import MoveCalculator
 from core.game_state import GameState
 from core.logger import logger
-from hardware.contour_recognition import detect_board_change
 
-from hardware.plc_client import PLCClient
-from agents.move_calculator import MoveCalculator
-import asyncio
+if TYPE_CHECKING:
+    from hardware.plc_client import PLCClient
+
+
+def _create_plc_client() -> "PLCClient":
+    # snap7 (and OpenCV for the camera) are only needed in machine mode
+    from hardware.plc_client import PLCClient
+
+    return PLCClient()
 
 
 class GameLoop:
-    def __init__(self, game_state: GameState):
+    def __init__(
+        self,
+        game_state: GameState,
+        move_calculator: MoveCalculator = None,
+        plc_client: "PLCClient" = None,
+        digital_only: bool = False,
+    ):
+        """
+        Args:
+            game_state: State of the game played by this loop.
+            move_calculator: Shared move calculator (a new one is created if omitted).
+            plc_client: Shared PLC client for the physical machine.
+            digital_only: Play without camera and PLC; human moves arrive as messages.
+        """
         self.game_state = game_state
-        self.plc_client = PLCClient()  # Initialize with your PLC settings
-        self.move_calculator = MoveCalculator()
+        self.digital_only = digital_only
+        if digital_only:
+            self.plc_client = None
+        else:
+            # Initialize with your PLC settings
+            self.plc_client = plc_client or _create_plc_client()
+        self.move_calculator = move_calculator or MoveCalculator()
+        # AlphaZero search of the current game; its tree is reused between moves
+        self.alphazero_search = None
+        # Background search on the human's turn (AI_Mode only)
+        self._ponder_task = None
+        self._ponder_stop = threading.Event()
 
     async def run(self, websocket, wait_time: int = 15):
         try:
@@ -27,6 +59,7 @@ class GameLoop:
             logger.error(f"Error in game loop: {e}")
         finally:
             logger.info("Game loop ending")
+            await self.stop_pondering()
             self.game_state.end_game()
 
     async def _process_game_turn(self, websocket, wait_time: int):
@@ -36,7 +69,10 @@ class GameLoop:
         logger.info(self.game_state.board.board)
         await asyncio.sleep(wait_time)
         try:
+            from hardware.contour_recognition import detect_board_change
+
             new_pos, is_cross = detect_board_change(self.game_state.board.board)
+            await self.plc_client.connect_async()
             # new_pos, is_cross = "C", True  # Placeholder for actual detection logic
             # new_pos = "C"
             self.plc_client.column_to_machine_coords(new_pos, is_cross)
@@ -45,6 +81,14 @@ class GameLoop:
             logger.error(f"Error detecting board change: {e}")
             await websocket.send(json.dumps({"error": f"{e}"}, ensure_ascii=False))
             return
+        await self.play_human_move(websocket, new_pos)
+
+    async def play_human_move(self, websocket, new_pos: str):
+        """
+        Apply the human's move and answer with the computer's move.
+        In digital-only mode this is called directly for every move message.
+        """
+        await self.stop_pondering()
         if self.game_state.board.add_pos_to_board(column=new_pos, player=1):
             logger.info(f"New board state: \n {self.game_state.board.board}")
             await websocket.send(
@@ -57,22 +101,42 @@ class GameLoop:
                 )
             )
             await self._check_winner(websocket)
+            if not self.game_state.is_game_running():
+                return
             await asyncio.sleep(1)
             await self._handle_ai_move(websocket)
             await self._check_winner(websocket)
+            self._start_pondering()
+        elif self.digital_only:
+            await websocket.send(
+                json.dumps({"error": f"Invalid move: {new_pos}"}, ensure_ascii=False)
+            )
 
     async def _handle_ai_move(self, websocket):
-        best_column = self.move_calculator.get_best_move(
-            self.game_state.board.board,
+        # Load the engine off the event loop if the warm-up has not done it yet
+        await self.move_calculator.engines.load(self.game_state.current_algorithm)
+        if (
+            self.game_state.current_algorithm == "AI_Mode"
+            and self.alphazero_search is None
+        ):
+            # Positions of a new game are not in the old tree, so the search
+            # starts over by itself
+            self.alphazero_search = self.move_calculator.new_alphazero_search()
+        # Runs on the engine pool; other sessions are served meanwhile
+        best_column = await self.move_calculator.get_best_move_async(
+            self.game_state.board.board.copy(),
             self.game_state.current_algorithm,
             self.game_state.current_depth,
             self.game_state.current_sim,
+            mcts=self.alphazero_search,
         )
 
         logger.info(f"Computer chose column: {best_column}")
 
         if best_column is not None:
-            self.plc_client.column_to_machine_coords(best_column, True)
+            if self.plc_client is not None:
+                await self.plc_client.connect_async()
+                self.plc_client.column_to_machine_coords(best_column, True)
             if self.game_state.board.add_pos_to_board(column=best_column, player=2):
                 await websocket.send(
                     json.dumps(
@@ -88,8 +152,48 @@ class GameLoop:
                 json.dumps({"status": "error", "message": "No valid move calculated"})
             )
 
+    def _start_pondering(self):
+        """
+        Keep the AlphaZero search running on the ponder pool while the human
+        thinks. The next search continues from the subtree of their reply.
+        Pondering is skipped when the server is busy (see ponder_async).
+        """
+        if (
+            self.alphazero_search is None
+            or self.game_state.current_algorithm != "AI_Mode"
+            or not self.game_state.is_game_running()
+        ):
+            return
+        self._ponder_stop = threading.Event()
+        self._ponder_task = asyncio.create_task(
+            self.move_calculator.ponder_async(
+                self.alphazero_search,
+                self.game_state.board.board.copy(),
+                self._ponder_stop,
+            )
+        )
+
+    def cancel_pondering(self):
+        """Signal the ponder thread to stop without waiting for it."""
+        self._ponder_stop.set()
+
+    async def stop_pondering(self):
+        """Stop pondering and wait until the search tree is free again."""
+        if self._ponder_task is None:
+            return
+        self._ponder_stop.set()
+        try:
+            await self._ponder_task
+        except Exception as e:
+            logger.error(f"Error while pondering: {e}")
+        self._ponder_task = None
+
     async def _check_winner(self, websocket):
-        winner = self.game_state.board.winner_check()
+        board = self.game_state.board
+        if board.last_move is not None:
+            winner = board.check_win_at(*board.last_move)
+        else:
+            winner = board.winner_check()
         if winner != 0:
             await websocket.send(
                 json.dumps(
@@ -101,3 +205,32 @@ class GameLoop:
                 )
             )
             self.game_state.end_game()
+
+
+class GameLoopFactory:
+    """
+    Creates GameLoops for the session registry. The move calculator (and its
+    loaded models) and the PLC connection are created once and shared by all
+    sessions.
+    """
+
+    def __init__(self, move_calculator: MoveCalculator = None):
+        """
+        Args:
+            move_calculator: Calculator to share, e.g. one whose engines are
+                warmed up in the background (created on first use if omitted).
+        """
+        self._move_calculator = move_calculator
+        self._plc_client = None
+
+    def __call__(self, game_state: GameState, digital_only: bool) -> GameLoop:
+        if self._move_calculator is None:
+            self._move_calculator = MoveCalculator()
+        if not digital_only and self._plc_client is None:
+            self._plc_client = _create_plc_client()
+        return GameLoop(
+            game_state,
+            move_calculator=self._move_calculator,
+            plc_client=self._plc_client,
+            digital_only=digital_only,
+        )
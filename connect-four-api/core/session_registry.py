@@ -0,0 +1,163 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+
+from core.constants import (
+    MAX_SESSIONS,
+    SESSION_EVICTION_INTERVAL,
+    SESSION_IDLE_TIMEOUT,
+)
+from core.game_state import GameState
+from core.logger import logger
+
+
+class SessionLimitError(Exception):
+    """Raised when a session cannot be created or cannot use the machine."""
+
+
+class Session:
+    def __init__(self, session_id: str, websocket=None):
+        self.session_id = session_id
+        self.websocket = websocket
+        self.game_state: GameState = GameState()
+        self.game_loop = None
+        self.digital_only: bool = True
+        self.last_active: float = time.monotonic()
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def close(self):
+        self.game_state.end_game()
+        if self.game_loop is not None:
+            self.game_loop.cancel_pondering()
+
+
+class SessionRegistry:
+    """
+    Holds one GameState/GameLoop per connection.
+
+    The number of concurrent sessions is capped and sessions without activity
+    for ``idle_timeout`` seconds are evicted. Any number of sessions can play
+    the digital-only path (no camera, no PLC), but only one session at a time
+    can play on the physical machine.
+    """
+
+    def __init__(
+        self,
+        loop_factory: Callable,
+        max_sessions: int = MAX_SESSIONS,
+        idle_timeout: float = SESSION_IDLE_TIMEOUT,
+        digital_only: bool = False,
+    ):
+        """
+        Args:
+            loop_factory: Callable (game_state, digital_only) -> GameLoop.
+            max_sessions: Maximum number of concurrent sessions.
+            idle_timeout: Seconds without activity after which a session is evicted.
+            digital_only: Force every session onto the digital-only path.
+        """
+        self.loop_factory = loop_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.digital_only = digital_only
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._machine_holder: str | None = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def create(self, websocket=None) -> Session:
+        """
+        Register a new session, evicting idle ones first if the registry is full.
+
+        Raises:
+            SessionLimitError: If the maximum number of sessions is reached.
+        """
+        if len(self._sessions) >= self.max_sessions:
+            self.evict_idle()
+        if len(self._sessions) >= self.max_sessions:
+            raise SessionLimitError(
+                "Too many active games. Please try again in a few minutes."
+            )
+
+        session = Session(uuid.uuid4().hex, websocket)
+        self._sessions[session.session_id] = session
+        logger.info(
+            f"Session {session.session_id} created ({len(self._sessions)} active)"
+        )
+        return session
+
+    def get(self, session_id: str) -> Session | None:
+        return self._sessions.get(session_id)
+
+    def remove(self, session_id: str):
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+        session.close()
+        if self._machine_holder == session_id:
+            self._machine_holder = None
+        logger.info(f"Session {session_id} removed ({len(self._sessions)} active)")
+
+    def prepare_game(self, session: Session, digital_only: bool = False):
+        """
+        Attach a GameLoop for the requested path to the session.
+
+        Raises:
+            SessionLimitError: If the physical machine is used by another session.
+        """
+        digital_only = digital_only or self.digital_only
+        if not digital_only:
+            holder = self._sessions.get(self._machine_holder)
+            if (
+                holder is not None
+                and holder is not session
+                and holder.game_state.is_game_running()
+            ):
+                raise SessionLimitError(
+                    "The machine is busy. Please play the digital mode instead."
+                )
+            self._machine_holder = session.session_id
+
+        if session.game_loop is None or session.digital_only != digital_only:
+            session.game_loop = self.loop_factory(session.game_state, digital_only)
+            session.digital_only = digital_only
+        session.touch()
+
+    def evict_idle(self, now: float | None = None) -> list[Session]:
+        """
+        Remove every session that was inactive for longer than ``idle_timeout``.
+
+        Returns:
+            The evicted sessions, so callers can close their connections.
+        """
+        now = time.monotonic() if now is None else now
+        evicted = [
+            session
+            for session in self._sessions.values()
+            if now - session.last_active > self.idle_timeout
+            # A running machine game does not receive messages while it waits
+            # for the camera, so it is never considered idle.
+            and (session.digital_only or not session.game_state.is_game_running())
+        ]
+        for session in evicted:
+            logger.info(f"Evicting idle session {session.session_id}")
+            self.remove(session.session_id)
+        return evicted
+
+
+async def evict_idle_sessions(
+    registry: SessionRegistry, interval: float = SESSION_EVICTION_INTERVAL
+):
+    """Background task: periodically evict idle sessions and close their sockets."""
+    while True:
+        await asyncio.sleep(interval)
+        for session in registry.evict_idle():
+            if session.websocket is not None:
+                await session.websocket.close()
@@ -1,3 +1,5 @@
+import asyncio
+
 import snap7
 import math
 import json
@@ -8,8 +10,8 @@ from core.logger import logger
 
 class PLCClient:
     def __init__(self):
+        # The TCP connection is opened on first use, not when the server starts
         self.plc = snap7.client.Client()
-        self.plc.connect(PLC_IP, PLC_RACK, PLC_SLOT)
         self.db_number = PLC_DB_NUMBER
         # This property is None because the value will get initialised when the JSON file called machine_config.json gets read successfully
         self.machine_config = None
@@ -26,6 +28,18 @@ class PLCClient:
         else:
             logger.error("Connection failed.")
 
+    def ensure_connected(self):
+        if not self.plc.get_connected():
+            self.connect()
+
+    async def connect_async(self):
+        """
+        Connect if needed without blocking the event loop; await this before
+        the (blocking) reads and writes of a game turn.
+        """
+        if not self.plc.get_connected():
+            await asyncio.to_thread(self.connect)
+
     def disconnect(self):
         self.plc.disconnect()
         logger.warning("Connection closed.")
@@ -49,6 +63,7 @@ class PLCClient:
         logger.info("Data successfully written.")
 
     def read_db1_data(self):
+        self.ensure_connected()
         data = self.plc.db_read(self.db_number, self.start, self.size)
         return data
 
@@ -60,6 +75,7 @@ class PLCClient:
         return x_achse, y_achse, stift_auf_ab, position_erreicht
 
     def write_db1_data(self, data):
+        self.ensure_connected()
         self.plc.db_write(self.db_number, self.start, data)
 
     def column_to_machine_coords(self, field_definition, is_cross):
@@ -2,25 +2,34 @@ import asyncio
 import os
 import websockets
 
-from core.constants import WEBSOCKET_HOST, WEBSOCKET_PORT
-from core.game_state import GameState
+from agents.move_calculator import MoveCalculator
+from core.constants import WARMUP_ENGINES, WEBSOCKET_HOST, WEBSOCKET_PORT
+from core.game_loop import GameLoopFactory
 from core.logger import logger
+from core.session_registry import SessionRegistry, evict_idle_sessions
 from api.websocket_handler import WebSocketHandler
 
-game_state = GameState()
-
 
 async def main():
     ws_host = os.getenv("WEBSOCKET_HOST", WEBSOCKET_HOST)
     ws_port = int(os.getenv("WEBSOCKET_PORT", WEBSOCKET_PORT))
 
-    websocket_handler = WebSocketHandler(game_state)
+    # Engines are loaded on first use; the server does not wait for them
+    move_calculator = MoveCalculator()
+    # DIGITAL_ONLY=1 runs every game without camera and PLC
+    registry = SessionRegistry(
+        GameLoopFactory(move_calculator),
+        digital_only=os.getenv("DIGITAL_ONLY", "0") == "1",
+    )
+    websocket_handler = WebSocketHandler(registry, move_calculator.engines)
+    eviction_task = asyncio.create_task(evict_idle_sessions(registry))
 
     server = await websockets.serve(
         websocket_handler.handle_connection, ws_host, ws_port
     )
 
     logger.info(f"WebSocket server started on ws://{ws_host}:{ws_port}")
+    warmup_task = asyncio.create_task(move_calculator.engines.warm_up(WARMUP_ENGINES))
 
     try:
         await server.wait_closed()
@@ -28,6 +37,9 @@ async def main():
         logger.info("\nShutting down server...")
         server.close()
         await server.wait_closed()
+    finally:
+        eviction_task.cancel()
+        warmup_task.cancel()
 
 
 def run():
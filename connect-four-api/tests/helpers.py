@@ -0,0 +1,42 @@
+"""
+Stand-ins for the engines and models, shared by several test modules.
+"""
+
+import numpy as np
+import torch
+from torch import nn
+
+from core.bitboard import BitBoard
+
+
+class UniformModel(nn.Module):
+    """
+    Stand-in for AlphaZeroModel: uniform policy and a neutral value.
+    """
+
+    def forward(self, x):
+        batch = x.shape[0]
+        return torch.zeros(batch, 7), torch.zeros(batch, 1)
+
+
+class CountingEngine:
+    """
+    Stand-in for both PyO3 engines: plays the leftmost open column and
+    counts its calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def _leftmost(self, p1, p2):
+        self.calls += 1
+        board = BitBoard()
+        board.masks = [0, p1, p2]
+        column = int(np.flatnonzero(board.to_array()[0] == 0)[0])
+        return chr(ord("A") + column)
+
+    def get_best_move_bitboard(self, p1, p2, depth):
+        return self._leftmost(p1, p2)
+
+    def get_best_move_mcts_bitboard(self, p1, p2, sims, expl_rate):
+        return self._leftmost(p1, p2)
@@ -0,0 +1,99 @@
+import numpy as np
+
+from agents.benchmark import (
+    BENCHMARK_POSITIONS,
+    append_history,
+    benchmark_engine,
+    format_report,
+    latency_summary,
+    load_history,
+    position_board,
+)
+from agents.engine_registry import EngineRegistry
+from agents.move_calculator import MoveCalculator
+from core.bitboard import BitBoard
+from tests.helpers import CountingEngine
+
+
+def test_corpus_positions_have_the_computer_to_move():
+    """
+    Every position is a legal, undecided position with player 2 to move.
+    """
+    for sequences in BENCHMARK_POSITIONS.values():
+        for moves in sequences:
+            board = BitBoard.from_array(position_board(moves))
+            assert board.moves % 2 == 1
+            assert board.winner() == 0
+            assert board.winning_columns(2) == []
+
+
+def test_latency_summary_percentiles():
+    summary = latency_summary([0.001] * 98 + [0.1, 0.2])
+
+    assert summary["p50_ms"] == 1.0
+    assert summary["p99_ms"] > summary["p95_ms"] >= 1.0
+    assert summary["max_ms"] == 200.0
+
+
+def test_every_call_reaches_the_engine():
+    """
+    Repeated positions are not answered by the move cache.
+    """
+    engine = CountingEngine()
+    calculator = MoveCalculator()
+    calculator.engines = EngineRegistry({"MiniMax": lambda: engine})
+    positions = {"opening": ["1", "401"], "endgame": ["613636604550641212611345441"]}
+
+    result = benchmark_engine(
+        "MiniMax",
+        3,
+        repeats=2,
+        concurrency=1,
+        positions=positions,
+        calculator=calculator,
+    )
+
+    # One warm-up call plus 3 positions * 2 repeats
+    assert engine.calls == 7
+    assert result["calls"] == 6
+    assert result["params"] == {"minimax_depth": 8}
+    assert set(result["phase_p50_ms"]) == {"opening", "endgame"}
+    assert result["positions_per_sec"] > 0
+    assert result["peak_rss_mb"] > 0
+
+
+def test_history_and_report(tmp_path):
+    """
+    Runs are appended to the history, and the report compares with the
+    previous run.
+    """
+    path = str(tmp_path / "history.jsonl")
+
+    def record(version, p50):
+        result = {
+            "engine": "MCTS",
+            "difficulty": 1,
+            **{f"{k}_ms": p50 for k in ("p50", "p95", "p99")},
+            "positions_per_sec": 1000 / p50,
+            "peak_rss_mb": 50.0,
+        }
+        return {"version": version, "host": {"cpu_count": 4}, "results": [result]}
+
+    append_history(record("abc", 100.0), path)
+    append_history(record("def", 150.0), path)
+    history = load_history(path)
+
+    assert [r["version"] for r in history] == ["abc", "def"]
+    report = format_report(history[1], history[0])
+    assert "+50% vs abc" in report
+    assert np.isclose(history[1]["results"][0]["p50_ms"], 150.0)
+
+
+def test_report_shows_engines_that_failed():
+    record = {
+        "version": "abc",
+        "host": {"cpu_count": 1},
+        "results": [{"engine": "MiniMax", "difficulty": 1, "error": "not installed"}],
+    }
+
+    assert "error: not installed" in format_report(record)
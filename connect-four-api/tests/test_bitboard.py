@@ -0,0 +1,205 @@
+import numpy as np
+import pytest
+
+from core.bitboard import BitBoard, cell_bit, has_four
+from core.constants import COLUMNS, ROWS
+
+
+@pytest.fixture
+def bitboard():
+    """
+    Returns a fresh, empty BitBoard.
+    """
+    return BitBoard()
+
+
+def test_bitboard_initialization(bitboard):
+    """
+    A new bitboard is empty and every column is playable.
+    """
+    assert bitboard.moves == 0
+    assert bitboard.valid_columns() == list(range(COLUMNS))
+    np.testing.assert_array_equal(bitboard.to_array(), np.zeros((ROWS, COLUMNS)))
+
+
+def test_drop_returns_landing_row(bitboard):
+    """
+    Coins stack from the bottom row (ROWS - 1) upwards.
+    """
+    assert bitboard.drop(3, 1) == ROWS - 1
+    assert bitboard.drop(3, 2) == ROWS - 2
+    assert bitboard.next_open_row(3) == ROWS - 3
+
+
+def test_full_column_is_not_playable(bitboard):
+    """
+    After ROWS coins a column reports no open row and is no valid action.
+    """
+    for i in range(ROWS):
+        bitboard.drop(0, 1 + i % 2)
+    assert not bitboard.can_play(0)
+    assert bitboard.next_open_row(0) is None
+    assert 0 not in bitboard.valid_columns()
+
+
+def test_array_roundtrip():
+    """
+    Converting an ndarray to a bitboard and back yields the same board.
+    """
+    board = np.zeros((ROWS, COLUMNS), dtype=int)
+    board[5] = [1, 2, 1, 2, 2, 1, 1]
+    board[4, 0] = 2
+    board[4, 3] = 1
+    board[3, 3] = 2
+
+    bitboard = BitBoard.from_array(board)
+
+    np.testing.assert_array_equal(bitboard.to_array(), board)
+    assert bitboard.moves == 10
+    assert bitboard.next_open_row(3) == 2
+    assert bitboard.next_open_row(6) == 4
+
+
+def test_to_array_returns_copy(bitboard):
+    """
+    Writing to the ndarray view must not change the bitboard.
+    """
+    view = bitboard.to_array()
+    view[0, 0] = 1
+    assert bitboard.masks[1] == 0
+
+
+def test_floating_coin_is_rejected():
+    """
+    A coin above an empty cell has no valid column height.
+    """
+    board = np.zeros((ROWS, COLUMNS), dtype=int)
+    board[ROWS - 2, 2] = 1
+
+    with pytest.raises(ValueError):
+        BitBoard.from_array(board)
+
+
+@pytest.mark.parametrize(
+    "cells",
+    [
+        [(5, 0), (5, 1), (5, 2), (5, 3)],  # horizontal
+        [(5, 6), (4, 6), (3, 6), (2, 6)],  # vertical
+        [(2, 0), (3, 1), (4, 2), (5, 3)],  # diagonal TL-BR
+        [(5, 3), (4, 4), (3, 5), (2, 6)],  # diagonal BL-TR
+    ],
+)
+def test_has_four_detects_lines(cells):
+    """
+    Four aligned coins are detected in every direction.
+    """
+    mask = sum(1 << cell_bit(r, c) for r, c in cells)
+    assert has_four(mask)
+
+
+@pytest.mark.parametrize(
+    "cells",
+    [
+        [(2, 0), (3, 0), (4, 0), (5, 1)],  # vertical wrapping into next column
+        [(5, 4), (5, 5), (5, 6), (4, 0)],  # horizontal wrapping around the edge
+        [(5, 0), (5, 1), (5, 2), (4, 3)],
+    ],
+)
+def test_has_four_ignores_broken_lines(cells):
+    """
+    Lines must not wrap across column boundaries.
+    """
+    mask = sum(1 << cell_bit(r, c) for r, c in cells)
+    assert not has_four(mask)
+
+
+def test_winner_and_full_board(bitboard):
+    """
+    A board filled without four in a row is full and has no winner.
+    """
+    # Rows (bottom to top) alternate between the two patterns in pairs
+    pattern_a = [1, 2, 1, 2, 1, 2, 1]
+    pattern_b = [2, 1, 2, 1, 2, 1, 2]
+    for row in range(ROWS):
+        pattern = pattern_a if (row // 2) % 2 == 0 else pattern_b
+        for col in range(COLUMNS):
+            bitboard.drop(col, pattern[col])
+
+    assert bitboard.is_full()
+    assert bitboard.valid_columns() == []
+    assert bitboard.winner() == 0
+
+
+def test_copy_is_independent(bitboard):
+    """
+    Drops on a copy do not affect the original.
+    """
+    bitboard.drop(2, 1)
+    clone = bitboard.copy()
+    clone.drop(2, 2)
+    assert bitboard.moves == 1
+    assert clone.moves == 2
+    assert bitboard.masks[2] == 0
+
+
+def test_check_win_at_matches_full_scan():
+    """
+    During random games, the last-move check agrees with the full scan.
+    """
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        bitboard = BitBoard()
+        player = 1
+        while True:
+            col = int(rng.choice(bitboard.valid_columns()))
+            row = bitboard.drop(col, player)
+            winner = bitboard.check_win_at(row, col)
+            assert winner == bitboard.winner()
+            if winner or bitboard.is_full():
+                break
+            player = 3 - player
+
+
+def test_check_win_at_empty_cell(bitboard):
+    """
+    An empty cell never completes a line.
+    """
+    assert bitboard.check_win_at(ROWS - 1, 0) == 0
+
+
+def test_hash_is_incremental_and_order_independent():
+    """
+    The same position reached by different move orders has the same hash,
+    and the incremental hash equals the one computed from the array.
+    """
+    first = BitBoard()
+    for col, player in [(3, 1), (2, 2), (4, 1), (3, 2)]:
+        first.drop(col, player)
+    second = BitBoard()
+    for col, player in [(4, 1), (3, 2), (3, 1), (2, 2)]:
+        second.drop(col, player)
+
+    assert first.hash != second.hash  # (3, 1)/(3, 2) stacked differently
+    third = BitBoard()
+    for col, player in [(4, 1), (2, 2), (3, 1), (3, 2)]:
+        third.drop(col, player)
+
+    assert first.hash == third.hash
+    assert first.hash == BitBoard.from_array(first.to_array()).hash
+    assert first.hash != BitBoard().hash
+
+
+def test_canonical_hash_folds_mirror_images():
+    """
+    A position and its left-right mirror image share the canonical hash.
+    """
+    board = BitBoard()
+    mirrored = BitBoard()
+    for col, player in [(0, 1), (1, 2), (1, 1), (5, 2)]:
+        board.drop(col, player)
+        mirrored.drop(COLUMNS - 1 - col, player)
+
+    assert board.hash != mirrored.hash
+    assert board.hash == mirrored.mirror_hash
+    assert board.canonical_hash == mirrored.canonical_hash
+    assert board.is_mirrored != mirrored.is_mirrored
@@ -27,7 +27,8 @@ def test_board_reset(board_instance):
     Test that reset() clears the board to all zeros.
     """
     # Place a coin
-    board_instance.board[0, 0] = 1
+    board_instance.add_pos_to_board("A", player=1)
+    assert np.count_nonzero(board_instance.board) == 1
     board_instance.reset()
     assert np.count_nonzero(board_instance.board) == 0, (
         "Board should be cleared after reset."
@@ -180,3 +181,53 @@ def test_winner_check_diagonal_bottom_left_to_top_right(board_instance):
     assert board_instance.winner_check() == 2, (
         "Player 2 should have a diagonal BL-TR win."
     )
+
+
+def test_add_pos_to_board_records_last_move(board_instance):
+    """
+    The landing cell of the last coin is available as (row, column).
+    """
+    board_instance.add_pos_to_board("C", 1)
+    assert board_instance.last_move == (ROWS - 1, 2)
+    board_instance.add_pos_to_board("C", 2)
+    assert board_instance.last_move == (ROWS - 2, 2)
+
+
+def test_check_win_at_last_move(board_instance):
+    """
+    check_win_at only reports a winner for lines through the given cell.
+    """
+    for col in ["A", "B", "C"]:
+        board_instance.add_pos_to_board(col, 1)
+    assert board_instance.check_win_at(*board_instance.last_move) == 0
+
+    board_instance.add_pos_to_board("G", 2)
+    board_instance.add_pos_to_board("D", 1)
+    assert board_instance.check_win_at(*board_instance.last_move) == 1
+    # The coin in column G is not part of the winning line
+    assert board_instance.check_win_at(ROWS - 1, 6) == 0
+
+
+def test_position_hash_usable_as_key(board_instance):
+    """
+    Equal positions have equal hashes; reset returns to the empty hash.
+    """
+    empty_hash = board_instance.position_hash
+    board_instance.add_pos_to_board("A", 1)
+    other = Board()
+    other.add_pos_to_board("G", 1)
+
+    assert board_instance.position_hash != empty_hash
+    assert board_instance.position_hash != other.position_hash
+    assert board_instance.canonical_hash == other.canonical_hash
+
+    board_instance.reset()
+    assert board_instance.position_hash == empty_hash
+
+
+def test_board_view_is_read_only(board_instance):
+    """
+    Writing to the board array raises instead of being silently lost.
+    """
+    with pytest.raises(ValueError):
+        board_instance.board[ROWS - 1, 0] = 1
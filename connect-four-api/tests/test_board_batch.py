@@ -0,0 +1,82 @@
+import numpy as np
+
+from core.bitboard import BitBoard
+from core.board_batch import (
+    WIN_LINE_MASKS,
+    batch_terminal_status,
+    batch_terminal_status_from_arrays,
+    boards_to_bitboards,
+    stack_bitboards,
+)
+from core.constants import COLUMNS, ROWS
+
+
+def _random_positions(count, seed=0):
+    """
+    Play random games and collect every intermediate position.
+    """
+    rng = np.random.default_rng(seed)
+    positions = []
+    while len(positions) < count:
+        bitboard = BitBoard()
+        player = 1
+        while len(positions) < count:
+            col = int(rng.choice(bitboard.valid_columns()))
+            bitboard.drop(col, player)
+            positions.append(bitboard.copy())
+            if bitboard.winner() or bitboard.is_full():
+                break
+            player = 3 - player
+    return positions
+
+
+def test_win_line_table_has_69_lines():
+    """
+    There are 24 horizontal, 21 vertical and 2 * 12 diagonal lines.
+    """
+    assert len(WIN_LINE_MASKS) == 69
+    assert len(set(WIN_LINE_MASKS.tolist())) == 69
+
+
+def test_boards_to_bitboards_matches_bitboard():
+    """
+    The vectorized conversion yields the same masks as BitBoard.
+    """
+    positions = _random_positions(50)
+    boards = np.stack([p.to_array() for p in positions])
+
+    p1, p2 = boards_to_bitboards(boards)
+
+    assert p1.tolist() == [p.masks[1] for p in positions]
+    assert p2.tolist() == [p.masks[2] for p in positions]
+
+
+def test_batch_status_matches_single_board_checks():
+    """
+    The vectorized result agrees with the per-board checks for every position.
+    """
+    positions = _random_positions(500)
+
+    winner, draw, legal = batch_terminal_status(*stack_bitboards(positions))
+
+    for i, position in enumerate(positions):
+        assert winner[i] == position.winner()
+        assert draw[i] == (position.is_full() and position.winner() == 0)
+        assert legal[i].tolist() == [position.can_play(c) for c in range(COLUMNS)]
+
+
+def test_batch_status_from_arrays_detects_draw():
+    """
+    A full board without a line is a draw with no legal moves left.
+    """
+    row_a = [1, 2, 1, 2, 1, 2, 1]
+    row_b = [2, 1, 2, 1, 2, 1, 2]
+    board = np.array([row_a, row_a, row_b, row_b, row_a, row_a])
+    boards = np.stack([board, np.zeros((ROWS, COLUMNS), dtype=int)])
+
+    winner, draw, legal = batch_terminal_status_from_arrays(boards)
+
+    assert winner.tolist() == [0, 0]
+    assert draw.tolist() == [True, False]
+    assert not legal[0].any()
+    assert legal[1].all()
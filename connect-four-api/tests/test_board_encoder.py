@@ -0,0 +1,76 @@
+import numpy as np
+
+from agents.alphazero.board_encoder import BoardEncoder
+from agents.alphazero.helpers import board_to_channels
+from core.bitboard import BitBoard
+
+
+def _random_bitboards(count, seed=0):
+    """
+    Play random games and collect every intermediate position.
+    """
+    rng = np.random.default_rng(seed)
+    positions = []
+    while len(positions) < count:
+        bitboard = BitBoard()
+        player = 1
+        while len(positions) < count and not bitboard.is_full():
+            bitboard.drop(int(rng.choice(bitboard.valid_columns())), player)
+            positions.append(bitboard.copy())
+            player = 3 - player
+    return positions
+
+
+def test_encode_matches_board_to_channels():
+    """
+    The batch path gives the same channels as encoding one board at a time.
+    """
+    boards = np.stack([b.to_array() for b in _random_bitboards(50)])
+
+    encoded = BoardEncoder(8).encode(boards)
+
+    expected = np.stack([board_to_channels(board) for board in boards])
+    assert encoded.shape == (50, 3, 6, 7)
+    np.testing.assert_array_equal(encoded.numpy(), expected)
+
+
+def test_encode_bitboards_matches_arrays():
+    """
+    Encoding from the player masks equals encoding the 6x7 arrays.
+    """
+    bitboards = _random_bitboards(50, seed=1)
+    encoder = BoardEncoder(64)
+
+    from_masks = encoder.encode_bitboards(bitboards).numpy().copy()
+    from_arrays = encoder.encode(np.stack([b.to_array() for b in bitboards]))
+
+    np.testing.assert_array_equal(from_masks, from_arrays.numpy())
+
+
+def test_buffer_is_reused_and_grown():
+    """
+    Batches that fit are written into the same memory; larger ones grow it.
+    """
+    encoder = BoardEncoder(4)
+    bitboards = _random_bitboards(10, seed=2)
+
+    first = encoder.encode_bitboards(bitboards[:4])
+    second = encoder.encode_bitboards(bitboards[4:6])
+    assert second.data_ptr() == first.data_ptr()
+
+    encoder.encode_bitboards(bitboards)
+    assert encoder.capacity >= 10
+
+
+def test_single_board():
+    """
+    A (6, 7) board is encoded as a batch of one.
+    """
+    board = np.zeros((6, 7), dtype=int)
+    board[5, 3] = 1
+
+    encoded = BoardEncoder().encode(board)
+
+    assert encoded.shape == (1, 3, 6, 7)
+    assert encoded[0, 0, 5, 3] == 1
+    assert encoded[0, 2].sum() == 41
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from agents.alphazero.connect_four_environment import ConnectFourEnvironment
+from agents.alphazero.mcts import MCTS
+from agents.engine_pool import EnginePool
+from agents.engine_registry import EngineRegistry
+from agents.move_calculator import MoveCalculator
+from tests.helpers import UniformModel
+
+
+class SlowEngine:
+    """
+    Blocking stand-in for a PyO3 engine that records how many calls overlap.
+    """
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def get_best_move_bitboard(self, p1, p2, depth):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return "D"
+
+
+@pytest.fixture
+def calculator():
+    calculator = MoveCalculator()
+    calculator.engines = EngineRegistry({"MiniMax": SlowEngine})
+    calculator.engine_pool = EnginePool(max_workers=2)
+    yield calculator
+    calculator.engine_pool.shutdown()
+
+
+def test_event_loop_runs_during_search(calculator):
+    """
+    Other coroutines keep running while a move is computed.
+    """
+    board = np.zeros((6, 7), dtype=int)
+
+    async def run():
+        ticks = 0
+        move = asyncio.create_task(
+            calculator.get_best_move_async(board, "MiniMax", 8, 0)
+        )
+        while not move.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return await move, ticks
+
+    move, ticks = asyncio.run(run())
+
+    assert move == "D"
+    assert ticks > 5
+
+
+def test_concurrency_limit(calculator):
+    """
+    No more than max_workers moves are computed at once; the rest wait.
+    """
+    board = np.zeros((6, 7), dtype=int)
+
+    async def run():
+        return await asyncio.gather(
+            *[calculator.get_best_move_async(board, "MiniMax", 8, 0) for _ in range(5)]
+        )
+
+    assert asyncio.run(run()) == ["D"] * 5
+    assert calculator.engines.get("MiniMax").max_running == 2
+
+
+def test_cancelled_call_is_dropped_from_the_queue():
+    """
+    A call cancelled while it waits for a worker never runs.
+    """
+    pool = EnginePool(max_workers=1)
+    calls = []
+
+    async def run():
+        first = asyncio.create_task(pool.run(time.sleep, 0.2))
+        second = asyncio.create_task(pool.run(calls.append, "second"))
+        await asyncio.sleep(0.05)
+        second.cancel()
+        await first
+        await asyncio.sleep(0.05)
+        return second.cancelled()
+
+    assert asyncio.run(run())
+    assert calls == []
+    pool.shutdown()
+
+
+def test_cancelling_stops_alphazero_search():
+    """
+    Cancelling the move ends the AlphaZero search instead of letting it run
+    for its whole time budget.
+    """
+    calculator = MoveCalculator()
+    calculator.engine_pool = EnginePool(max_workers=1)
+    env = ConnectFourEnvironment()
+    mcts = MCTS(env, UniformModel(), n_simulations=None, time_budget=30)
+
+    async def run():
+        move = asyncio.create_task(
+            calculator.get_best_move_async(env.get_state(), "AI_Mode", 0, 0, mcts=mcts)
+        )
+        await asyncio.sleep(0.2)
+        move.cancel()
+        start = time.perf_counter()
+        # The only worker is free again once the search has stopped
+        await calculator.engine_pool.run(lambda: None)
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) < 5
+    assert mcts.stats.simulations > 0
+    calculator.engine_pool.shutdown()
+
+
+def test_pondering_is_skipped_while_moves_wait():
+    """
+    No game starts pondering while moves wait for an engine worker.
+    """
+    calculator = MoveCalculator()
+    calculator.engine_pool = EnginePool(max_workers=1)
+    env = ConnectFourEnvironment()
+    mcts = MCTS(env, UniformModel(), n_simulations=None)
+
+    async def run():
+        moves = [
+            asyncio.create_task(calculator.engine_pool.run(time.sleep, 0.2))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        pondered = await calculator.ponder_async(
+            mcts, env.get_state(), threading.Event()
+        )
+        await asyncio.gather(*moves)
+        return pondered
+
+    assert asyncio.run(run()) is False
+    assert mcts.pool.size == 0
+    calculator.engine_pool.shutdown()
+
+
+def test_waiting_move_stops_pondering():
+    """
+    A move that has to wait for a worker ends the running ponder searches,
+    and only ALPHAZERO_PONDER_SESSIONS games ponder at a time.
+    """
+    calculator = MoveCalculator()
+    calculator.engines = EngineRegistry({"MiniMax": SlowEngine})
+    calculator.engine_pool = EnginePool(max_workers=1)
+    calculator.ponder_pool = EnginePool(max_workers=1, name="ponder")
+    env = ConnectFourEnvironment()
+    board = np.zeros((6, 7), dtype=int)
+
+    async def run():
+        stop = threading.Event()
+        ponder = asyncio.create_task(
+            calculator.ponder_async(
+                MCTS(env, UniformModel(), n_simulations=None), env.get_state(), stop
+            )
+        )
+        await asyncio.sleep(0.1)
+        second = await calculator.ponder_async(
+            MCTS(env, UniformModel(), n_simulations=None),
+            env.get_state(),
+            threading.Event(),
+        )
+        await asyncio.gather(
+            calculator.get_best_move_async(board, "MiniMax", 8, 0),
+            calculator.get_best_move_async(board, "MiniMax", 6, 0),
+        )
+        return second, stop.is_set(), await asyncio.wait_for(ponder, 5)
+
+    assert asyncio.run(run()) == (False, True, True)
+    calculator.engine_pool.shutdown()
+    calculator.ponder_pool.shutdown()
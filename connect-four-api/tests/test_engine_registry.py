@@ -0,0 +1,118 @@
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from agents.engine_registry import EngineRegistry
+
+
+class SlowLoader:
+    """
+    Loader that takes a while and counts how often it ran.
+    """
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("cannot load")
+        return f"engine {self.calls}"
+
+
+def test_engines_load_on_first_use():
+    """
+    Nothing is loaded until an engine is requested, and then only that one.
+    """
+    minimax, alphazero = SlowLoader(), SlowLoader()
+    engines = EngineRegistry({"MiniMax": minimax, "AI_Mode": alphazero})
+
+    assert engines.status() == {"MiniMax": "idle", "AI_Mode": "idle"}
+    assert engines.get("MiniMax") == "engine 1"
+    assert engines.get("MiniMax") == "engine 1"
+
+    assert minimax.calls == 1
+    assert alphazero.calls == 0
+    assert engines.status() == {"MiniMax": "ready", "AI_Mode": "idle"}
+
+
+def test_concurrent_requests_load_once():
+    """
+    Threads asking for an engine that is being loaded wait for that load.
+    """
+    loader = SlowLoader(delay=0.1)
+    engines = EngineRegistry({"MCTS": loader})
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(engines.get("MCTS")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loader.calls == 1
+    assert results == ["engine 1"] * 4
+
+
+def test_failed_load_is_retried():
+    """
+    A failing engine is reported as failed and loaded again on the next request.
+    """
+    loader = SlowLoader(delay=0, fail=True)
+    engines = EngineRegistry({"MCTS": loader})
+
+    with pytest.raises(RuntimeError):
+        engines.get("MCTS")
+    assert engines.status()["MCTS"] == "failed"
+
+    loader.fail = False
+    assert engines.get("MCTS") == "engine 2"
+    assert engines.is_ready("MCTS")
+
+
+def test_warm_up_does_not_block_the_event_loop():
+    """
+    Warm-up loads engines in a thread while other tasks keep running, and
+    skips over engines that fail.
+    """
+    broken, alphazero = SlowLoader(fail=True), SlowLoader(delay=0.2)
+    engines = EngineRegistry({"MiniMax": broken, "AI_Mode": alphazero})
+
+    async def run():
+        ticks = 0
+        warm_up = asyncio.create_task(engines.warm_up())
+        while not warm_up.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return ticks
+
+    assert asyncio.run(run()) > 5
+    assert engines.status() == {"MiniMax": "failed", "AI_Mode": "ready"}
+
+
+def test_move_calculator_does_not_import_torch():
+    """
+    Creating the move calculator (as the server does at startup) leaves
+    torch and the PyO3 engines unloaded.
+    """
+    code = (
+        "import sys\n"
+        "from agents.move_calculator import MoveCalculator\n"
+        "MoveCalculator()\n"
+        "print('torch' in sys.modules, 'minimax_algorithm' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.split() == ["False", "False"]
@@ -0,0 +1,79 @@
+import numpy as np
+
+from agents.alphazero.connect_four_environment import ConnectFourEnvironment
+from agents.alphazero.evaluation_cache import EvaluationCache
+from agents.alphazero.mcts import MCTS
+from core.bitboard import BitBoard
+from tests.helpers import UniformModel
+
+
+def _board(moves):
+    board = BitBoard()
+    player = 1
+    for col in moves:
+        board.drop(col, player)
+        player = 3 - player
+    return board
+
+
+def test_get_returns_stored_evaluation():
+    cache = EvaluationCache()
+    board = _board([3, 2])
+    policy = np.arange(7, dtype=np.float32)
+
+    assert cache.get(board) is None
+    cache.put(board, policy, 0.5)
+    cached_policy, value = cache.get(board)
+
+    assert cached_policy.tolist() == policy.tolist()
+    assert value == 0.5
+    assert cache.hits == 1 and cache.misses == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_mirrored_position_gets_flipped_policy():
+    """
+    A position and its mirror image share one entry; the policy is mirrored.
+    """
+    cache = EvaluationCache()
+    policy = np.arange(7, dtype=np.float32)
+    cache.put(_board([0, 1]), policy, -0.25)
+
+    cached_policy, value = cache.get(_board([6, 5]))
+
+    assert len(cache) == 1
+    assert cached_policy.tolist() == policy[::-1].tolist()
+    assert value == -0.25
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EvaluationCache(capacity=2)
+    a, b, c = _board([0]), _board([1]), _board([2])
+    policy = np.zeros(7)
+    cache.put(a, policy, 0)
+    cache.put(b, policy, 0)
+    cache.get(a)
+    cache.put(c, policy, 0)
+
+    assert len(cache) == 2
+    assert cache.get(b) is None
+    assert cache.get(a) is not None
+    assert cache.nbytes > 0
+
+
+def test_shared_cache_saves_forward_passes():
+    """
+    A second search over the same position is answered from the cache.
+    """
+    cache = EvaluationCache()
+    env = ConnectFourEnvironment()
+    MCTS(env, UniformModel(), n_simulations=100, cache=cache).search(
+        env.get_state(), env.current_player
+    )
+
+    mcts = MCTS(env, UniformModel(), n_simulations=100, cache=cache)
+    mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.stats.cache_hits > 0
+    assert mcts.stats.nn_calls < 100
+    assert cache.hit_rate > 0
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from agents.engine_registry import EngineRegistry
+from agents.move_calculator import MoveCalculator
+from core.game_loop import GameLoop
+from core.game_state import GameState
+from tests.helpers import CountingEngine
+
+
+class FakePLCClient:
+    """
+    Stand-in for PLCClient that records the thread it connects from and the
+    coordinates it sends.
+    """
+
+    def __init__(self):
+        self.connected_from = None
+        self.moves = []
+
+    async def connect_async(self):
+        def connect():
+            self.connected_from = threading.get_ident()
+
+        await asyncio.to_thread(connect)
+
+    def column_to_machine_coords(self, field_definition, is_cross):
+        assert self.connected_from is not None, "coordinates sent before connecting"
+        self.moves.append(field_definition)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, message):
+        self.messages.append(message)
+
+
+def test_plc_connects_off_the_event_loop():
+    """
+    The first machine move connects the PLC in a worker thread, not on the
+    event loop shared by all sessions.
+    """
+    calculator = MoveCalculator()
+    calculator.engines = EngineRegistry({"MiniMax": CountingEngine})
+    plc_client = FakePLCClient()
+    game_state = GameState()
+    game_state.start_game("MiniMax", {"minimax_depth": 4})
+    game_loop = GameLoop(game_state, calculator, plc_client=plc_client)
+
+    async def run():
+        await game_loop._handle_ai_move(FakeWebSocket())
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert plc_client.moves == ["A"]
+    assert plc_client.connected_from != loop_thread
+    calculator.engine_pool.shutdown()
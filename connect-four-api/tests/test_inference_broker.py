@@ -0,0 +1,159 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+import torch
+from torch import nn
+
+from agents.alphazero.connect_four_environment import ConnectFourEnvironment
+from agents.alphazero.inference_broker import InferenceBroker
+from agents.alphazero.mcts import MCTS
+from agents.alphazero.training.selfplay import generate_selfplay_data
+
+
+class CountingModel(nn.Module):
+    """
+    Policy logits are the number of player 1 coins per column; the value is
+    the number of empty cells / 42. Records the batch size of every call.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def forward(self, x):
+        self.batch_sizes.append(x.shape[0])
+        policy = x[:, 0].sum(dim=1)
+        value = x[:, 2].sum(dim=(1, 2)).unsqueeze(1) / 42
+        return policy, value
+
+
+def _positions(n, seed=0):
+    rng = np.random.default_rng(seed)
+    boards = rng.integers(0, 3, size=(n, 6, 7))
+    return np.stack([(boards == 1), (boards == 2), (boards == 0)], axis=1).astype(
+        np.float32
+    )
+
+
+@pytest.fixture
+def broker():
+    broker = InferenceBroker(CountingModel(), max_batch_size=16, max_wait=0.05)
+    yield broker
+    broker.close()
+
+
+def test_results_are_routed_to_their_requests(broker):
+    """
+    Concurrent requests are batched together and every caller gets its own rows.
+    """
+    requests = [_positions(3, seed=i) for i in range(4)]
+    results = [None] * 4
+
+    def submit(i):
+        results[i] = broker.evaluate(requests[i])
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for channels, (policy, value) in zip(requests, results, strict=True):
+        expected = torch.softmax(torch.from_numpy(channels[:, 0].sum(axis=1)), dim=1)
+        assert np.allclose(policy, expected.numpy(), atol=1e-6)
+        assert np.allclose(value, channels[:, 2].sum(axis=(1, 2)) / 42)
+    assert broker.positions == 12
+    assert broker.batches < 4
+
+
+def test_batch_size_is_capped(broker):
+    futures = [broker.submit(_positions(6, seed=i)) for i in range(5)]
+    for future in futures:
+        future.result()
+
+    assert max(broker.model.batch_sizes) <= 16
+
+
+def test_evaluate_async(broker):
+    async def evaluate():
+        return await asyncio.gather(
+            broker.evaluate_async(_positions(2)),
+            broker.evaluate_async(_positions(5)),
+        )
+
+    (policy_a, _), (policy_b, value_b) = asyncio.run(evaluate())
+
+    assert policy_a.shape == (2, 7)
+    assert policy_b.shape == (5, 7)
+    assert value_b.shape == (5,)
+
+
+def test_cancelled_request_does_not_stop_the_broker(broker):
+    """
+    A request cancelled while it waits for its batch is dropped, and later
+    requests are still served.
+    """
+
+    async def evaluate():
+        cancelled = asyncio.create_task(broker.evaluate_async(_positions(2)))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        result = await asyncio.wait_for(broker.evaluate_async(_positions(3)), 5)
+        return cancelled.cancelled(), result
+
+    cancelled, (policy, _) = asyncio.run(evaluate())
+
+    assert cancelled
+    assert policy.shape == (3, 7)
+    assert broker.evaluate(_positions(1))[0].shape == (1, 7)
+    assert broker.positions == 4
+
+
+def test_model_errors_reach_the_caller():
+    class BrokenModel(nn.Module):
+        def forward(self, x):
+            raise ValueError("broken")
+
+    broker = InferenceBroker(BrokenModel(), max_wait=0)
+    with pytest.raises(ValueError):
+        broker.evaluate(_positions(1))
+    broker.close()
+    with pytest.raises(RuntimeError):
+        broker.submit(_positions(1))
+
+
+def test_concurrent_searches_share_forward_passes():
+    """
+    Several searches using one broker need fewer forward passes than positions.
+    """
+    model = CountingModel()
+    broker = InferenceBroker(model, max_batch_size=64, max_wait=0.01)
+    searches = []
+
+    def search():
+        env = ConnectFourEnvironment()
+        mcts = MCTS(env, model, n_simulations=40, batch_size=4, broker=broker)
+        mcts.search(env.get_state(), env.current_player)
+        searches.append(mcts)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    broker.close()
+
+    assert len(searches) == 4
+    assert all(m.stats.simulations == 40 for m in searches)
+    assert broker.batches < broker.positions
+    assert broker.mean_batch_size > 4
+
+
+def test_parallel_selfplay():
+    data = generate_selfplay_data(
+        CountingModel(), n_games=3, n_simulations=8, n_workers=3
+    )
+
+    assert len(data) >= 3 * 7
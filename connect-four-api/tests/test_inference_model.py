@@ -0,0 +1,70 @@
+import pytest
+import torch
+
+from agents.alphazero.alphazero_model import AlphaZeroModel
+from agents.alphazero.connect_four_environment import ConnectFourEnvironment
+from agents.alphazero.inference_model import (
+    FusedAlphaZeroModel,
+    export_inference_model,
+    freeze_for_inference,
+    load_inference_model,
+)
+from agents.alphazero.mcts import MCTS
+
+
+@pytest.fixture
+def model():
+    """
+    A model with non-trivial batch-norm statistics.
+    """
+    torch.manual_seed(0)
+    model = AlphaZeroModel()
+    model.train()
+    with torch.no_grad():
+        for _ in range(3):
+            model(torch.rand(16, 3, 6, 7))
+    return model.eval()
+
+
+def _outputs_match(model, other):
+    x = torch.rand(5, 3, 6, 7)
+    with torch.no_grad():
+        policy, value = model(x)
+        other_policy, other_value = other(x)
+    return torch.allclose(policy, other_policy, atol=1e-5) and torch.allclose(
+        value, other_value, atol=1e-5
+    )
+
+
+def test_fused_model_matches_eager(model):
+    assert _outputs_match(model, FusedAlphaZeroModel(model))
+
+
+def test_frozen_model_matches_eager(model):
+    assert _outputs_match(model, freeze_for_inference(model))
+
+
+def test_export_and_load(model, tmp_path):
+    path = tmp_path / "model.ts"
+    export_inference_model(model, str(path))
+
+    loaded = load_inference_model(str(path), "missing.pt")
+
+    assert _outputs_match(model, loaded)
+
+
+def test_load_falls_back_to_state_dict(model, tmp_path):
+    state_dict_path = tmp_path / "model.pt"
+    torch.save(model.state_dict(), state_dict_path)
+
+    loaded = load_inference_model(str(tmp_path / "missing.ts"), str(state_dict_path))
+
+    assert _outputs_match(model, loaded)
+
+
+def test_mcts_accepts_frozen_model(model):
+    env = ConnectFourEnvironment()
+    mcts = MCTS(env, freeze_for_inference(model), n_simulations=20)
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert sum(visits.values()) == 19
@@ -0,0 +1,402 @@
+import threading
+
+import numpy as np
+import pytest
+
+from agents.alphazero.connect_four_environment import ConnectFourEnvironment
+from agents.alphazero.mcts import MCTS
+from agents.alphazero.node_pool import NodePool
+from tests.helpers import UniformModel
+
+
+@pytest.fixture
+def env():
+    return ConnectFourEnvironment()
+
+
+@pytest.mark.parametrize("batch_size", [1, 8])
+def test_search_returns_visits_for_valid_actions(env, batch_size):
+    """
+    Visit counts cover the valid actions and add up to the simulations run.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=64, batch_size=batch_size)
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert sorted(visits) == list(range(7))
+    # The first simulation only expands the root
+    assert sum(visits.values()) == 63
+    assert mcts.stats.simulations == 64
+
+
+def test_batched_search_uses_fewer_forward_passes(env):
+    """
+    Leaves are evaluated in batches, so the model is called far less often.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=64, batch_size=8)
+    mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.stats.nn_calls <= 1 + 63 // 8 + 1
+    assert max(mcts.stats.batch_sizes) > 1
+
+
+def test_search_finds_immediate_win(env):
+    """
+    With three coins in a row the search prefers the winning column.
+    """
+    for col in [0, 6, 1, 6, 2, 5]:
+        env.step(col)
+    mcts = MCTS(env, UniformModel(), n_simulations=200, add_root_noise=False)
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert max(visits, key=visits.get) == 3
+
+
+def test_children_are_created_on_first_selection(env):
+    """
+    Expanding the root creates no children; selected children hold exactly
+    one coin more than the root.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=1)
+    mcts.search(env.get_state(), env.current_player)
+    assert mcts.pool.size == 1
+
+    mcts.n_simulations = 8
+    mcts.search(env.get_state(), env.current_player)
+
+    pool = mcts.pool
+    children = [c for c in pool.children[mcts.root] if c >= 0]
+    assert 0 < len(children) <= 7
+    for child in children:
+        action = int(pool.action[child])
+        state = mcts.node_board(child).to_array()
+        assert np.count_nonzero(state) == 1
+        assert state[5, action] == 1
+        assert pool.player[child] == 2
+
+
+def test_node_pool_grows(env):
+    """
+    The node arrays grow beyond their initial capacity.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=400)
+    mcts.pool = NodePool(capacity=8)
+    mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.pool.size > 8
+    assert mcts.pool.capacity >= mcts.pool.size
+    assert mcts.stats.nodes == mcts.pool.size
+
+
+def test_subtree_is_reused_after_two_plies(env):
+    """
+    After our move and the opponent's reply the search continues from the
+    matching grandchild and keeps its visits; the rest of the tree is freed.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=400, add_root_noise=False)
+    visits = mcts.search(env.get_state(), env.current_player)
+    ours = max(visits, key=visits.get)
+    env.step(ours)
+    child = mcts.pool.children[mcts.root, ours]
+    reply = int(np.argmax(mcts.pool.N[child]))
+    grandchild = mcts.pool.children[child, reply]
+    expected = int(mcts.pool.N_total[grandchild])
+    size_before = mcts.pool.size
+    env.step(reply)
+
+    mcts.search(env.get_state(), env.current_player)
+
+    assert expected > 0
+    assert mcts.stats.reused_visits == expected
+    assert mcts.root == 0
+    assert mcts.pool.parent[mcts.root] == -1
+    assert mcts.pool.size < size_before + 400
+
+
+def test_unrelated_position_starts_a_new_tree(env):
+    """
+    A position that is not in the tree discards it.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=50)
+    mcts.search(env.get_state(), env.current_player)
+    for col in [3, 3, 3, 3]:
+        env.step(col)
+
+    mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.stats.reused_visits == 0
+    assert int(mcts.pool.N_total[mcts.root]) == 49
+
+
+def test_compact_keeps_subtree_links(env):
+    """
+    Compacting renumbers the kept nodes and keeps parent/child links valid.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=200, add_root_noise=False)
+    mcts.search(env.get_state(), env.current_player)
+    pool = mcts.pool
+    child = int(pool.children[mcts.root, 3])
+    boards = {}
+    stack = [child]
+    while stack:
+        node = stack.pop()
+        boards[tuple(pool.actions_to(node))] = int(pool.N_total[node])
+        stack.extend(int(c) for c in pool.children[node] if c >= 0)
+
+    mapping = pool.compact(child)
+
+    assert mapping[child] == 0
+    assert np.count_nonzero(mapping >= 0) == len(boards) == pool.size
+    for node in range(pool.size):
+        path = tuple([3] + pool.actions_to(node))
+        assert boards[path] == int(pool.N_total[node])
+        for action, c in enumerate(pool.children[node]):
+            if c >= 0:
+                assert pool.parent[c] == node and pool.action[c] == action
+
+
+def test_time_budget_stops_the_search(env):
+    """
+    With a time budget the search returns in time and reports the
+    simulations it managed to run.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=None, batch_size=4)
+    visits = mcts.search(env.get_state(), env.current_player, time_budget=0.1)
+
+    assert mcts.stats.elapsed < 0.5
+    assert mcts.stats.simulations > 1
+    assert sum(visits.values()) == mcts.stats.simulations - 1
+
+
+def test_simulation_limit_applies_with_time_budget(env):
+    mcts = MCTS(env, UniformModel(), n_simulations=20, time_budget=10)
+    mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.stats.simulations == 20
+
+
+def test_search_needs_a_limit(env):
+    mcts = MCTS(env, UniformModel(), n_simulations=None)
+    with pytest.raises(ValueError):
+        mcts.search(env.get_state(), env.current_player)
+
+
+@pytest.mark.parametrize("n_threads", [2, 4])
+def test_parallel_workers_share_one_tree(env, n_threads):
+    """
+    Several workers run exactly the requested simulations, and no virtual
+    loss is left in the tree afterwards.
+    """
+    mcts = MCTS(
+        env, UniformModel(), n_simulations=200, batch_size=4, n_threads=n_threads
+    )
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    pool = mcts.pool
+    assert mcts.stats.simulations == 200
+    assert sum(visits.values()) == 199
+    assert np.allclose(pool.N[: pool.size].sum(axis=1), pool.N_total[: pool.size])
+    for node in range(1, pool.size):
+        parent, action = pool.parent[node], pool.action[node]
+        assert pool.N[parent, action] >= pool.N_total[node]
+
+
+def test_parallel_search_finds_immediate_win(env):
+    for col in [0, 6, 1, 6, 2, 5]:
+        env.step(col)
+    mcts = MCTS(
+        env, UniformModel(), n_simulations=200, add_root_noise=False, n_threads=3
+    )
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert max(visits, key=visits.get) == 3
+
+
+def test_input_buffers_are_reused_across_searches(env):
+    """
+    Every search starts new worker threads, but they keep using the same
+    input buffers.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=64, batch_size=4, n_threads=2)
+    mcts.search(env.get_state(), env.current_player)
+    encoders = list(mcts._encoders)
+    env.step(3)
+    mcts.search(env.get_state(), env.current_player)
+
+    assert len(encoders) == 2
+    assert all(a is b for a, b in zip(encoders, mcts._encoders, strict=True))
+
+
+class FailingModel(UniformModel):
+    """
+    UniformModel that raises on one call, e.g. like a broker that went away.
+    """
+
+    def __init__(self, fail_on_call):
+        super().__init__()
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    def forward(self, x):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("model failed")
+        return super().forward(x)
+
+
+def test_worker_error_is_raised_and_tree_stays_usable(env):
+    """
+    An exception in a worker thread reaches the caller instead of a move
+    from a partial tree, and the failed batch leaves no virtual loss.
+    """
+    model = FailingModel(fail_on_call=3)
+    mcts = MCTS(env, model, n_simulations=64, batch_size=4, n_threads=2)
+
+    with pytest.raises(RuntimeError, match="model failed"):
+        mcts.search(env.get_state(), env.current_player)
+
+    pool = mcts.pool
+    assert np.allclose(pool.N[: pool.size].sum(axis=1), pool.N_total[: pool.size])
+    visits = mcts.search(env.get_state(), env.current_player)
+    assert sum(visits.values()) > 0
+
+
+def test_transpositions_share_one_node(env):
+    """
+    In DAG mode each position has a single node, so the model evaluates
+    every position once.
+    """
+    dag = MCTS(
+        env, UniformModel(), n_simulations=400, transpositions=True, solver=False
+    )
+    dag.search(env.get_state(), env.current_player)
+
+    pool = dag.pool
+    positions = {dag.node_board(node).hash for node in range(pool.size)}
+    assert len(positions) == pool.size == len(dag.nodes_by_hash)
+    # Some node is the child of more than one parent
+    linked = pool.children[: pool.size]
+    linked = linked[linked >= 0]
+    assert len(linked) > len(np.unique(linked))
+
+    # The tree evaluates some positions more than once, the DAG does not
+    tree = MCTS(env, UniformModel(), n_simulations=400)
+    tree.search(env.get_state(), env.current_player)
+    tree_positions = {tree.node_board(n).hash for n in range(tree.pool.size)}
+    assert len(tree_positions) < tree.pool.size
+    evaluated = [
+        n for n in range(pool.size) if pool.expanded[n] and not pool.terminal[n]
+    ]
+    assert sum(dag.stats.batch_sizes) == len(evaluated)
+
+
+def test_transposition_subtree_is_reused(env):
+    mcts = MCTS(env, UniformModel(), n_simulations=300, transpositions=True)
+    mcts.search(env.get_state(), env.current_player)
+    for col in [3, 3]:
+        env.step(col)
+
+    mcts.search(env.get_state(), env.current_player)
+
+    pool = mcts.pool
+    assert mcts.stats.reused_visits > 0
+    assert mcts.nodes_by_hash[env.position_hash] == mcts.root == 0
+    for position_hash, node in mcts.nodes_by_hash.items():
+        assert mcts.node_board(node).hash == position_hash
+    assert len(mcts.nodes_by_hash) == pool.size
+
+
+def _play(env, moves):
+    for col in moves:
+        env.step(col)
+
+
+def test_solver_takes_immediate_win_without_model(env):
+    _play(env, [0, 6, 1, 6, 2, 5])
+    mcts = MCTS(env, UniformModel(), n_simulations=200)
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.stats.solved == 1
+    assert mcts.stats.nn_calls == 0
+    assert mcts.stats.simulations == 1
+    assert visits == {3: 1}
+
+
+def test_solver_forces_the_block(env):
+    """
+    Player 1 threatens column 3, so it is the only move searched.
+    """
+    _play(env, [0, 6, 1, 6, 2])
+    mcts = MCTS(env, UniformModel(), n_simulations=50)
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert list(visits) == [3]
+    assert visits[3] == 50
+
+
+def test_solver_detects_double_threat(env):
+    """
+    Player 1 threatens columns 0 and 4; player 2 to move has lost.
+    """
+    _play(env, [1, 1, 2, 2, 3])
+    mcts = MCTS(env, UniformModel(), n_simulations=200)
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.stats.solved == -1
+    assert mcts.stats.nn_calls == 0
+    assert set(visits) == set(range(7))
+
+
+def test_lost_root_still_blocks(env):
+    """
+    Player 1 threatens columns 1 and 5. The position is lost, but blocking
+    one threat delays the loss, so the move is not simply column 0.
+    """
+    _play(env, [2, 6, 3, 6, 4])
+    mcts = MCTS(env, UniformModel(), n_simulations=200)
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.stats.solved == -1
+    assert max(visits, key=visits.get) in (1, 5)
+
+
+def test_solver_proves_win_and_stops_early(env):
+    """
+    Column 3 creates an open three (threats in columns 0 and 4); the proof
+    propagates to the root and the search stops long before its limit.
+    """
+    _play(env, [1, 6, 2, 6])
+    mcts = MCTS(env, UniformModel(), n_simulations=5000, add_root_noise=False)
+    visits = mcts.search(env.get_state(), env.current_player)
+
+    assert mcts.stats.solved == 1
+    assert mcts.stats.simulations < 50
+    assert max(visits, key=visits.get) == 3
+    assert [a for a, n in visits.items() if n > 0] == [3]
+
+
+def test_ponder_runs_until_stopped_and_is_reused(env):
+    """
+    Pondering on the opponent's turn stops when the event is set, and the
+    search after their reply starts from the pondered subtree.
+    """
+    mcts = MCTS(env, UniformModel(), n_simulations=50, add_root_noise=False)
+    visits = mcts.search(env.get_state(), env.current_player)
+    env.step(max(visits, key=visits.get))
+
+    stop = threading.Event()
+    timer = threading.Timer(0.2, stop.set)
+    timer.start()
+    replies = mcts.ponder(env.get_state(), env.current_player, stop)
+    timer.join()
+
+    assert mcts.stats.simulations > 50
+    env.step(max(replies, key=replies.get))
+    mcts.search(env.get_state(), env.current_player)
+    assert mcts.stats.reused_visits > 0
+
+
+def test_ponder_respects_simulation_limit(env):
+    mcts = MCTS(env, UniformModel(), n_simulations=50)
+    mcts.ponder(env.get_state(), env.current_player, threading.Event(), 30)
+
+    assert mcts.stats.simulations == 30
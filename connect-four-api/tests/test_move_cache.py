@@ -0,0 +1,85 @@
+import pytest
+
+from agents.engine_registry import EngineRegistry
+from agents.move_cache import MoveCache
+from agents.move_calculator import MoveCalculator
+from core.bitboard import BitBoard
+from tests.helpers import CountingEngine
+
+
+def _board(moves):
+    board = BitBoard()
+    player = 1
+    for col in moves:
+        board.drop(col, player)
+        player = 3 - player
+    return board
+
+
+@pytest.fixture
+def engine():
+    return CountingEngine()
+
+
+def _calculator(engine, cache_stochastic=True):
+    calculator = MoveCalculator(cache_stochastic=cache_stochastic)
+    calculator.engines = EngineRegistry(
+        {"MiniMax": lambda: engine, "MCTS": lambda: engine}
+    )
+    return calculator
+
+
+def test_mirrored_position_shares_the_entry():
+    """
+    A move stored for one position is returned mirrored for its mirror image.
+    """
+    cache = MoveCache()
+    cache.put(_board([1, 3]), ("MiniMax", 5), "B", 0.5)
+
+    assert cache.get(_board([1, 3]), ("MiniMax", 5)) == "B"
+    assert cache.get(_board([5, 3]), ("MiniMax", 5)) == "F"
+    assert cache.get(_board([5, 3]), ("MiniMax", 8)) is None
+    assert cache.hits == 2 and cache.misses == 1
+    assert cache.saved_seconds == pytest.approx(1.0)
+
+
+def test_least_recently_used_move_is_evicted():
+    cache = MoveCache(capacity=2)
+    first, second, third = _board([0]), _board([1]), _board([2])
+    cache.put(first, ("MiniMax", 2), "A", 0.1)
+    cache.put(second, ("MiniMax", 2), "B", 0.1)
+    cache.get(first, ("MiniMax", 2))
+    cache.put(third, ("MiniMax", 2), "C", 0.1)
+
+    assert len(cache) == 2
+    assert cache.get(second, ("MiniMax", 2)) is None
+    assert cache.get(first, ("MiniMax", 2)) == "A"
+
+
+def test_repeated_position_skips_the_engine(engine):
+    """
+    The second request for a position (or its mirror) is answered from the
+    cache; other engine parameters are computed again.
+    """
+    calculator = _calculator(engine)
+    board = _board([1]).to_array()
+
+    assert calculator.get_best_move(board, "MiniMax", 5, 0) == "A"
+    assert calculator.get_best_move(board, "MiniMax", 5, 0) == "A"
+    assert calculator.get_best_move(board[:, ::-1], "MiniMax", 5, 0) == "G"
+    assert engine.calls == 1
+
+    calculator.get_best_move(board, "MiniMax", 8, 0)
+    assert engine.calls == 2
+
+
+def test_stochastic_modes_can_skip_the_cache(engine):
+    calculator = _calculator(engine, cache_stochastic=False)
+    board = _board([3]).to_array()
+
+    calculator.get_best_move(board, "MCTS", 0, 2000)
+    calculator.get_best_move(board, "MCTS", 0, 2000)
+    calculator.get_best_move(board, "MiniMax", 5, 0)
+    calculator.get_best_move(board, "MiniMax", 5, 0)
+
+    assert engine.calls == 3
@@ -0,0 +1,67 @@
+import pytest
+import torch
+
+from agents.alphazero.alphazero_model import AlphaZeroModel
+from agents.alphazero.quantization import (
+    collect_calibration_positions,
+    compare_models,
+    format_report,
+    load_quantized_model,
+    quantize_dynamic_model,
+    quantize_static_model,
+    save_quantized_model,
+)
+
+
+@pytest.fixture(scope="module")
+def model():
+    torch.manual_seed(0)
+    return AlphaZeroModel().eval()
+
+
+@pytest.fixture(scope="module")
+def positions(model):
+    return collect_calibration_positions(model, n_games=2, n_simulations=5)
+
+
+def test_calibration_positions_are_encoded_boards(positions):
+    assert positions.dim() == 4
+    assert positions.shape[1:] == (3, 6, 7)
+    # Every cell is exactly one of player 1, player 2 or empty
+    assert torch.all(positions.sum(dim=1) == 1)
+
+
+@pytest.mark.parametrize("static", [False, True])
+def test_quantized_model_is_close_to_fp32(model, positions, static):
+    if static:
+        quantized = quantize_static_model(model, positions)
+    else:
+        quantized = quantize_dynamic_model(model)
+
+    report = compare_models(model, quantized, positions)
+
+    assert report["quantized_size_bytes"] < report["size_bytes"] / 2
+    assert report["value_mae"] < 0.1
+    assert 0 <= report["policy_agreement"] <= 1
+    assert "Policy agreement" in format_report(report)
+
+
+def test_save_and_load(model, positions, tmp_path):
+    path = tmp_path / "model.int8.ts"
+    quantized = quantize_dynamic_model(model)
+    save_quantized_model(quantized, str(path))
+
+    loaded = load_quantized_model(str(path), "missing.pt")
+
+    with torch.no_grad():
+        assert torch.allclose(quantized(positions)[1], loaded(positions)[1])
+
+
+def test_load_quantizes_state_dict_without_file(model, positions, tmp_path):
+    state_dict_path = tmp_path / "model.pt"
+    torch.save(model.state_dict(), state_dict_path)
+
+    loaded = load_quantized_model(str(tmp_path / "missing.ts"), str(state_dict_path))
+
+    report = compare_models(model, loaded, positions)
+    assert report["value_mae"] < 0.1
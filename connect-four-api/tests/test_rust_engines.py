@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from agents.benchmark import BENCHMARK_POSITIONS, position_board
+from agents.engine_registry import EngineRegistry
+from agents.move_calculator import MoveCalculator
+from core.bitboard import BitBoard
+from core.board_batch import stack_bitboards
+
+CORPUS = [
+    BitBoard.from_array(position_board(moves))
+    for sequences in BENCHMARK_POSITIONS.values()
+    for moves in sequences
+]
+
+
+class ListOnlyEngine:
+    """
+    Stand-in for the PyO3 engines as built before the bitboard entry points.
+    """
+
+    def __init__(self):
+        self.boards = []
+
+    def get_best_move(self, board, depth):
+        self.boards.append(board)
+        return "D"
+
+    def get_best_move_mcts(self, board, sims, expl_rate):
+        self.boards.append(board)
+        return "D"
+
+
+def test_old_engine_builds_get_nested_lists():
+    """
+    Engines without the bitboard entry points are called with the board as
+    nested lists, like before.
+    """
+    engine = ListOnlyEngine()
+    calculator = MoveCalculator(cache_stochastic=False)
+    calculator.engines = EngineRegistry(
+        {"MiniMax": lambda: engine, "MCTS": lambda: engine}
+    )
+    board = CORPUS[3]
+
+    assert calculator.get_best_move(board.to_array(), "MiniMax", 4, 0) == "D"
+    assert calculator.get_best_move(board.to_array(), "MCTS", 0, 100) == "D"
+    assert engine.boards == [board.to_array().tolist()] * 2
+
+
+def _open_column(board, move):
+    return board.can_play(ord(move) - ord("A"))
+
+
+def test_minimax_entry_points_agree():
+    """
+    The installed minimax build finds the same moves through the list,
+    buffer, bitboard and batched entry points.
+    """
+    minimax = pytest.importorskip("minimax_algorithm")
+    depth = 3
+
+    expected = []
+    for board in CORPUS:
+        array = board.to_array()
+        move = minimax.get_best_move(array.tolist(), depth)
+        assert _open_column(board, move)
+        assert minimax.get_best_move_buffer(array.astype(np.int64), depth) == move
+        bitboard_move = minimax.get_best_move_bitboard(
+            board.masks[1], board.masks[2], depth
+        )
+        assert bitboard_move == move
+        expected.append(move)
+
+    assert minimax.get_best_moves_bitboards(*stack_bitboards(CORPUS), depth) == expected
+
+
+def test_mcts_entry_points_play_open_columns():
+    """
+    The installed MCTS build accepts every board format. Its search is
+    randomized, so only the legality of the moves is compared.
+    """
+    mcts = pytest.importorskip("monte_carlo_tree_search")
+    sims, expl_rate = 200, 1.4
+
+    for board in CORPUS:
+        array = board.to_array()
+        moves = [
+            mcts.get_best_move_mcts(array.tolist(), sims, expl_rate),
+            mcts.get_best_move_mcts_buffer(array.astype(np.int64), sims, expl_rate),
+            mcts.get_best_move_mcts_bitboard(
+                board.masks[1], board.masks[2], sims, expl_rate
+            ),
+        ]
+        assert all(_open_column(board, move) for move in moves)
+
+    batch = mcts.get_best_moves_mcts_bitboards(
+        *stack_bitboards(CORPUS), sims, expl_rate
+    )
+    assert len(batch) == len(CORPUS)
+    assert all(
+        _open_column(board, move) for board, move in zip(CORPUS, batch, strict=True)
+    )
@@ -0,0 +1,82 @@
+import json
+
+from agents.alphazero.connect_four_environment import ConnectFourEnvironment
+from agents.alphazero.mcts import MCTS
+from agents.alphazero.search_stats import (
+    PHASES,
+    JsonStatsSink,
+    SearchStats,
+    TensorBoardStatsSink,
+)
+from tests.helpers import UniformModel
+
+
+class FakeWriter:
+    def __init__(self):
+        self.scalars = []
+
+    def add_scalar(self, tag, value, step):
+        self.scalars.append((tag, value, step))
+
+
+def test_search_fills_stats():
+    """
+    A search reports its counters, depths and the time of every phase.
+    """
+    env = ConnectFourEnvironment()
+    mcts = MCTS(env, UniformModel(), n_simulations=100, batch_size=4)
+    mcts.search(env.get_state(), env.current_player)
+
+    stats = mcts.stats
+    assert stats.simulations == 100
+    assert stats.simulations_per_sec > 0
+    assert stats.nn_calls == len(stats.batch_sizes)
+    assert sum(stats.batch_sizes) + stats.cache_hits <= 100
+    assert stats.depth_count == 100
+    assert 1 <= stats.mean_depth <= stats.max_depth
+    assert stats.times["inference"] > 0
+    assert set(stats.times) == set(PHASES)
+    assert "simulations" in stats.summary()
+
+
+def test_hook_receives_stats_of_every_search():
+    env = ConnectFourEnvironment()
+    received = []
+    mcts = MCTS(env, UniformModel(), n_simulations=10, on_search=received.append)
+
+    mcts.search(env.get_state(), env.current_player)
+    mcts.search(env.get_state(), env.current_player)
+
+    assert len(received) == 2
+    assert all(isinstance(stats, SearchStats) for stats in received)
+    assert received[1] is mcts.stats
+
+
+def test_tensorboard_sink_writes_scalars():
+    writer = FakeWriter()
+    sink = TensorBoardStatsSink(writer, prefix="Test")
+    stats = SearchStats()
+    stats.simulations = 5
+
+    sink(stats)
+    sink(stats)
+
+    assert ("Test/simulations", 5, 0) in writer.scalars
+    assert ("Test/simulations", 5, 1) in writer.scalars
+    assert any(tag == "Test/time_inference" for tag, _, _ in writer.scalars)
+
+
+def test_json_sink_appends_lines(tmp_path):
+    path = tmp_path / "stats.jsonl"
+    sink = JsonStatsSink(path)
+    stats = SearchStats(batch_size=8)
+    stats.record_batch(evaluated=3, cache_hits=1)
+
+    sink(stats)
+    sink(stats)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 2
+    assert records[0]["batch_sizes"] == [3]
+    assert records[0]["cache_hits"] == 1
+    assert records[0]["batch_size"] == 8
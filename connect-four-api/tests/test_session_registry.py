@@ -0,0 +1,118 @@
+import pytest
+
+from core.session_registry import SessionLimitError, SessionRegistry
+
+
+class FakeGameLoop:
+    def __init__(self, game_state, digital_only):
+        self.game_state = game_state
+        self.digital_only = digital_only
+        self.pondering = True
+
+    def cancel_pondering(self):
+        self.pondering = False
+
+
+@pytest.fixture
+def registry():
+    """
+    Returns a small registry that creates fake game loops.
+    """
+    return SessionRegistry(FakeGameLoop, max_sessions=2, idle_timeout=10)
+
+
+def test_sessions_have_independent_game_states(registry):
+    """
+    Every connection gets its own GameState.
+    """
+    first = registry.create()
+    second = registry.create()
+
+    first.game_state.board.add_pos_to_board("A", 1)
+
+    assert first.session_id != second.session_id
+    assert first.game_state is not second.game_state
+    assert second.game_state.board.board.sum() == 0
+    assert len(registry) == 2
+
+
+def test_session_cap(registry):
+    """
+    Creating more sessions than allowed raises SessionLimitError.
+    """
+    registry.create()
+    registry.create()
+    with pytest.raises(SessionLimitError):
+        registry.create()
+
+
+def test_idle_sessions_are_evicted(registry):
+    """
+    Sessions inactive for longer than the timeout are removed and their game ends.
+    """
+    idle = registry.create()
+    active = registry.create()
+    idle.game_state.start_game()
+    idle.last_active -= 60
+
+    evicted = registry.evict_idle()
+
+    assert evicted == [idle]
+    assert idle.session_id not in registry
+    assert active.session_id in registry
+    assert not idle.game_state.is_game_running()
+
+
+def test_full_registry_evicts_idle_session_on_create(registry):
+    """
+    A full registry makes room by evicting idle sessions.
+    """
+    idle = registry.create()
+    registry.create()
+    idle.last_active -= 60
+
+    registry.create()
+
+    assert idle.session_id not in registry
+    assert len(registry) == 2
+
+
+def test_digital_sessions_share_no_machine(registry):
+    """
+    Many sessions can play digitally, but only one can use the machine.
+    """
+    first = registry.create()
+    second = registry.create()
+
+    registry.prepare_game(first, digital_only=False)
+    first.game_state.start_game()
+    registry.prepare_game(second, digital_only=True)
+
+    assert not first.game_loop.digital_only
+    assert second.game_loop.digital_only
+    with pytest.raises(SessionLimitError):
+        registry.prepare_game(second, digital_only=False)
+
+    registry.remove(first.session_id)
+    registry.prepare_game(second, digital_only=False)
+    assert not second.game_loop.digital_only
+
+
+def test_digital_only_registry_forces_digital_path():
+    """
+    A digital-only registry never hands out machine sessions.
+    """
+    registry = SessionRegistry(FakeGameLoop, digital_only=True)
+    session = registry.create()
+    registry.prepare_game(session, digital_only=False)
+    assert session.game_loop.digital_only
+
+
+def test_removing_a_session_stops_pondering(registry):
+    session = registry.create()
+    registry.prepare_game(session, digital_only=True)
+    game_loop = session.game_loop
+
+    registry.remove(session.session_id)
+
+    assert not game_loop.pondering
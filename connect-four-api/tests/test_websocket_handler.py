@@ -0,0 +1,52 @@
+import asyncio
+
+from api.websocket_handler import WebSocketHandler
+
+
+class FakeWebSocket:
+    """
+    Connection that can be closed by the test.
+    """
+
+    def __init__(self):
+        self.closed = asyncio.Event()
+
+    async def wait_closed(self):
+        await self.closed.wait()
+
+
+def test_request_is_cancelled_when_client_disconnects():
+    """
+    A request still running when the connection closes is cancelled.
+    """
+    handler = WebSocketHandler(registry=None)
+    cancelled = []
+
+    async def long_request():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        websocket = FakeWebSocket()
+        asyncio.get_running_loop().call_later(0.05, websocket.closed.set)
+        return await handler.until_closed(websocket, long_request())
+
+    assert asyncio.run(run()) is None
+    assert cancelled == [True]
+
+
+def test_request_result_is_returned():
+    """
+    Without a disconnect the request's response is passed on.
+    """
+    handler = WebSocketHandler(registry=None)
+
+    async def request():
+        return {"status": "ok"}
+
+    assert asyncio.run(handler.until_closed(FakeWebSocket(), request())) == {
+        "status": "ok"
+    }